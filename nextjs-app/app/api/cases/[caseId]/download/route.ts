@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { exec } from 'child_process'
 import { promisify } from 'util'
+import { callWorker } from '@/lib/services/python-worker'
 
 const execAsync = promisify(exec)
 
@@ -8,6 +9,18 @@ export async function GET(
   request: NextRequest,
   { params }: { params: { caseId: string } }
 ) {
+  const headers = {
+    'Content-Type': 'text/plain',
+    'Content-Disposition': `attachment; filename="exec-summary-${params.caseId}.txt"`,
+  }
+  const worker = await callWorker(`/cases/${encodeURIComponent(params.caseId)}/summary`)
+  if (worker?.ok) {
+    return new NextResponse(await worker.text(), { headers })
+  }
+  if (worker?.status === 404) {
+    return NextResponse.json({ error: 'Executive summary not found' }, { status: 404 })
+  }
+
   try {
     const { join } = await import('path')
     const projectRoot = join(process.cwd(), '..', '..')
@@ -18,12 +31,7 @@ export async function GET(
     )
     const summary = stdout
 
-    return new NextResponse(summary, {
-      headers: {
-        'Content-Type': 'text/plain',
-        'Content-Disposition': `attachment; filename="exec-summary-${params.caseId}.txt"`,
-      },
-    })
+    return new NextResponse(summary, { headers })
   } catch (error: any) {
     return NextResponse.json(
       { error: 'Executive summary not found' },
@@ -1,12 +1,18 @@
 import { NextResponse } from 'next/server'
 import { exec } from 'child_process'
 import { promisify } from 'util'
+import { callWorker } from '@/lib/services/python-worker'
 
 const execAsync = promisify(exec)
 
 export async function GET() {
+  const worker = await callWorker('/health')
+  if (worker?.ok) {
+    return NextResponse.json(await worker.json())
+  }
+
   try {
-    // Call Python service to check health
+    // No worker running: spawn the one-shot Python service
     const { join } = await import('path')
     const projectRoot = join(process.cwd(), '..')
     const pythonScript = join(projectRoot, 'autolawyer-mcp', 'services', 'health_check.py')
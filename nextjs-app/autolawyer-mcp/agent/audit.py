@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Iterator, Optional
+
+from mcp_tools.tables import ColumnarTable, RowView
+
+
+@dataclass
+class AuditLogEntry:
+    task: str
+    role: str
+    model: str
+    prompt: str
+    result_preview: str
+    timestamp: float = field(default_factory=time.time)
+    case_id: Optional[str] = None
+
+
+def preview(value: Any, limit: int = 400) -> str:
+    """
+    JSON-ish preview of ``value`` that stops encoding once ``limit`` characters exist.
+    """
+    if isinstance(value, str):
+        return value[:limit]
+    parts = []
+    size = 0
+    for chunk in _iter_json(value, limit):
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(parts)[:limit]
+
+
+def _iter_json(value: Any, limit: int) -> Iterator[str]:
+    # Strings are clipped before encoding so a multi-megabyte document body costs
+    # no more than the preview it contributes to.
+    if isinstance(value, str):
+        yield json.dumps(value[:limit])
+    elif value is None or isinstance(value, (bool, int, float)):
+        yield json.dumps(value)
+    elif isinstance(value, dict):
+        yield "{"
+        for idx, (key, item) in enumerate(value.items()):
+            yield (", " if idx else "") + json.dumps(str(key)) + ": "
+            yield from _iter_json(item, limit)
+        yield "}"
+    elif isinstance(value, RowView):
+        yield from _iter_json(value.to_dict(), limit)
+    elif isinstance(value, (list, tuple, ColumnarTable)):
+        yield "["
+        for idx, item in enumerate(value):
+            if idx:
+                yield ", "
+            yield from _iter_json(item, limit)
+        yield "]"
+    elif hasattr(value, "__dict__"):
+        yield from _iter_json(vars(value), limit)
+    else:
+        yield json.dumps(str(value)[:limit])
+
+
+class AuditLog:
+    """
+    Ring buffer of audit entries with an optional sink that receives every entry.
+    """
+
+    def __init__(self, maxlen: int = 1000, sink: Optional["MongoAuditSink"] = None) -> None:
+        self.entries: Deque[AuditLogEntry] = deque(maxlen=maxlen)
+        self.sink = sink
+        self.dropped = 0
+
+    def append(self, entry: AuditLogEntry) -> None:
+        if self.entries.maxlen is not None and len(self.entries) == self.entries.maxlen:
+            self.dropped += 1
+        self.entries.append(entry)
+        if self.sink is not None:
+            self.sink.emit(entry)
+
+    def for_case(self, case_id: Optional[str]) -> list:
+        return [entry for entry in self.entries if entry.case_id == case_id]
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def __iter__(self) -> Iterator[AuditLogEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class MongoAuditSink:
+    """
+    Forwards audit entries to the storage's batched audit writer, so persistence
+    never blocks the agent loop and costs one ``insert_many`` per batch.
+    """
+
+    def __init__(self, storage, batch_size: int = 100, flush_interval: float = 1.0) -> None:
+        self.storage = storage
+        self.writer = storage.audit_writer(batch_size=batch_size, flush_interval=flush_interval)
+
+    @property
+    def failed(self) -> int:
+        return self.writer.dropped
+
+    def emit(self, entry: AuditLogEntry) -> None:
+        self.writer.write(entry.case_id or "unknown", dict(entry.__dict__))
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        self.writer.close(timeout)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from agent.core import AgentCore, _tool
+from agent.policies import ExecutionPolicies
+from agent.router import ModelRouter
+
+logger = logging.getLogger(__name__)
+
+
+class BatchRunner:
+    """
+    Runs many cases through one shared pipeline: a single router (and so a single
+    token budget, response cache and rate limiters), the process-wide embedder and
+    plan cache, a pool of ingestion workers that parses every document up front,
+    and ``case_workers`` cases in flight at once.
+    """
+
+    def __init__(
+        self,
+        router: ModelRouter,
+        policies: Optional[ExecutionPolicies] = None,
+        case_workers: int = 4,
+        ingest_workers: int = 8,
+        enable_clause_embeddings: bool = True,
+        on_result=None,
+    ) -> None:
+        self.router = router
+        self.policies = policies or ExecutionPolicies()
+        self.case_workers = case_workers
+        self.ingest_workers = ingest_workers
+        self.enable_clause_embeddings = enable_clause_embeddings
+        self.on_result = on_result
+
+    def run(self, case_contexts: Iterable[Dict]) -> Dict:
+        """
+        Returns ``{"results": [...], "metrics": {...}}``; one result per case in input
+        order with ``status`` "completed" or "failed". A failing case never stops the batch.
+        """
+        contexts = list(case_contexts)
+        started = time.perf_counter()
+        tokens_before = self.router.tokens_charged
+
+        contexts, ingest_errors = self._ingest(contexts)
+        ingest_seconds = time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=max(1, self.case_workers), thread_name_prefix="batch-case") as pool:
+            results = list(
+                pool.map(
+                    lambda pair: self._run_one(pair[0], ingest_errors.get(pair[1])),
+                    ((context, idx) for idx, context in enumerate(contexts)),
+                )
+            )
+
+        wall = time.perf_counter() - started
+        completed = [result for result in results if result["status"] == "completed"]
+        clauses = sum(result["clauses"] for result in completed)
+        return {
+            "results": results,
+            "metrics": {
+                "cases": len(results),
+                "completed": len(completed),
+                "failed": len(results) - len(completed),
+                "clauses": clauses,
+                "wall_seconds": round(wall, 3),
+                "ingest_seconds": round(ingest_seconds, 3),
+                "cases_per_min": round(len(completed) / wall * 60, 2) if wall else 0.0,
+                "clauses_per_sec": round(clauses / wall, 2) if wall else 0.0,
+                "tokens_used": self.router.tokens_charged - tokens_before,
+                "budget_remaining": self.router.budget_tokens - self.router.tokens_used,
+            },
+        }
+
+    def _ingest(self, contexts: List[Dict]) -> Tuple[List[Dict], Dict[int, str]]:
+        """
+        Parse every document of every case on the ingestion pool; each case's document
+        lists are replaced with the loaded documents, which the pipeline passes through.
+        """
+        reader = _tool("document_reader")
+        jobs = [
+            (idx, side, position, raw)
+            for idx, context in enumerate(contexts)
+            for side in ("primary_documents", "counterparty_documents")
+            for position, raw in enumerate(context.get(side) or [])
+        ]
+
+        def load(job):
+            try:
+                return reader.ingest_documents([job[3]])[0], None
+            except Exception as exc:  # noqa: BLE001
+                return None, f"{job[3].get('name') or job[3].get('path')}: {exc}"
+
+        loaded = {}
+        errors: Dict[int, str] = {}
+        with ThreadPoolExecutor(max_workers=max(1, self.ingest_workers), thread_name_prefix="batch-ingest") as pool:
+            for job, (document, error) in zip(jobs, pool.map(load, jobs)):
+                if error is not None:
+                    errors.setdefault(job[0], error)
+                loaded[job[:3]] = document
+
+        prepared = []
+        for idx, context in enumerate(contexts):
+            context = dict(context)
+            for side in ("primary_documents", "counterparty_documents"):
+                context[side] = [
+                    loaded[(idx, side, position)] or raw
+                    for position, raw in enumerate(context.get(side) or [])
+                ]
+            prepared.append(context)
+        return prepared, errors
+
+    def _run_one(self, case_context: Dict, ingest_error: Optional[str]) -> Dict:
+        case_id = case_context.get("case_id")
+        started = time.perf_counter()
+        if ingest_error is not None:
+            return {"case_id": case_id, "status": "failed", "error": ingest_error, "seconds": 0.0, "clauses": 0}
+        try:
+            agent = AgentCore(
+                router=self.router,
+                policies=self.policies,
+                enable_clause_embeddings=self.enable_clause_embeddings,
+            )
+            outcome = agent.run_case(case_context)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Batch case %s failed", case_id)
+            return {
+                "case_id": case_id,
+                "status": "failed",
+                "error": str(exc),
+                "seconds": round(time.perf_counter() - started, 3),
+                "clauses": 0,
+            }
+        if self.on_result is not None and case_id:
+            self.on_result(case_id, outcome)
+        risks = outcome.get("risks", [])
+        return {
+            "case_id": case_id,
+            "status": "completed",
+            "review_status": outcome.get("review_status"),
+            "seconds": round(time.perf_counter() - started, 3),
+            "clauses": len(outcome.get("clauses", [])),
+            "risks": len(risks),
+            "high_risks": sum(1 for risk in risks if risk.get("severity") in ("critical", "high")),
+            "outcome": outcome,
+        }
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from agent.router import ModelRouter, RouterResult
+from agent.tokens import count_tokens
+
+
+@dataclass
+class _BatchItem:
+    item_id: str
+    prompt: str
+    tokens: int
+    future: "Future[RouterResult]" = field(default_factory=Future)
+
+
+class MicroBatcher:
+    """
+    Packs clause-level prompts for the same task type into one multi-item request.
+
+    Prompts submitted within ``window_ms`` of each other are sent together until the
+    packed prompt would exceed ``max_batch_tokens``; the JSON answer is split back
+    per item, and anything the model dropped is retried as a single request.
+    """
+
+    def __init__(
+        self,
+        router: ModelRouter,
+        window_ms: float = 25.0,
+        max_batch_tokens: int = 6000,
+        max_items: int = 32,
+    ) -> None:
+        self.router = router
+        self.window_ms = window_ms
+        self.max_batch_tokens = max_batch_tokens
+        self.max_items = max_items
+        self._pending: Dict[str, List[_BatchItem]] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+        self._counter = 0
+        self.batches_sent = 0
+        self.items_sent = 0
+        self.fallbacks = 0
+
+    def submit(self, task_type: str, prompt: str) -> "Future[RouterResult]":
+        with self._lock:
+            self._counter += 1
+            item = _BatchItem(item_id=f"i{self._counter}", prompt=prompt, tokens=self._count_tokens(prompt))
+            queue = self._pending.setdefault(task_type, [])
+            ready: Optional[List[_BatchItem]] = None
+            if queue and (
+                sum(pending.tokens for pending in queue) + item.tokens > self.max_batch_tokens
+                or len(queue) >= self.max_items
+            ):
+                ready = self._take(task_type)
+                queue = self._pending.setdefault(task_type, [])
+            queue.append(item)
+            if task_type not in self._timers:
+                timer = threading.Timer(self.window_ms / 1000, self.flush, args=(task_type,))
+                timer.daemon = True
+                self._timers[task_type] = timer
+                timer.start()
+        if ready:
+            self._run_batch(task_type, ready)
+        return item.future
+
+    def _count_tokens(self, prompt: str) -> int:
+        return max(1, count_tokens(prompt, getattr(self.router, "default_model", "gpt-4o-mini")))
+
+    def generate_many(self, task_type: str, prompts: List[str]) -> List[RouterResult]:
+        """
+        Synchronous helper: batch ``prompts`` and return results in the same order.
+        """
+        futures = [self.submit(task_type, prompt) for prompt in prompts]
+        self.flush(task_type)
+        return [future.result() for future in futures]
+
+    def flush(self, task_type: str) -> None:
+        with self._lock:
+            items = self._take(task_type)
+        if items:
+            self._run_batch(task_type, items)
+
+    def _take(self, task_type: str) -> List[_BatchItem]:
+        timer = self._timers.pop(task_type, None)
+        if timer is not None:
+            timer.cancel()
+        return self._pending.pop(task_type, [])
+
+    def _run_batch(self, task_type: str, items: List[_BatchItem]) -> None:
+        if len(items) == 1 or getattr(self.router, "offline_mode", False):
+            for item in items:
+                self._run_single(task_type, item)
+            return
+
+        packed = (
+            "Answer each item below independently. Return a single JSON object that maps "
+            "every item id to that item's answer.\n"
+            + json.dumps([{"id": item.item_id, "prompt": item.prompt} for item in items])
+        )
+        try:
+            batch = self.router.generate(
+                task_type,
+                packed,
+                schema_hint="{" + ", ".join(f'"{item.item_id}": any' for item in items) + "}",
+            )
+            answers = json.loads(batch.output)
+            if not isinstance(answers, dict):
+                answers = {}
+        except json.JSONDecodeError:
+            answers = {}
+        except Exception as exc:  # noqa: BLE001
+            for item in items:
+                item.future.set_exception(exc)
+            return
+
+        self.batches_sent += 1
+        self.items_sent += len(items)
+        total_tokens = sum(item.tokens for item in items) or 1
+        for item in items:
+            if item.item_id not in answers:
+                self.fallbacks += 1
+                self._run_single(task_type, item)
+                continue
+            answer = answers[item.item_id]
+            item.future.set_result(
+                RouterResult(
+                    output=answer if isinstance(answer, str) else json.dumps(answer),
+                    model=batch.model,
+                    latency_ms=batch.latency_ms,
+                    tokens=round(batch.tokens * item.tokens / total_tokens),
+                    provider=batch.provider,
+                    cached=batch.cached,
+                    queue_ms=batch.queue_ms,
+                )
+            )
+
+    def _run_single(self, task_type: str, item: _BatchItem) -> None:
+        try:
+            item.future.set_result(self.router.generate(task_type, item.prompt))
+        except Exception as exc:  # noqa: BLE001
+            item.future.set_exception(exc)
+
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+
+def cache_key(task_type: str, model: str, temperature: float, max_tokens: int, prompt: str) -> str:
+    """
+    Stable key for an LLM call; prompts differing only in whitespace share an entry.
+    """
+    normalized = re.sub(r"\s+", " ", prompt).strip()
+    prompt_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    material = json.dumps([task_type, model, round(float(temperature), 4), int(max_tokens), prompt_hash])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+# The SQLite tier drops expired rows at most this often per cache instance.
+PRUNE_INTERVAL_SECONDS = 600.0
+
+
+class ResponseCache:
+    """
+    Two-tier cache for router responses: in-memory LRU in front of an optional SQLite
+    file. Expired rows are pruned from the file periodically and it keeps at most
+    ``max_disk_entries`` rows, those closest to expiry going first.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600.0,
+        db_path: Optional[Path] = None,
+        max_disk_entries: int = 100_000,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = Path(db_path) if db_path else None
+        self.max_disk_entries = max_disk_entries
+        self._next_prune = 0.0
+        self._memory: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)")
+            self.prune()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        db_path = os.getenv("AUTOLAWYER_LLM_CACHE_DB")
+        return cls(
+            max_entries=_env_number("AUTOLAWYER_LLM_CACHE_SIZE", 512, int),
+            ttl_seconds=_env_number("AUTOLAWYER_LLM_CACHE_TTL", 3600.0, float),
+            db_path=Path(db_path) if db_path else None,
+            max_disk_entries=_env_number("AUTOLAWYER_LLM_CACHE_DB_ROWS", 100_000, int),
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._record_hit(value)
+                    return value
+                del self._memory[key]
+
+        value = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self._remember(key, now + self.ttl_seconds, value)
+            self._record_hit(value)
+        return value
+
+    def put(self, key: str, value: Dict) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, expires_at, value)
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, expires_at, value) VALUES (?, ?, ?)",
+                    (key, expires_at, json.dumps(value)),
+                )
+            if time.monotonic() >= self._next_prune:
+                self.prune()
+
+    def prune(self) -> int:
+        """
+        Delete expired rows from the SQLite tier, then the soonest-expiring ones beyond
+        ``max_disk_entries``. Returns the number of rows removed.
+        """
+        if not self.db_path:
+            return 0
+        self._next_prune = time.monotonic() + PRUNE_INTERVAL_SECONDS
+        with self._connect() as conn:
+            removed = conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),)).rowcount
+            if self.max_disk_entries > 0:
+                removed += conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                ).rowcount
+        return removed
+
+    def stats(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "tokens_saved": self.tokens_saved,
+            "entries": len(self._memory),
+        }
+
+    def _record_hit(self, value: Dict) -> None:
+        self.hits += 1
+        self.tokens_saved += int(value.get("tokens", 0))
+
+    def _remember(self, key: str, expires_at: float, value: Dict) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[Dict]:
+        if not self.db_path:
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+        return json.loads(row[1])
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def default_response_cache() -> ResponseCache:
+    """
+    Process-wide cache, so per-request routers share the in-memory tier and its stats.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache.from_env()
+        return _default_cache
+
+
+def _env_number(name: str, default, cast):
+    try:
+        return cast(os.getenv(name, default))
+    except ValueError:
+        return default
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from mcp_tools.tables import ARTIFACT_TABLES, to_plain
+
+
+# Artifact keys each tool reads from / writes to the shared artifacts dict.
+STAGE_INPUTS: Dict[str, tuple] = {
+    "document_reader": (),
+    "clause_segmenter": ("documents",),
+    "clause_rag": ("clauses",),
+    "risk_classifier": ("clauses",),
+    "redline_generator": ("clauses", "risks"),
+    "comparator": ("documents",),
+    "report_builder": ("risks", "redlines", "comparisons", "tasks"),
+}
+
+STAGE_OUTPUTS: Dict[str, str] = {
+    "document_reader": "documents",
+    "clause_segmenter": "clauses",
+    "clause_rag": "rag_index",
+    "risk_classifier": "risks",
+    "redline_generator": "redlines",
+    "comparator": "comparisons",
+    "report_builder": "reports",
+}
+
+# Payload keys holding file lists; fingerprints use their content signatures instead.
+FILE_PAYLOAD_KEYS = ("files", "counterparty_documents")
+
+
+# Stale checkpoints are swept at most this often per process and root.
+PRUNE_INTERVAL_SECONDS = 600.0
+_last_prune: Dict[str, float] = {}
+_prune_lock = threading.Lock()
+
+
+class CheckpointStore:
+    """
+    Local, file-backed store of per-stage artifacts keyed by case ID + input fingerprint.
+
+    AgentCore clears a case's checkpoints once every stage has completed; the ones
+    left behind by failed or interrupted runs expire after ``max_age_seconds``.
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_age_seconds: Optional[float] = None) -> None:
+        if root is None:
+            root = Path(
+                os.getenv(
+                    "AUTOLAWYER_CHECKPOINT_DIR",
+                    str(Path(tempfile.gettempdir()) / "autolawyer-checkpoints"),
+                )
+            )
+        self.root = Path(root)
+        if max_age_seconds is None:
+            max_age_seconds = float(os.getenv("AUTOLAWYER_CHECKPOINT_TTL_HOURS", "24")) * 3600
+        self.max_age_seconds = max_age_seconds
+        self._maybe_prune()
+
+    def load(self, case_id: str, fingerprint: str) -> Optional[Dict]:
+        path = self._path(case_id, fingerprint)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                record = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return None
+        artifacts = record.get("artifacts") or {}
+        for key, table in ARTIFACT_TABLES.items():
+            if isinstance(artifacts.get(key), list):
+                artifacts[key] = table.from_dicts(artifacts[key])
+        result = record.get("result")
+        if isinstance(result, dict) and list(result) == ["$ref"]:
+            record["result"] = artifacts.get(result["$ref"][2:])
+        return record
+
+    def save(self, case_id: str, fingerprint: str, tool: str, artifacts: Dict, result: Dict) -> None:
+        path = self._path(case_id, fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A stage's result is usually the artifact it stored; keep one copy on disk.
+        ref = next((key for key, value in artifacts.items() if value is result), None)
+        record = {
+            "tool": tool,
+            "fingerprint": fingerprint,
+            "artifacts": to_plain(artifacts),
+            "result": {"$ref": f"#/{ref}"} if ref else to_plain(result),
+        }
+        # Write-then-rename so a crash mid-write never leaves a truncated checkpoint.
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(record, handle, default=str)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def clear(self, case_id: str) -> int:
+        """
+        Drop every checkpoint recorded for a case. Returns the number of files removed.
+        """
+        case_dir = self.root / _safe_name(case_id)
+        removed = 0
+        if case_dir.is_dir():
+            for path in case_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+                removed += 1
+            _remove_if_empty(case_dir)
+        return removed
+
+    def prune(self, max_age_seconds: Optional[float] = None) -> int:
+        """
+        Drop checkpoints (and leftover temp files) older than ``max_age_seconds``.
+        Returns the number of files removed.
+        """
+        max_age = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        if max_age <= 0 or not self.root.is_dir():
+            return 0
+        cutoff = time.time() - max_age
+        removed = 0
+        for case_dir in self.root.iterdir():
+            if not case_dir.is_dir():
+                continue
+            for path in case_dir.iterdir():
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        removed += 1
+                except OSError:
+                    continue
+            _remove_if_empty(case_dir)
+        return removed
+
+    def _maybe_prune(self) -> None:
+        key = str(self.root)
+        now = time.monotonic()
+        with _prune_lock:
+            last = _last_prune.get(key)
+            if last is not None and now - last < PRUNE_INTERVAL_SECONDS:
+                return
+            _last_prune[key] = now
+        self.prune()
+
+    def _path(self, case_id: str, fingerprint: str) -> Path:
+        return self.root / _safe_name(case_id) / f"{fingerprint}.json"
+
+
+def stage_fingerprint(
+    tool: str,
+    payload: Dict,
+    case: Dict,
+    upstream: Dict[str, str],
+    extra: Optional[Dict] = None,
+) -> str:
+    """
+    Hash everything a stage depends on: tool, payload, upstream artifact fingerprints
+    and, for ingestion stages, the content hash or size/mtime of the files being read.
+    """
+    material: Dict = {
+        "tool": tool,
+        # File lists are hashed by _file_signatures below; their temp paths change per upload.
+        "payload": {key: value for key, value in payload.items() if key not in FILE_PAYLOAD_KEYS},
+        "upstream": {key: upstream.get(key, "absent") for key in STAGE_INPUTS.get(tool, ())},
+        "extra": extra or {},
+    }
+    if tool == "document_reader":
+        files = payload.get("files") or case.get("primary_documents", [])
+        material["files"] = _file_signatures(files)
+    elif tool == "comparator":
+        files = payload.get("counterparty_documents") or case.get("counterparty_documents", [])
+        material["files"] = _file_signatures(files)
+    encoded = json.dumps(material, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _file_signatures(files: Iterable[Dict]) -> List[Dict]:
+    signatures: List[Dict] = []
+    for raw in files or []:
+        if raw.get("sha256"):
+            # Hashed while the upload streamed in, so re-submitting the same bytes under
+            # the same case_id (the API's resume path) matches despite the new temp path.
+            signatures.append({"name": raw.get("name"), "sha256": raw["sha256"]})
+            continue
+        if "content" in raw:
+            digest = hashlib.sha256(str(raw["content"]).encode("utf-8")).hexdigest()
+            signatures.append({"name": raw.get("name"), "content": digest})
+            continue
+        path = Path(raw.get("path", "")).expanduser()
+        try:
+            stat = path.stat()
+            signatures.append({"path": str(path), "size": stat.st_size, "mtime": stat.st_mtime_ns})
+        except OSError:
+            signatures.append({"path": str(path), "missing": True})
+    return signatures
+
+
+def _remove_if_empty(directory: Path) -> None:
+    try:
+        directory.rmdir()
+    except OSError:
+        pass
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", value or "default")
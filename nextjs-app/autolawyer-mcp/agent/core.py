@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import importlib
 import json
-import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 import sys
 
@@ -13,17 +13,24 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
+from agent.audit import AuditLog, AuditLogEntry, MongoAuditSink, preview
+from agent.checkpoints import STAGE_OUTPUTS, CheckpointStore, stage_fingerprint
+from agent.digest import ArtifactDigest
+from agent.metrics import REGISTRY, STAGE_NAMES, StageTimings, count_items
+from agent.plan_cache import PlanCache, bind_payload, case_signature, default_plan_cache
 from agent.policies import ExecutionPolicies
+from agent.profiling import profiled
+from agent.prompts import build_planner_prompt
 from agent.router import ModelRouter, RouterResult
-from mcp_tools import (
-    clause_rag,
-    clause_segmenter,
-    comparator,
-    document_reader,
-    redline_generator,
-    report_builder,
-    risk_classifier,
-)
+from agent.serialization import dumps
+
+
+def _tool(name: str):
+    """
+    Import an ``mcp_tools`` module on first use, so chromadb / sentence-transformers /
+    pypdf only load for the stages that actually need them.
+    """
+    return importlib.import_module(f"mcp_tools.{name}")
 
 
 @dataclass
@@ -44,16 +51,10 @@ class AgentTask:
     status: str = "pending"
     result: Optional[Dict] = None
     error: Optional[str] = None
+    from_checkpoint: bool = False
 
 
-@dataclass
-class AuditLogEntry:
-    task: str
-    role: str
-    model: str
-    prompt: str
-    result_preview: str
-    timestamp: float = field(default_factory=time.time)
+PLAN_SCHEMA_HINT = "[{\"name\": str, \"tool\": str, \"payload\": dict}]"
 
 
 class AgentCore:
@@ -66,56 +67,112 @@ class AgentCore:
         router: ModelRouter,
         policies: ExecutionPolicies,
         enable_clause_embeddings: bool = True,
+        checkpoints: Optional[CheckpointStore] = None,
+        audit_sink: Optional[MongoAuditSink] = None,
+        plan_cache: Optional[PlanCache] = None,
     ) -> None:
         self.router = router
         self.policies = policies
         self.enable_clause_embeddings = enable_clause_embeddings
-        self.logs: List[AuditLogEntry] = []
+        if checkpoints is None and policies.checkpoint_stages:
+            checkpoints = CheckpointStore()
+        self.checkpoints = checkpoints
+        self.logs = AuditLog(maxlen=policies.audit_log_limit, sink=audit_sink)
+        self._case_id: Optional[str] = None
+        self.planner_prompt_stats: Optional[Dict] = None
+        if plan_cache is None and policies.cache_plans:
+            plan_cache = default_plan_cache()
+        self.plan_cache = plan_cache
+        self.plan_cache_hit = False
+        self.timings = StageTimings(REGISTRY)
+        self._llm_tokens = 0
 
     # --------------------------------------------------------------------- #
     # Planning
     # --------------------------------------------------------------------- #
-    def build_plan(self, case_context: Dict) -> List[AgentTask]:
+    def build_plan(self, case_context: Dict, use_plan_cache: bool = True) -> List[AgentTask]:
         """
         Use the router to craft a structured task list that the Worker executes.
         """
+        self._case_id = case_context.get("case_id")
         if getattr(self.router, "offline_mode", False):
             return self._fallback_plan(case_context)
 
-        prompt = (
-            "You are the Planner for AutoLawyer-MCP. "
-            "Given the case context below, produce a JSON array of steps to "
-            "ingest, segment, score risk, propose redlines, compare docs, and "
-            "prepare executive summaries with traceability.\n"
-            f"Context:\n{json.dumps(case_context, indent=2)}"
-        )
+        signature = case_signature(case_context) if self.plan_cache is not None else None
+        cached = self._cached_plan(case_context, signature) if use_plan_cache else None
+        if cached is not None:
+            return cached
 
+        prompt = self._planner_prompt(case_context)
         plan_result: RouterResult = self.router.generate(
             task_type="planning",
             prompt=prompt,
-            schema_hint="[{\"name\": str, \"tool\": str, \"payload\": dict}]",
+            schema_hint=PLAN_SCHEMA_HINT,
         )
+        return self._plan_from_result(prompt, plan_result, case_context, signature)
 
+    def _cached_plan(self, case_context: Dict, signature: Optional[str]) -> Optional[List[AgentTask]]:
+        """
+        Skip the LLM planner when a validated plan exists for this case shape.
+        """
+        self.plan_cache_hit = False
+        if signature is None:
+            return None
+        steps = self.plan_cache.get(signature, STAGE_OUTPUTS)
+        if steps is None:
+            return None
+        self.plan_cache_hit = True
+        self._log(
+            task="Planner",
+            role="planner",
+            model="plan-cache",
+            prompt=f"signature {signature[:12]}",
+            result_preview=preview([step["tool"] for step in steps], 600),
+        )
+        return [
+            AgentTask(
+                name=step["name"],
+                tool=step["tool"],
+                payload=bind_payload(step["tool"], step["payload"], case_context),
+            )
+            for step in steps
+        ]
+
+    def _planner_prompt(self, case_context: Dict) -> str:
+        prompt, stats = build_planner_prompt(case_context, self.policies.planner_prompt_token_cap)
+        self.planner_prompt_stats = stats
+        return prompt
+
+    def _plan_from_result(
+        self, prompt: str, plan_result: RouterResult, case_context: Dict, signature: Optional[str] = None
+    ) -> List[AgentTask]:
+        self._llm_tokens += plan_result.tokens or 0
         try:
             steps = json.loads(plan_result.output)
         except json.JSONDecodeError as exc:
             raise ValueError(f"Planner returned invalid JSON plan: {exc}") from exc
 
-        tasks = [
-            AgentTask(
-                name=step.get("name", f"step-{idx+1}"),
-                tool=step.get("tool", "document_reader"),
-                payload=step.get("payload", {}),
+        # The planner only sees a compacted case; file paths and other case-bound
+        # fields come from the case itself, as they do for cached plans.
+        tasks = []
+        for idx, step in enumerate(steps):
+            tool = step.get("tool", "document_reader")
+            tasks.append(
+                AgentTask(
+                    name=step.get("name", f"step-{idx+1}"),
+                    tool=tool,
+                    payload=bind_payload(tool, step.get("payload") or {}, case_context),
+                )
             )
-            for idx, step in enumerate(steps)
-        ]
+        if signature is not None:
+            self.plan_cache.put(signature, [task.__dict__ for task in tasks], STAGE_OUTPUTS)
 
         self._log(
             task="Planner",
             role="planner",
             model=f"{plan_result.provider}:{plan_result.model}",
-            prompt=prompt,
-            result_preview=plan_result.output[:600],
+            prompt=preview(prompt, 600),
+            result_preview=preview(plan_result.output, 600),
         )
         return tasks
 
@@ -141,31 +198,109 @@ class AgentCore:
         """
         Execute each planned task using the MCP tool layer with retries + audits.
         """
+        for _ in self.iter_execute(tasks, artifacts):
+            pass
+        return artifacts
+
+    def iter_execute(self, tasks: List[AgentTask], artifacts: Dict) -> Iterator[AgentTask]:
+        """
+        Generator form of ``execute`` that yields each task as soon as it settles.
+        """
+        self._case_id = artifacts["case"].get("case_id")
+        case_id = self._case_id or "default"
+        fingerprints: Dict[str, str] = {}
+        digest = ArtifactDigest()
         for task in tasks:
-            retries = 0
-            while retries <= self.policies.max_retries:
-                try:
-                    result = self._dispatch_task(task, artifacts)
-                    task.result = result
-                    task.status = "completed"
-                    break
-                except Exception as exc:  # noqa: BLE001
-                    task.error = str(exc)
-                    retries += 1
-                    task.status = "retrying"
-                    if retries > self.policies.max_retries:
-                        task.status = "failed"
-                        self._log(
-                            task=task.name,
-                            role="worker",
-                            model="tool",
-                            prompt=json.dumps(task.payload),
-                            result_preview=f"ERROR: {exc}",
-                        )
-                        if self.policies.stop_on_failure:
-                            raise
+            with self.timings.measure(STAGE_NAMES.get(task.tool, task.tool)) as timing:
+                self._settle_task(task, artifacts, case_id, fingerprints, digest)
+                timing.items = count_items(artifacts.get(STAGE_OUTPUTS.get(task.tool)))
+                timing.status = task.status
+                timing.cached = task.from_checkpoint
+            yield task
         artifacts["tasks"] = [task.__dict__ for task in tasks]
-        return artifacts
+        artifacts["digest"] = digest.summary(artifacts["tasks"])
+
+    def _settle_task(
+        self,
+        task: AgentTask,
+        artifacts: Dict,
+        case_id: str,
+        fingerprints: Dict[str, str],
+        digest: ArtifactDigest,
+    ) -> None:
+        """
+        Restore ``task`` from its checkpoint or run it with retries, then record its fingerprint.
+        """
+        output_key = STAGE_OUTPUTS.get(task.tool)
+        fingerprint = None
+        if self.checkpoints is not None and output_key:
+            fingerprint = stage_fingerprint(
+                task.tool,
+                task.payload,
+                artifacts["case"],
+                fingerprints,
+                extra={"embeddings": self.enable_clause_embeddings},
+            )
+            if self._restore_checkpoint(task, artifacts, case_id, fingerprint):
+                fingerprints[output_key] = fingerprint
+                digest.observe(task.tool, artifacts)
+                return
+
+        retries = 0
+        while retries <= self.policies.max_retries:
+            try:
+                result = self._dispatch_task(task, artifacts)
+                task.result = result
+                task.status = "completed"
+                if fingerprint is not None:
+                    outputs = {output_key: artifacts[output_key]} if output_key in artifacts else {}
+                    self.checkpoints.save(case_id, fingerprint, task.tool, outputs, result)
+                break
+            except Exception as exc:  # noqa: BLE001
+                task.error = str(exc)
+                retries += 1
+                task.status = "retrying"
+                if retries > self.policies.max_retries:
+                    task.status = "failed"
+                    self._log(
+                        task=task.name,
+                        role="worker",
+                        model="tool",
+                        prompt=preview(task.payload, self.policies.audit_preview_chars),
+                        result_preview=f"ERROR: {exc}",
+                    )
+                    if self.policies.stop_on_failure:
+                        raise
+        if output_key and fingerprint is not None:
+            # Downstream stages must not reuse checkpoints built on a failed input.
+            fingerprints[output_key] = (
+                fingerprint if task.status == "completed" else f"failed:{fingerprint}"
+            )
+        if task.status == "completed":
+            digest.observe(task.tool, artifacts)
+
+    def _restore_checkpoint(
+        self, task: AgentTask, artifacts: Dict, case_id: str, fingerprint: str
+    ) -> bool:
+        """
+        Reuse a stage's stored artifacts when its inputs have not changed since the last run.
+        """
+        record = self.checkpoints.load(case_id, fingerprint)
+        if record is None or record.get("tool") != task.tool:
+            return False
+        artifacts.update(record.get("artifacts", {}))
+        task.result = record.get("result")
+        task.status = "completed"
+        task.error = None
+        task.from_checkpoint = True
+        self._log(
+            task=task.name,
+            role="worker",
+            model=task.tool,
+            prompt="checkpoint",
+            result_preview=f"Restored from checkpoint {fingerprint[:12]}",
+        )
+        return True
 
     def _dispatch_task(self, task: AgentTask, artifacts: Dict) -> Dict:
         """
@@ -176,17 +311,17 @@ class AgentCore:
 
         if tool_name == "document_reader":
             files = payload.get("files") or artifacts["case"].get("primary_documents", [])
-            result = document_reader.ingest_documents(files)
+            result = _tool("document_reader").ingest_documents(files)
             artifacts["documents"] = result
         elif tool_name == "clause_segmenter":
             docs = artifacts.get("documents", [])
-            result = clause_segmenter.segment_documents(
+            result = _tool("clause_segmenter").segment_documents(
                 docs, strategy=payload.get("strategy", "semantic")
             )
             artifacts["clauses"] = result
         elif tool_name == "clause_rag":
             if self.enable_clause_embeddings:
-                result = clause_rag.build_clause_index(
+                result = _tool("clause_rag").build_clause_index(
                     artifacts.get("clauses", []),
                     collection_name=payload.get("collection_name", "default"),
                 )
@@ -194,12 +329,12 @@ class AgentCore:
             else:
                 result = {"status": "skipped", "reason": "embeddings disabled"}
         elif tool_name == "risk_classifier":
-            result = risk_classifier.score_clauses(
+            result = _tool("risk_classifier").score_clauses(
                 artifacts.get("clauses", []), payload.get("policies", {})
             )
             artifacts["risks"] = result
         elif tool_name == "redline_generator":
-            result = redline_generator.generate_patch(
+            result = _tool("redline_generator").generate_patch(
                 baseline=artifacts.get("clauses", []),
                 clause_scores=artifacts.get("risks", []),
                 instructions=payload.get("instructions", ""),
@@ -211,14 +346,14 @@ class AgentCore:
             )
             prepared_comparisons = comparison_docs
             if comparison_docs and "content" not in comparison_docs[0]:
-                prepared_comparisons = document_reader.ingest_documents(comparison_docs)
-            result = comparator.compare_documents(
+                prepared_comparisons = _tool("document_reader").ingest_documents(comparison_docs)
+            result = _tool("comparator").compare_documents(
                 primary=artifacts.get("documents", []),
                 secondary=prepared_comparisons,
             )
             artifacts["comparisons"] = result
         elif tool_name == "report_builder":
-            result = report_builder.build_report(
+            result = _tool("report_builder").build_report(
                 risks=artifacts.get("risks", []),
                 redlines=artifacts.get("redlines", {}),
                 comparisons=artifacts.get("comparisons", []),
@@ -232,8 +367,8 @@ class AgentCore:
             task=task.name,
             role="worker",
             model=tool_name,
-            prompt=json.dumps(payload)[:400],
-            result_preview=json.dumps(result)[:400],
+            prompt=preview(payload, self.policies.audit_preview_chars),
+            result_preview=preview(result, self.policies.audit_preview_chars),
         )
         return result
 
@@ -244,13 +379,25 @@ class AgentCore:
         """
         Reviewer verifies coverage + accuracy, can trigger replans if needed.
         """
-        prompt = (
-            "You are the Reviewer for AutoLawyer-MCP. Inspect the artifacts below "
-            "and decide if they satisfy accuracy, explainability, and coverage "
-            "requirements. Respond with JSON {\"status\": \"pass|fail\", \"notes\": []}."
-            f"\nArtifacts: {json.dumps(artifacts, default=str)[:4000]}"
-        )
+        prompt = self._review_prompt(artifacts)
         verdict = self.router.generate("review", prompt)
+        return self._apply_verdict(artifacts, prompt, verdict)
+
+    @staticmethod
+    def _review_prompt(artifacts: Dict) -> str:
+        digest = artifacts.get("digest") or ArtifactDigest.from_artifacts(artifacts).summary(
+            artifacts.get("tasks", [])
+        )
+        return (
+            "You are the Reviewer for AutoLawyer-MCP. Inspect the artifact digest below "
+            "(coverage stats, severity counts, sampled high-risk clauses, redline and "
+            "comparison totals) and decide if it satisfies accuracy, explainability, and "
+            "coverage requirements. Respond with JSON {\"status\": \"pass|fail\", \"notes\": []}."
+            f"\nDigest: {dumps(digest).decode('utf-8')}"
+        )
+
+    def _apply_verdict(self, artifacts: Dict, prompt: str, verdict: RouterResult) -> Dict:
+        self._llm_tokens += verdict.tokens or 0
         try:
             parsed = json.loads(verdict.output)
         except json.JSONDecodeError:
@@ -260,8 +407,8 @@ class AgentCore:
             task="Reviewer",
             role="reviewer",
             model=f"{verdict.provider}:{verdict.model}",
-            prompt=prompt[:600],
-            result_preview=verdict.output[:600],
+            prompt=preview(prompt, 600),
+            result_preview=preview(verdict.output, 600),
         )
 
         if parsed.get("status") != "pass" and self.policies.auto_replan:
@@ -272,16 +419,116 @@ class AgentCore:
         return artifacts
 
     # --------------------------------------------------------------------- #
-    def run_case(self, case_context: Dict) -> Dict:
+    def run_case(self, case_context: Dict, profile: Optional[bool] = None) -> Dict:
         """
         Convenience helper that runs plan → execute → review with guardrails.
+        With ``profile`` (or a truthy ``case_context["profile"]``) the run is captured
+        with cProfile and stored under ``outcome["profile"]``.
         """
-        tasks = self.build_plan(case_context)
-        artifacts = self.execute(tasks, artifacts={"case": case_context})
-        outcome = self.review(artifacts)
-        outcome["logs"] = [log.__dict__ for log in self.logs]
+        if profile is None:
+            profile = bool(case_context.get("profile"))
+        outcome: Dict = {}
+        with profiled(profile) as captured:
+            for event in self.iter_case(case_context, stream_tokens=False):
+                if event["event"] == "result":
+                    outcome = event["data"]
+        if captured is not None:
+            outcome["profile"] = captured
         return outcome
 
+    def iter_case(self, case_context: Dict, stream_tokens: bool = True) -> Iterator[Dict]:
+        """
+        Run the case while yielding progress events: planner/reviewer token deltas
+        (when ``stream_tokens``), the plan, each settled task, the review verdict and
+        finally ``{"event": "result", "data": outcome}``.
+        """
+        replans = 0
+        self.planner_prompt_stats = None
+        self.plan_cache_hit = False
+        self.timings = StageTimings(REGISTRY)
+        while True:
+            # A replan means the last plan was judged insufficient: ask the LLM afresh.
+            with self.timings.measure("planner") as timing:
+                tokens_before = self._llm_tokens
+                if stream_tokens:
+                    tasks = yield from self.timings.relay(
+                        timing, self._stream_plan(case_context, use_plan_cache=replans == 0)
+                    )
+                else:
+                    tasks = self.build_plan(case_context, use_plan_cache=replans == 0)
+                timing.items = len(tasks)
+                timing.tokens = self._llm_tokens - tokens_before
+                timing.cached = self.plan_cache_hit
+            yield {"event": "plan", "data": [{"name": task.name, "tool": task.tool} for task in tasks]}
+
+            artifacts: Dict = {"case": case_context}
+            for task in self.iter_execute(tasks, artifacts):
+                yield {
+                    "event": "task",
+                    "data": {
+                        "name": task.name,
+                        "tool": task.tool,
+                        "status": task.status,
+                        "error": task.error,
+                        "from_checkpoint": task.from_checkpoint,
+                    },
+                }
+
+            with self.timings.measure("reviewer") as timing:
+                tokens_before = self._llm_tokens
+                if stream_tokens:
+                    outcome = yield from self.timings.relay(timing, self._stream_review(artifacts))
+                else:
+                    outcome = self.review(artifacts)
+                timing.items = len(outcome.get("review_notes", []))
+                timing.tokens = self._llm_tokens - tokens_before
+            yield {
+                "event": "review",
+                "data": {"status": outcome.get("review_status"), "notes": outcome.get("review_notes", [])},
+            }
+            if outcome.get("review_status") != "replan" or replans >= self.policies.max_replans:
+                break
+            # Stages whose inputs are unchanged are restored from checkpoints, so a
+            # replan only pays for the steps the new plan actually alters.
+            replans += 1
+
+        if self.checkpoints is not None and all(task.status == "completed" for task in tasks):
+            # Checkpoints exist to resume a failed or interrupted run; a finished case needs none.
+            self.checkpoints.clear(self._case_id or "default")
+        outcome["replans"] = replans
+        outcome["planner_prompt"] = self.planner_prompt_stats
+        outcome["plan_cache_hit"] = self.plan_cache_hit
+        outcome["timings"] = self.timings.as_dict()
+        outcome["logs"] = [log.__dict__ for log in self.logs.for_case(self._case_id)]
+        yield {"event": "result", "data": outcome}
+
+    def _stream_plan(self, case_context: Dict, use_plan_cache: bool = True):
+        self._case_id = case_context.get("case_id")
+        if getattr(self.router, "offline_mode", False):
+            return self._fallback_plan(case_context)
+        signature = case_signature(case_context) if self.plan_cache is not None else None
+        cached = self._cached_plan(case_context, signature) if use_plan_cache else None
+        if cached is not None:
+            return cached
+        prompt = self._planner_prompt(case_context)
+        plan_result: Optional[RouterResult] = None
+        for chunk in self.router.stream("planning", prompt, schema_hint=PLAN_SCHEMA_HINT):
+            if chunk.result is not None:
+                plan_result = chunk.result
+            elif chunk.delta:
+                yield {"event": "planner", "data": {"delta": chunk.delta}}
+        return self._plan_from_result(prompt, plan_result, case_context, signature)
+
+    def _stream_review(self, artifacts: Dict):
+        prompt = self._review_prompt(artifacts)
+        verdict: Optional[RouterResult] = None
+        for chunk in self.router.stream("review", prompt):
+            if chunk.result is not None:
+                verdict = chunk.result
+            elif chunk.delta:
+                yield {"event": "reviewer", "data": {"delta": chunk.delta}}
+        return self._apply_verdict(artifacts, prompt, verdict)
+
     def _log(self, task: str, role: str, model: str, prompt: str, result_preview: str):
         self.logs.append(
             AuditLogEntry(
@@ -290,6 +537,7 @@ class AgentCore:
                 model=model,
                 prompt=prompt,
                 result_preview=result_preview,
+                case_id=self._case_id,
             )
         )
 
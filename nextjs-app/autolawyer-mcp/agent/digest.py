@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, List
+
+
+SEVERITIES = ("critical", "high", "medium", "low")
+
+
+class ArtifactDigest:
+    """
+    Compact, representative summary of a case's artifacts for the Reviewer.
+
+    Stats are folded in stage by stage as the Worker produces artifacts, so the
+    reviewer prompt never needs the raw documents or clause bodies.
+    """
+
+    def __init__(self, sample_size: int = 5, snippet_chars: int = 200) -> None:
+        self.sample_size = sample_size
+        self.snippet_chars = snippet_chars
+        self.documents = {"count": 0, "characters": 0}
+        self.clauses = {"count": 0, "per_document": {}}
+        self.risks = {"scored": 0, "coverage": 0.0, "severity_counts": dict.fromkeys(SEVERITIES, 0)}
+        self.high_risk_samples: List[Dict] = []
+        self.redlines = {"patches": 0, "high_risk_covered": 0, "high_risk_total": 0}
+        self.comparisons = {"documents": 0, "issues": 0}
+        self.index = {"items": 0}
+        self._bodies: Dict[str, str] = {}
+        self._high_risk_ids: set = set()
+
+    def observe(self, tool: str, artifacts: Dict) -> None:
+        if tool == "document_reader":
+            self._observe_documents(artifacts.get("documents", []))
+        elif tool == "clause_segmenter":
+            self._observe_clauses(artifacts.get("clauses", []))
+        elif tool == "clause_rag":
+            self.index["items"] = (artifacts.get("rag_index") or {}).get("num_items", 0)
+        elif tool == "risk_classifier":
+            self._observe_risks(artifacts.get("risks", []))
+        elif tool == "redline_generator":
+            self._observe_redlines(artifacts.get("redlines", {}))
+        elif tool == "comparator":
+            self._observe_comparisons(artifacts.get("comparisons", []))
+
+    @classmethod
+    def from_artifacts(cls, artifacts: Dict, **kwargs) -> "ArtifactDigest":
+        digest = cls(**kwargs)
+        for tool in ("document_reader", "clause_segmenter", "clause_rag", "risk_classifier", "redline_generator", "comparator"):
+            digest.observe(tool, artifacts)
+        return digest
+
+    def summary(self, tasks: Iterable[Dict] = ()) -> Dict:
+        return {
+            "documents": dict(self.documents),
+            "clauses": {"count": self.clauses["count"], "per_document": dict(self.clauses["per_document"])},
+            "risks": {**self.risks, "severity_counts": dict(self.risks["severity_counts"])},
+            "high_risk_samples": list(self.high_risk_samples),
+            "redlines": dict(self.redlines),
+            "comparisons": dict(self.comparisons),
+            "index": dict(self.index),
+            "tasks": [
+                {"name": task.get("name"), "tool": task.get("tool"), "status": task.get("status")}
+                for task in tasks
+            ],
+        }
+
+    # ------------------------------------------------------------------ #
+    def _observe_documents(self, documents: Iterable[Dict]) -> None:
+        count = 0
+        characters = 0
+        for doc in documents:
+            count += 1
+            characters += len(doc.get("content", ""))
+        self.documents = {"count": count, "characters": characters}
+
+    def _observe_clauses(self, clauses: Iterable[Dict]) -> None:
+        per_document: Dict[str, int] = {}
+        self._bodies = {}
+        for clause in clauses:
+            doc = clause.get("source_document", "unknown")
+            per_document[doc] = per_document.get(doc, 0) + 1
+            self._bodies[clause["clause_id"]] = clause.get("body", "")[: self.snippet_chars]
+        self.clauses = {"count": len(self._bodies), "per_document": per_document}
+
+    def _observe_risks(self, risks: Iterable[Dict]) -> None:
+        counts = dict.fromkeys(SEVERITIES, 0)
+        scored = 0
+        flagged: List[Dict] = []
+        for risk in risks:
+            scored += 1
+            counts[risk["severity"]] = counts.get(risk["severity"], 0) + 1
+            if risk["severity"] in {"critical", "high"}:
+                flagged.append(risk)
+        self._high_risk_ids = {risk["clause_id"] for risk in flagged}
+        top = heapq.nlargest(self.sample_size, flagged, key=lambda risk: risk.get("risk_score", 0.0))
+        self.high_risk_samples = [
+            {
+                "clause_id": risk["clause_id"],
+                "heading": risk.get("heading", ""),
+                "severity": risk["severity"],
+                "risk_score": round(risk.get("risk_score", 0.0), 3),
+                "rationale": risk.get("rationale", ""),
+                "snippet": self._bodies.get(risk["clause_id"], ""),
+            }
+            for risk in top
+        ]
+        total = self.clauses["count"]
+        self.risks = {
+            "scored": scored,
+            "coverage": round(scored / total, 3) if total else 0.0,
+            "severity_counts": counts,
+        }
+
+    def _observe_redlines(self, redlines: Dict) -> None:
+        patches = (redlines or {}).get("patches", [])
+        patched = {patch["clause_id"] for patch in patches}
+        self.redlines = {
+            "patches": len(patches),
+            "high_risk_covered": len(patched & self._high_risk_ids),
+            "high_risk_total": len(self._high_risk_ids),
+        }
+
+    def _observe_comparisons(self, comparisons: Iterable[Dict]) -> None:
+        documents = 0
+        issues = 0
+        for finding in comparisons or []:
+            documents += 1
+            issues += finding.get("issues", 0)
+        self.comparisons = {"documents": documents, "issues": issues}
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class ProviderStats:
+    """
+    Rolling latency / error view of one provider, fed from every routed call.
+
+    The error rate also halves every ``error_half_life_s`` seconds without calls: an
+    unhealthy provider ranks last and may get no traffic to succeed on, so a burst of
+    failures must not demote it for the life of the process.
+    """
+
+    def __init__(self, alpha: float = 0.3, window: int = 50, error_half_life_s: Optional[float] = None) -> None:
+        self.alpha = alpha
+        if error_half_life_s is None:
+            error_half_life_s = float(os.getenv("AUTOLAWYER_ERROR_HALF_LIFE_S", "60"))
+        self.error_half_life_s = error_half_life_s
+        self.ewma_latency_ms: Optional[float] = None
+        self._error_rate = 0.0
+        self._error_at = time.monotonic()
+        self.calls = 0
+        self.errors = 0
+        self._recent: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return self._decayed_error_rate(time.monotonic())
+
+    def record_success(self, latency_ms: float) -> None:
+        with self._lock:
+            self._set_error_rate(self._decayed_error_rate(time.monotonic()) * (1 - self.alpha))
+            self.calls += 1
+            self._recent.append(latency_ms)
+            if self.ewma_latency_ms is None:
+                self.ewma_latency_ms = latency_ms
+            else:
+                self.ewma_latency_ms += self.alpha * (latency_ms - self.ewma_latency_ms)
+
+    def record_error(self) -> None:
+        with self._lock:
+            rate = self._decayed_error_rate(time.monotonic())
+            self._set_error_rate(rate + self.alpha * (1.0 - rate))
+            self.calls += 1
+            self.errors += 1
+
+    def p95(self, min_samples: int = 5) -> Optional[float]:
+        with self._lock:
+            if len(self._recent) < min_samples:
+                return None
+            ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def healthy(self, max_error_rate: float) -> bool:
+        return self.error_rate < max_error_rate
+
+    def _decayed_error_rate(self, now: float) -> float:
+        if self.error_half_life_s <= 0:
+            return self._error_rate
+        return self._error_rate * 0.5 ** ((now - self._error_at) / self.error_half_life_s)
+
+    def _set_error_rate(self, rate: float) -> None:
+        self._error_rate = rate
+        self._error_at = time.monotonic()
+
+    def snapshot(self) -> Dict:
+        return {
+            "ewma_latency_ms": round(self.ewma_latency_ms, 1) if self.ewma_latency_ms is not None else None,
+            "p95_latency_ms": self.p95(),
+            "error_rate": round(self.error_rate, 3),
+            "calls": self.calls,
+            "errors": self.errors,
+        }
+
+
+_registry: Dict[str, ProviderStats] = {}
+_registry_lock = threading.Lock()
+
+
+def shared_stats(provider: str) -> ProviderStats:
+    """
+    Process-wide stats for ``provider``, so per-request routers rank on the same history.
+    """
+    with _registry_lock:
+        stats = _registry.get(provider)
+        if stats is None:
+            stats = _registry[provider] = ProviderStats()
+        return stats
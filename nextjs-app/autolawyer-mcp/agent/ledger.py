@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class TokenLedger:
+    """
+    Cross-process token usage ledger backed by SQLite in WAL mode.
+
+    Every process that builds a ModelRouter shares the same counters, so budgets
+    survive between service invocations and API requests without a network service.
+    Usage is counted per window of ``window_seconds`` (AUTOLAWYER_LEDGER_WINDOW_HOURS,
+    default 24, aligned to UTC midnight for whole days): provider budgets apply to the
+    current window and refill when the next one starts. ``python -m agent.ledger
+    --reset`` clears the counters by hand.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        refresh_interval: float = 0.5,
+        window_seconds: Optional[float] = None,
+    ) -> None:
+        if path is None:
+            path = _default_path()
+        if window_seconds is None:
+            window_seconds = float(os.getenv("AUTOLAWYER_LEDGER_WINDOW_HOURS", "24")) * 3600
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.refresh_interval = refresh_interval
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS token_windows ("
+            "provider TEXT NOT NULL, period INTEGER NOT NULL, tokens INTEGER NOT NULL DEFAULT 0, "
+            "updated_at REAL NOT NULL, PRIMARY KEY (provider, period))"
+        )
+        # Earlier windows never count again.
+        self._conn.execute("DELETE FROM token_windows WHERE period < ?", (self.current_window(),))
+        self._snapshot: Dict[str, int] = {}
+        self._snapshot_window = self.current_window()
+        self._snapshot_at = 0.0
+
+    def current_window(self) -> int:
+        if self.window_seconds <= 0:
+            return 0  # one window forever: only reset() clears usage
+        return int(time.time() // self.window_seconds)
+
+    def add(self, provider: str, tokens: int) -> int:
+        """
+        Atomically add ``tokens`` to a provider and return its total for the current window.
+        """
+        window = self.current_window()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO token_windows (provider, period, tokens, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(provider, period) DO UPDATE SET "
+                    "tokens = tokens + excluded.tokens, updated_at = excluded.updated_at",
+                    (provider, window, int(tokens), time.time()),
+                )
+                row = self._conn.execute(
+                    "SELECT tokens FROM token_windows WHERE provider = ? AND period = ?", (provider, window)
+                ).fetchone()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            total = int(row[0])
+            if window != self._snapshot_window:
+                self._snapshot, self._snapshot_window, self._snapshot_at = {}, window, 0.0
+            self._snapshot[provider] = total
+        return total
+
+    def snapshot(self, max_age: Optional[float] = None) -> Dict[str, int]:
+        """
+        Usage per provider in the current window, re-read from disk at most every
+        ``refresh_interval`` seconds (and always once a new window has started).
+        """
+        max_age = self.refresh_interval if max_age is None else max_age
+        window = self.current_window()
+        with self._lock:
+            if window != self._snapshot_window or time.monotonic() - self._snapshot_at >= max_age:
+                rows = self._conn.execute(
+                    "SELECT provider, tokens FROM token_windows WHERE period = ?", (window,)
+                ).fetchall()
+                self._snapshot = {name: int(tokens) for name, tokens in rows}
+                self._snapshot_window = window
+                self._snapshot_at = time.monotonic()
+            return dict(self._snapshot)
+
+    def used(self, provider: str) -> int:
+        return self.snapshot().get(provider, 0)
+
+    def reset(self, provider: Optional[str] = None) -> None:
+        with self._lock:
+            if provider is None:
+                self._conn.execute("DELETE FROM token_windows")
+                self._snapshot = {}
+            else:
+                self._conn.execute("DELETE FROM token_windows WHERE provider = ?", (provider,))
+                self._snapshot.pop(provider, None)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_registry: Dict[str, TokenLedger] = {}
+_registry_lock = threading.Lock()
+
+
+def shared_ledger() -> Optional[TokenLedger]:
+    """
+    Process-wide ledger for the configured file (None when AUTOLAWYER_LEDGER=0), so
+    per-request routers reuse one SQLite connection instead of opening their own.
+    """
+    if os.getenv("AUTOLAWYER_LEDGER", "1") == "0":
+        return None
+    path = _default_path()
+    with _registry_lock:
+        ledger = _registry.get(str(path))
+        if ledger is None:
+            ledger = _registry[str(path)] = TokenLedger(path)
+        return ledger
+
+
+def _default_path() -> Path:
+    return Path(os.getenv("AUTOLAWYER_LEDGER_DB", str(Path(tempfile.gettempdir()) / "autolawyer-ledger.sqlite3")))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show or reset the shared token ledger.")
+    parser.add_argument("--reset", action="store_true", help="clear usage so budgets start over")
+    parser.add_argument("--provider", default=None, help="limit --reset to one provider")
+    args = parser.parse_args()
+    ledger = TokenLedger()
+    if args.reset:
+        ledger.reset(args.provider)
+    print(json.dumps({"path": str(ledger.path), "window": ledger.current_window(), "usage": ledger.snapshot(max_age=0)}))
+    ledger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at ``capacity`` units per minute.
+    Not thread-safe on its own; ProviderLimiter guards it.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._stamp = time.monotonic()
+
+    def delay(self, amount: float) -> float:
+        """
+        Seconds until ``amount`` units are available (0 if they are available now).
+        """
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + max(amount, 0))
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+
+class ProviderLimiter:
+    """
+    Per-provider RPM/TPM buckets plus a bounded in-flight count.
+
+    Callers are admitted strictly first-come first-served: a waiting request blocks
+    everyone behind it instead of erroring, so bursts queue instead of triggering 429s.
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0, max_in_flight: int = 0) -> None:
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._queue: Deque[object] = deque()
+        self.admitted = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def acquire(self, tokens: int, requests: int = 1) -> float:
+        """
+        Block until the request may be sent; returns the queue wait in milliseconds.
+        ``requests`` > 1 admits a fan-out of that many calls (sharing ``tokens``) at
+        once, so two concurrent batches can never deadlock on partly acquired slots.
+        """
+        if self.max_in_flight > 0:
+            requests = min(requests, self.max_in_flight)
+        started = time.monotonic()
+        ticket = object()
+        with self._cond:
+            self._queue.append(ticket)
+            while True:
+                if self._queue[0] is ticket and not self._saturated(requests):
+                    delay = max(
+                        self.requests.delay(requests) if self.requests else 0.0,
+                        self.tokens.delay(tokens) if self.tokens else 0.0,
+                    )
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+            self._queue.popleft()
+            if self.requests:
+                self.requests.consume(requests)
+            if self.tokens:
+                self.tokens.consume(tokens)
+            self.in_flight += requests
+            wait_ms = (time.monotonic() - started) * 1000
+            self.admitted += requests
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self._cond.notify_all()
+        return wait_ms
+
+    def release(self, reserved_tokens: int, used_tokens: Optional[int] = None, requests: int = 1) -> None:
+        """
+        Free the in-flight slot(s) and return over-reserved tokens to the TPM bucket.
+        """
+        if self.max_in_flight > 0:
+            requests = min(requests, self.max_in_flight)
+        with self._cond:
+            self.in_flight -= requests
+            if self.tokens and used_tokens is not None:
+                self.tokens.refund(reserved_tokens - used_tokens)
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict:
+        with self._cond:
+            return {
+                "in_flight": self.in_flight,
+                "queued": len(self._queue),
+                "admitted": self.admitted,
+                "avg_queue_wait_ms": round(self.total_wait_ms / self.admitted, 2) if self.admitted else 0.0,
+                "max_queue_wait_ms": round(self.max_wait_ms, 2),
+            }
+
+    def _saturated(self, requests: int = 1) -> bool:
+        return self.max_in_flight > 0 and self.in_flight + requests > self.max_in_flight
+
+
+_registry: Dict[str, ProviderLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def shared_limiter(provider: str, rpm: int = 0, tpm: int = 0, max_in_flight: int = 0) -> ProviderLimiter:
+    """
+    Process-wide limiter for ``provider``: every router in the process draws on the
+    same buckets and in-flight slots. The limits come from the first caller; they are
+    read from the environment, so they are the same for every router anyway.
+    """
+    with _registry_lock:
+        limiter = _registry.get(provider)
+        if limiter is None:
+            limiter = _registry[provider] = ProviderLimiter(rpm, tpm, max_in_flight)
+        return limiter
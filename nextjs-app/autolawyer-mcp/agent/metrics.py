@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, Generator, Iterator, List, Optional
+
+
+# Tool -> stage label used in timings and metrics.
+STAGE_NAMES = {
+    "document_reader": "ingest",
+    "clause_segmenter": "segment",
+    "clause_rag": "index",
+    "risk_classifier": "score",
+    "redline_generator": "redline",
+    "comparator": "compare",
+    "report_builder": "report",
+}
+
+# Histogram buckets for stage wall time, in seconds.
+BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass
+class StageTiming:
+    stage: str
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    items: int = 0
+    tokens: int = 0
+    status: str = "completed"
+    cached: bool = False
+
+
+def count_items(value) -> int:
+    """
+    Size of a stage output: table or list length, redline patches, indexed items or
+    report sections.
+    """
+    if isinstance(value, dict):
+        if isinstance(value.get("patches"), list):
+            return len(value["patches"])
+        if isinstance(value.get("num_items"), int):
+            return value["num_items"]
+        return len(value)
+    if isinstance(value, str):
+        return 0
+    try:
+        # ClauseTable / RiskTable and other sized outputs.
+        return len(value)
+    except TypeError:
+        return 0
+
+
+class StageTimings:
+    """
+    Per-case stage measurements. CPU time is the calling thread's, so cases running
+    side by side on a pool do not count each other's work; a streamed stage resumed
+    on another thread falls back to process CPU time. Time a streamed stage spends
+    waiting on its consumer is left out via ``relay``.
+    """
+
+    def __init__(self, registry: Optional["MetricsRegistry"] = None) -> None:
+        self.stages: List[StageTiming] = []
+        self.registry = registry
+        # Open measurements by id(timing): [wall, thread cpu, process cpu] seconds to leave out.
+        self._paused: Dict[int, List[float]] = {}
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[StageTiming]:
+        timing = StageTiming(stage=stage)
+        wall_start = time.perf_counter()
+        thread_id = threading.get_ident()
+        cpu_start, process_start = time.thread_time(), time.process_time()
+        paused = self._paused[id(timing)] = [0.0, 0.0, 0.0]
+        try:
+            yield timing
+        except BaseException:
+            timing.status = "failed"
+            raise
+        finally:
+            del self._paused[id(timing)]
+            wall = time.perf_counter() - wall_start - paused[0]
+            timing.wall_ms = round(max(0.0, wall) * 1000, 3)
+            if threading.get_ident() == thread_id:
+                cpu = time.thread_time() - cpu_start - paused[1]
+            else:
+                cpu = time.process_time() - process_start - paused[2]
+            timing.cpu_ms = round(max(0.0, cpu) * 1000, 3)
+            self.stages.append(timing)
+            if self.registry is not None:
+                self.registry.observe(timing)
+
+    def relay(self, timing: StageTiming, events: Generator) -> Generator:
+        """
+        ``yield from events`` inside ``measure``, without counting the time the
+        consumer holds each event (an SSE client writing to a slow socket, say).
+        """
+        paused = self._paused[id(timing)]
+        try:
+            while True:
+                try:
+                    event = next(events)
+                except StopIteration as stop:
+                    return stop.value
+                thread_id = threading.get_ident()
+                wall, cpu, process = time.perf_counter(), time.thread_time(), time.process_time()
+                yield event
+                paused[0] += time.perf_counter() - wall
+                paused[2] += time.process_time() - process
+                if threading.get_ident() == thread_id:
+                    paused[1] += time.thread_time() - cpu
+        finally:
+            events.close()
+
+    def as_dict(self) -> Dict:
+        totals: Dict[str, Dict] = {}
+        for timing in self.stages:
+            entry = totals.setdefault(
+                timing.stage, {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "items": 0, "tokens": 0}
+            )
+            entry["calls"] += 1
+            entry["wall_ms"] = round(entry["wall_ms"] + timing.wall_ms, 3)
+            entry["cpu_ms"] = round(entry["cpu_ms"] + timing.cpu_ms, 3)
+            entry["items"] += timing.items
+            entry["tokens"] += timing.tokens
+        return {
+            "stages": [asdict(timing) for timing in self.stages],
+            "totals": totals,
+            "wall_ms": round(sum(timing.wall_ms for timing in self.stages), 3),
+        }
+
+
+class MetricsRegistry:
+    """
+    Process-wide stage aggregates rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self, buckets=BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict] = {}
+
+    def observe(self, timing: StageTiming) -> None:
+        seconds = timing.wall_ms / 1000
+        with self._lock:
+            entry = self._stages.setdefault(
+                timing.stage,
+                {
+                    "buckets": [0] * len(self.buckets),
+                    "count": 0,
+                    "wall": 0.0,
+                    "cpu": 0.0,
+                    "items": 0,
+                    "tokens": 0,
+                    "failures": 0,
+                    "cached": 0,
+                },
+            )
+            for idx, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry["buckets"][idx] += 1
+            entry["count"] += 1
+            entry["wall"] += seconds
+            entry["cpu"] += timing.cpu_ms / 1000
+            entry["items"] += timing.items
+            entry["tokens"] += timing.tokens
+            entry["failures"] += timing.status != "completed"
+            entry["cached"] += timing.cached
+
+    def render(self) -> str:
+        lines = [
+            "# HELP autolawyer_stage_seconds Wall time per pipeline stage.",
+            "# TYPE autolawyer_stage_seconds histogram",
+        ]
+        with self._lock:
+            stages = {name: dict(entry, buckets=list(entry["buckets"])) for name, entry in self._stages.items()}
+        for name, entry in sorted(stages.items()):
+            for bound, count in zip(self.buckets, entry["buckets"]):
+                lines.append(f'autolawyer_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'autolawyer_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {entry["count"]}')
+            lines.append(f'autolawyer_stage_seconds_sum{{stage="{name}"}} {entry["wall"]:.6f}')
+            lines.append(f'autolawyer_stage_seconds_count{{stage="{name}"}} {entry["count"]}')
+        for metric, key, kind, help_text in (
+            ("autolawyer_stage_cpu_seconds_total", "cpu", "counter", "Thread CPU time per stage."),
+            ("autolawyer_stage_items_total", "items", "counter", "Items produced per stage."),
+            ("autolawyer_stage_tokens_total", "tokens", "counter", "LLM tokens charged per stage."),
+            ("autolawyer_stage_failures_total", "failures", "counter", "Failed stage runs."),
+            ("autolawyer_stage_cache_hits_total", "cached", "counter", "Stages served from a checkpoint or the plan cache."),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, entry in sorted(stages.items()):
+                lines.append(f'{metric}{{stage="{name}"}} {entry[key]:g}')
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+MODAL_APP_PATH = Path(__file__).resolve().parents[1] / "modal_app.py"
+
+_lock = threading.Lock()
+_loaded = False
+_complete_text = None
+
+
+class LocalCompleteText:
+    """
+    In-process stand-in exposing the slice of the Modal Function API the router uses
+    (``remote``, ``map``, ``spawn``), for tests and local runs without Modal.
+    """
+
+    def __init__(self, fn: Callable[..., str]) -> None:
+        self.fn = fn
+
+    def remote(self, **kwargs) -> str:
+        return self.fn(**kwargs)
+
+    def map(self, *iterables, kwargs: Optional[Dict] = None):
+        for args in zip(*iterables):
+            yield self.fn(*args, **(kwargs or {}))
+
+    def spawn(self, **kwargs):
+        return _ImmediateCall(self.fn(**kwargs))
+
+
+class _ImmediateCall:
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+    def get(self, timeout: Optional[float] = None) -> str:
+        return self.value
+
+
+def complete_text_handle():
+    """
+    Return the cached ``complete_text`` handle, loading ``modal_app.py`` once per process.
+    Returns None when Modal is unavailable; the failure is cached as well.
+    """
+    global _loaded, _complete_text
+    if _loaded:
+        return _complete_text
+    with _lock:
+        if not _loaded:
+            _complete_text = _load_complete_text()
+            _loaded = True
+    return _complete_text
+
+
+def set_complete_text(handle) -> None:
+    """
+    Install a handle (e.g. ``LocalCompleteText(fake)``) or ``None`` to force a reload.
+    """
+    global _loaded, _complete_text
+    with _lock:
+        _complete_text = handle
+        _loaded = handle is not None
+
+
+def complete_many(
+    prompts: List[str],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+) -> List[str]:
+    """
+    Fan many completions out in parallel: ``.map`` when available, else ``.spawn``.
+    """
+    handle = complete_text_handle()
+    if handle is None:
+        raise ImportError("Modal bridge is not available")
+    count = len(prompts)
+    if hasattr(handle, "map"):
+        return list(
+            handle.map(prompts, [model] * count, [temperature] * count, [max_tokens] * count)
+        )
+    if hasattr(handle, "spawn"):
+        calls = [
+            handle.spawn(prompt=prompt, model=model, temperature=temperature, max_tokens=max_tokens)
+            for prompt in prompts
+        ]
+        return [call.get() for call in calls]
+    with ThreadPoolExecutor(max_workers=min(8, count or 1)) as pool:
+        return list(
+            pool.map(
+                lambda prompt: handle.remote(
+                    prompt=prompt, model=model, temperature=temperature, max_tokens=max_tokens
+                ),
+                prompts,
+            )
+        )
+
+
+def _load_complete_text():
+    if not MODAL_APP_PATH.exists():
+        return None
+    try:
+        spec = importlib.util.spec_from_file_location("modal_app", MODAL_APP_PATH)
+        modal_app = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modal_app)
+        return modal_app.complete_text
+    except (ImportError, AttributeError):
+        return None
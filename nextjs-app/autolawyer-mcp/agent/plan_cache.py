@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+# Payload keys the planner fills from the case itself; they are re-bound on every hit.
+CASE_BOUND_KEYS = ("files", "collection_name", "policies", "instructions", "counterparty_documents")
+
+
+def case_signature(case_context: Dict) -> str:
+    """
+    Structural shape of a case: doc counts/types per side, policy keys and whether
+    instructions are present. Cases with the same shape get the same plan.
+    """
+    def doc_types(files: Iterable[Dict]) -> List[str]:
+        return sorted(
+            Path(raw.get("name") or raw.get("path", "")).suffix.lower() or "unknown"
+            for raw in files or []
+        )
+
+    shape = {
+        "primary": doc_types(case_context.get("primary_documents", [])),
+        "counterparty": doc_types(case_context.get("counterparty_documents", [])),
+        "policy_keys": sorted(case_context.get("policies") or {}),
+        "instructions": bool(case_context.get("instructions")),
+    }
+    return hashlib.sha256(json.dumps(shape, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def bind_payload(tool: str, template: Dict, case_context: Dict) -> Dict:
+    """
+    Fill the case-specific payload fields for ``tool`` from ``case_context``.
+    """
+    payload = {key: value for key, value in template.items() if key not in CASE_BOUND_KEYS}
+    if tool == "document_reader":
+        payload["files"] = case_context.get("primary_documents", [])
+    elif tool == "clause_rag":
+        payload["collection_name"] = case_context.get("case_id", "default")
+    elif tool == "risk_classifier":
+        payload["policies"] = case_context.get("policies", {})
+    elif tool == "redline_generator":
+        payload["instructions"] = case_context.get("instructions", "")
+    elif tool == "comparator":
+        payload["counterparty_documents"] = case_context.get("counterparty_documents", [])
+    return payload
+
+
+class PlanCache:
+    """
+    In-process LRU of validated plan templates keyed by case signature.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._plans: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, signature: str, valid_tools: Iterable[str]) -> Optional[List[Dict]]:
+        with self._lock:
+            steps = self._plans.get(signature)
+            if steps is None:
+                self.misses += 1
+                return None
+            if not _valid(steps, valid_tools):
+                del self._plans[signature]
+                self.misses += 1
+                return None
+            self._plans.move_to_end(signature)
+            self.hits += 1
+            return steps
+
+    def put(self, signature: str, steps: List[Dict], valid_tools: Iterable[str]) -> bool:
+        """
+        Store a plan template; plans naming unknown tools are rejected.
+        """
+        if not _valid(steps, valid_tools):
+            return False
+        template = [
+            {
+                "name": step["name"],
+                "tool": step["tool"],
+                "payload": {
+                    key: value
+                    for key, value in (step.get("payload") or {}).items()
+                    if key not in CASE_BOUND_KEYS
+                },
+            }
+            for step in steps
+        ]
+        with self._lock:
+            self._plans[signature] = template
+            self._plans.move_to_end(signature)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+        return True
+
+    def stats(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._plans)}
+
+
+def _valid(steps: List[Dict], valid_tools: Iterable[str]) -> bool:
+    tools = set(valid_tools)
+    return bool(steps) and all(step.get("tool") in tools for step in steps)
+
+
+_default_cache = PlanCache()
+
+
+def default_plan_cache() -> PlanCache:
+    """
+    Process-wide cache, so per-request AgentCore instances share learned plans.
+    """
+    return _default_cache
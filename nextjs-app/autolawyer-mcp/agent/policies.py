@@ -12,5 +12,11 @@ class ExecutionPolicies:
     max_retries: int = 2
     stop_on_failure: bool = False
     auto_replan: bool = True
+    max_replans: int = 0
+    checkpoint_stages: bool = True
+    audit_log_limit: int = 1000
+    audit_preview_chars: int = 400
+    planner_prompt_token_cap: int = 1500
+    cache_plans: bool = True
 
 
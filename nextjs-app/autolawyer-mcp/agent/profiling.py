@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import base64
+import cProfile
+import io
+import marshal
+import pstats
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+@contextmanager
+def profiled(enabled: bool, top: int = 40) -> Iterator[Optional[Dict]]:
+    """
+    Profile the enclosed block with cProfile when ``enabled``; the yielded dict is
+    filled with the summary on exit. Disabled, it yields None and adds no hooks.
+    """
+    if not enabled:
+        yield None
+        return
+    captured: Dict = {}
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield captured
+    finally:
+        profiler.disable()
+        captured.update(summarize(profiler, top))
+
+
+def summarize(profiler: cProfile.Profile, top: int = 40) -> Dict:
+    """
+    Top functions by cumulative time plus the full stats, base64-encoded in the
+    ``.prof`` format that ``pstats`` / snakeviz load.
+    """
+    stats = pstats.Stats(profiler)
+    rows: List[Dict] = []
+    ordered = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in ordered[:top]:
+        rows.append(
+            {
+                "function": f"{filename}:{line}({name})",
+                "ncalls": ncalls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            }
+        )
+    return {
+        "format": "cprofile",
+        "total_ms": round(stats.total_tt * 1000, 3),
+        "top": rows,
+        "pstats_b64": base64.b64encode(marshal.dumps(stats.stats)).decode("ascii"),
+    }
+
+
+def profile_bytes(profile: Dict) -> bytes:
+    """Raw ``.prof`` file contents for a stored profile."""
+    return base64.b64decode(profile["pstats_b64"])
+
+
+def render_profile_text(profile: Dict, limit: int = 40) -> str:
+    """``pstats``-style report (cumulative order) for a stored profile."""
+    stats = pstats.Stats(_StoredStats(profile), stream=io.StringIO())
+    stats.sort_stats("cumulative").print_stats(limit)
+    return stats.stream.getvalue()
+
+
+class _StoredStats:
+    # pstats.Stats accepts any object exposing create_stats()/stats.
+    def __init__(self, profile: Dict) -> None:
+        self.stats = marshal.loads(profile_bytes(profile))
+
+    def create_stats(self) -> None:
+        pass
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from agent.tokens import count_tokens
+
+
+PLANNER_PREAMBLE = (
+    "You are the Planner for AutoLawyer-MCP. "
+    "Given the case descriptor below, produce a JSON array of steps to "
+    "ingest, segment, score risk, propose redlines, compare docs, and "
+    "prepare executive summaries with traceability.\n"
+    "Descriptor:\n"
+)
+
+
+def describe_documents(files: Iterable[Dict], max_names: int = 10) -> Dict:
+    """
+    Counts, sizes and types for a document list; duplicates (same path or name)
+    are folded and inline content is measured, never embedded.
+    """
+    seen = set()
+    types: Dict[str, int] = {}
+    names: List[str] = []
+    total_bytes = 0
+    for raw in files or []:
+        key = raw.get("path") or raw.get("name")
+        if key in seen:
+            continue
+        seen.add(key)
+        name = raw.get("name") or Path(raw.get("path", "")).name
+        ext = Path(name or raw.get("path", "")).suffix.lower() or "unknown"
+        types[ext] = types.get(ext, 0) + 1
+        if "content" in raw:
+            total_bytes += len(str(raw["content"]).encode("utf-8"))
+        elif raw.get("path"):
+            try:
+                total_bytes += Path(raw["path"]).expanduser().stat().st_size
+            except OSError:
+                pass
+        if len(names) < max_names:
+            names.append(name)
+    descriptor = {"count": len(seen), "bytes": total_bytes, "types": types}
+    if names:
+        descriptor["names"] = names
+    return descriptor
+
+
+def policy_fingerprint(policies: Dict) -> str:
+    encoded = json.dumps(policies or {}, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def case_descriptor(case_context: Dict, max_names: int = 10, max_instruction_chars: int = 600) -> Dict:
+    policies = case_context.get("policies") or {}
+    return {
+        "case_id": case_context.get("case_id"),
+        "instructions": (case_context.get("instructions") or "")[:max_instruction_chars],
+        "primary_documents": describe_documents(case_context.get("primary_documents", []), max_names),
+        "counterparty_documents": describe_documents(case_context.get("counterparty_documents", []), max_names),
+        "policy_keys": sorted(policies)[:20],
+        "policy_fingerprint": policy_fingerprint(policies),
+    }
+
+
+def build_planner_prompt(case_context: Dict, token_cap: int = 1500) -> Tuple[str, Dict]:
+    """
+    Compact planner prompt plus token stats (prompt, pretty-printed baseline, saved).
+    Detail is shed until the prompt fits ``token_cap``: first document names, then
+    instruction text, then policy keys.
+    """
+    attempts = (
+        {"max_names": 10, "max_instruction_chars": 600},
+        {"max_names": 3, "max_instruction_chars": 600},
+        {"max_names": 0, "max_instruction_chars": 200},
+        {"max_names": 0, "max_instruction_chars": 0},
+    )
+    for limits in attempts:
+        descriptor = case_descriptor(case_context, **limits)
+        prompt = PLANNER_PREAMBLE + json.dumps(descriptor, separators=(",", ":"))
+        tokens = count_tokens(prompt)
+        if tokens <= token_cap:
+            break
+    else:
+        descriptor["policy_keys"] = []
+        prompt = PLANNER_PREAMBLE + json.dumps(descriptor, separators=(",", ":"))
+        tokens = count_tokens(prompt)
+
+    # Baseline is what the old pretty-printed context prompt would have cost, estimated
+    # from lengths so inline document text is never serialized just to report savings.
+    baseline = (len(PLANNER_PREAMBLE) + _pretty_context_chars(case_context) + 3) // 4
+    return prompt, {
+        "tokens": tokens,
+        "baseline_tokens": baseline,
+        "saved_tokens": max(0, baseline - tokens),
+    }
+
+
+DOCUMENT_KEYS = ("primary_documents", "counterparty_documents")
+
+
+def _pretty_context_chars(case_context: Dict) -> int:
+    """
+    Approximate ``len(json.dumps(case_context, indent=2))``: small fields are encoded,
+    document entries are sized field by field without encoding their content.
+    """
+    rest = {key: value for key, value in case_context.items() if key not in DOCUMENT_KEYS}
+    chars = len(json.dumps(rest, indent=2, default=str))
+    for key in DOCUMENT_KEYS:
+        documents = case_context.get(key) or []
+        chars += len(key) + 8
+        for raw in documents:
+            # Quotes, ": ", ",\n" and indentation per field, braces per entry.
+            chars += 12 + sum(len(str(field)) + len(str(value)) + 14 for field, value in raw.items())
+    return chars
@@ -1,25 +1,46 @@
 from __future__ import annotations
 
+import importlib.util
 import json
 import os
 import re
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 import sys
 
-try:
-    import litellm
-except ImportError:  # pragma: no cover - optional dependency
-    litellm = None
+# litellm is heavy (~1s to import); it is loaded on the first live completion.
+litellm = None
+
+
+def _litellm():
+    global litellm
+    if litellm is None:
+        import litellm as module
+
+        litellm = module
+    return litellm
+
+
+def litellm_available() -> bool:
+    return litellm is not None or importlib.util.find_spec("litellm") is not None
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
+from agent import modal_bridge
+from agent.cache import ResponseCache, cache_key, default_response_cache
+from agent.latency import ProviderStats, shared_stats
+from agent.ledger import TokenLedger, shared_ledger
+from agent.limits import ProviderLimiter, shared_limiter
+from agent.tokens import count_messages, count_tokens
+
 
 PROVIDER_MATRIX = (
     {
@@ -31,6 +52,12 @@ PROVIDER_MATRIX = (
         "budget_env": "OPENAI_TOKEN_BUDGET",
         "default_budget": 2_000_000,
         "priority": 0,
+        "rpm_env": "OPENAI_RPM",
+        "default_rpm": 500,
+        "tpm_env": "OPENAI_TPM",
+        "default_tpm": 200_000,
+        "max_in_flight_env": "OPENAI_MAX_IN_FLIGHT",
+        "default_max_in_flight": 8,
     },
     {
         "name": "nebius",
@@ -41,6 +68,12 @@ PROVIDER_MATRIX = (
         "budget_env": "NEBIUS_TOKEN_BUDGET",
         "default_budget": 1_500_000,
         "priority": 1,
+        "rpm_env": "NEBIUS_RPM",
+        "default_rpm": 300,
+        "tpm_env": "NEBIUS_TPM",
+        "default_tpm": 100_000,
+        "max_in_flight_env": "NEBIUS_MAX_IN_FLIGHT",
+        "default_max_in_flight": 8,
     },
     {
         "name": "sambanova",
@@ -51,6 +84,12 @@ PROVIDER_MATRIX = (
         "budget_env": "SAMBA_NOVA_TOKEN_BUDGET",
         "default_budget": 1_000_000,
         "priority": 2,
+        "rpm_env": "SAMBA_NOVA_RPM",
+        "default_rpm": 60,
+        "tpm_env": "SAMBA_NOVA_TPM",
+        "default_tpm": 60_000,
+        "max_in_flight_env": "SAMBA_NOVA_MAX_IN_FLIGHT",
+        "default_max_in_flight": 4,
     },
     {
         "name": "hyperbolic",
@@ -61,6 +100,12 @@ PROVIDER_MATRIX = (
         "budget_env": "HYPERBOLIC_TOKEN_BUDGET",
         "default_budget": 750_000,
         "priority": 3,
+        "rpm_env": "HYPERBOLIC_RPM",
+        "default_rpm": 60,
+        "tpm_env": "HYPERBOLIC_TPM",
+        "default_tpm": 60_000,
+        "max_in_flight_env": "HYPERBOLIC_MAX_IN_FLIGHT",
+        "default_max_in_flight": 4,
     },
     {
         "name": "blaxel",
@@ -71,6 +116,12 @@ PROVIDER_MATRIX = (
         "budget_env": "BLAXEL_TOKEN_BUDGET",
         "default_budget": 500_000,
         "priority": 4,
+        "rpm_env": "BLAXEL_RPM",
+        "default_rpm": 60,
+        "tpm_env": "BLAXEL_TPM",
+        "default_tpm": 60_000,
+        "max_in_flight_env": "BLAXEL_MAX_IN_FLIGHT",
+        "default_max_in_flight": 4,
     },
     {
         "name": "modal",
@@ -81,6 +132,12 @@ PROVIDER_MATRIX = (
         "budget_env": "MODAL_TOKEN_BUDGET",
         "default_budget": 500_000,
         "priority": 5,
+        "rpm_env": "MODAL_RPM",
+        "default_rpm": 120,
+        "tpm_env": "MODAL_TPM",
+        "default_tpm": 100_000,
+        "max_in_flight_env": "MODAL_MAX_IN_FLIGHT",
+        "default_max_in_flight": 16,
     },
 )
 
@@ -94,6 +151,9 @@ class Provider:
     token_budget: int
     priority: int
     tokens_used: int = 0
+    rpm: int = 0
+    tpm: int = 0
+    max_in_flight: int = 0
 
 
 @dataclass
@@ -103,6 +163,24 @@ class RouterResult:
     latency_ms: float
     tokens: int
     provider: str
+    cached: bool = False
+    queue_ms: float = 0.0
+
+
+@dataclass
+class StreamChunk:
+    """
+    One increment of a streamed generation; the last chunk carries the full result.
+    """
+
+    delta: str
+    result: Optional[RouterResult] = None
+
+
+SYSTEM_PROMPT = (
+    "You are AutoLawyer-MCP's reasoning engine. "
+    "Follow the user's format instructions exactly."
+)
 
 
 class ModelRouter:
@@ -110,13 +188,40 @@ class ModelRouter:
     Smart model routing + credit awareness using LiteLLM for provider abstraction.
     """
 
-    def __init__(self, default_model: str = "gpt-4o-mini", budget_tokens: int = 2_000_000):
+    def __init__(
+        self,
+        default_model: str = "gpt-4o-mini",
+        budget_tokens: int = 2_000_000,
+        response_cache: Optional[ResponseCache] = None,
+        ledger: Optional[TokenLedger] = None,
+    ):
         self.policy_overrides: Dict[str, Dict] = {}
+        self.default_model = default_model
         self.providers: List[Provider] = self._load_providers(default_model)
         declared_budget = sum(provider.token_budget for provider in self.providers)
         self.budget_tokens = declared_budget or budget_tokens
         self.tokens_used = 0
-        self.offline_mode = bool(os.getenv("AUTO_LAWYER_OFFLINE")) or not self.providers or litellm is None
+        # What this router itself charged; tokens_used also counts other routers' ledger usage.
+        self.tokens_charged = 0
+        # Batch runs share one router across worker threads.
+        self._usage_lock = threading.Lock()
+        self.ledger = ledger if ledger is not None else shared_ledger()
+        self._sync_usage()
+        self.offline_mode = bool(os.getenv("AUTO_LAWYER_OFFLINE")) or not self.providers or not litellm_available()
+        if response_cache is None and os.getenv("AUTOLAWYER_LLM_CACHE", "1") != "0":
+            response_cache = default_response_cache()
+        self.response_cache = response_cache
+        self.provider_stats: Dict[str, ProviderStats] = {
+            provider.name: shared_stats(provider.name) for provider in self.providers
+        }
+        self.limiters: Dict[str, ProviderLimiter] = {
+            provider.name: shared_limiter(provider.name, provider.rpm, provider.tpm, provider.max_in_flight)
+            for provider in self.providers
+        }
+        self.max_error_rate = float(os.getenv("AUTOLAWYER_MAX_ERROR_RATE", "0.5"))
+        self.hedge_requests = os.getenv("AUTOLAWYER_HEDGE") == "1"
+        self.hedge_delay_ms = float(os.getenv("AUTOLAWYER_HEDGE_DELAY_MS", "2000"))
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
 
     def register_policy(self, task_type: str, policy: Dict) -> None:
         self.policy_overrides[task_type] = policy
@@ -131,10 +236,6 @@ class ModelRouter:
         policy = self.policy_overrides.get(task_type, {})
         max_tokens = policy.get("max_tokens", 2000)
         temperature = policy.get("temperature", temperature)
-        preferred_provider = policy.get("provider")
-
-        if self.tokens_used >= self.budget_tokens and not self.offline_mode:
-            raise RuntimeError("Model token budget exhausted. Adjust router budget.")
 
         if self.offline_mode:
             output = self._offline_response(task_type, prompt, schema_hint)
@@ -142,69 +243,310 @@ class ModelRouter:
                 output=output,
                 model="offline-mock",
                 latency_ms=5,
-                tokens=len(output),
+                tokens=0,  # nothing is billed offline, so nothing is counted
                 provider="offline",
             )
 
-        provider = self._select_provider(preferred_provider)
+        full_prompt = self._build_prompt(prompt, schema_hint)
+        # A cached answer needs no budget, rate-limit slot or provider choice.
+        key = self._cache_key(task_type, policy, temperature, max_tokens, full_prompt)
+        if key is not None:
+            cached = self._cached_result(key)
+            if cached is not None:
+                return cached
+        return self._generate_live(policy, full_prompt, key, temperature, max_tokens)
+
+    def _generate_live(
+        self,
+        policy: Dict,
+        full_prompt: str,
+        key: Optional[str],
+        temperature: float,
+        max_tokens: int,
+    ) -> RouterResult:
+        """
+        The provider call behind ``generate`` once the cache has missed: budget check,
+        provider selection, (hedged) completion, then caching the answer under ``key``.
+        """
+        self._sync_usage()
+        if self.tokens_used >= self.budget_tokens:
+            raise RuntimeError("Model token budget exhausted. Adjust router budget.")
+
+        preferred_provider = policy.get("provider")
+        prompt_tokens = count_messages(self._messages(full_prompt), policy.get("model", self.default_model))
+        provider = self._select_provider(preferred_provider, prompt_tokens + max_tokens)
         model = policy.get("model", provider.model)
 
-        # Special handling for Modal serverless execution
-        if provider.name == "modal" and os.getenv("USE_MODAL_SERVERLESS") == "1":
-            try:
-                import sys
-                modal_path = Path(__file__).resolve().parents[1] / "modal_app.py"
-                if modal_path.exists():
-                    import importlib.util
-                    spec = importlib.util.spec_from_file_location("modal_app", modal_path)
-                    modal_app = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(modal_app)
-                    complete_text = modal_app.complete_text
-                    start = time.time()
-                    output_text = complete_text.remote(
-                        prompt=self._build_prompt(prompt, schema_hint),
-                        model=model,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                    )
-                    latency_ms = (time.time() - start) * 1000
-                    tokens = len(output_text.split())  # Estimate
-                    provider.tokens_used += tokens
-                    self.tokens_used += tokens
-                    return RouterResult(
-                        output=output_text,
-                        model=model,
-                        latency_ms=latency_ms,
-                        tokens=tokens,
-                        provider=provider.name,
-                    )
-            except (ImportError, AttributeError):
-                # Fall through to LiteLLM if Modal not available
-                pass
+        if policy.get("hedge", self.hedge_requests) and not preferred_provider and "model" not in policy:
+            result = self._hedged_complete(provider, full_prompt, temperature, max_tokens, prompt_tokens)
+        else:
+            result = self._timed_complete(provider, model, full_prompt, temperature, max_tokens, prompt_tokens)
+        self._store_cached(key, result)
+        return result
+
+    def stream(
+        self,
+        task_type: str,
+        prompt: str,
+        schema_hint: Optional[str] = None,
+        temperature: float = 0.2,
+    ) -> Iterator[StreamChunk]:
+        """
+        Like ``generate`` but yields output deltas as the provider produces them.
+        The final chunk has an empty delta and the aggregated RouterResult.
+        """
+        policy = self.policy_overrides.get(task_type, {})
+        max_tokens = policy.get("max_tokens", 2000)
+        temperature = policy.get("temperature", temperature)
+
+        if self.offline_mode:
+            result = self.generate(task_type, prompt, schema_hint, temperature)
+            yield StreamChunk(delta=result.output)
+            yield StreamChunk(delta="", result=result)
+            return
+
+        full_prompt = self._build_prompt(prompt, schema_hint)
+        key = self._cache_key(task_type, policy, temperature, max_tokens, full_prompt)
+        if key is not None:
+            cached = self._cached_result(key)
+            if cached is not None:
+                yield StreamChunk(delta=cached.output)
+                yield StreamChunk(delta="", result=cached)
+                return
+
+        self._sync_usage()
+        if self.tokens_used >= self.budget_tokens:
+            raise RuntimeError("Model token budget exhausted. Adjust router budget.")
+
+        prompt_tokens = count_messages(self._messages(full_prompt), policy.get("model", self.default_model))
+        provider = self._select_provider(policy.get("provider"), prompt_tokens + max_tokens)
+        model = policy.get("model", provider.model)
+
+        if provider.name == "modal":
+            # The Modal bridge returns whole completions; surface it as a single chunk.
+            result = self._timed_complete(provider, model, full_prompt, temperature, max_tokens, prompt_tokens)
+            self._store_cached(key, result)
+            yield StreamChunk(delta=result.output)
+            yield StreamChunk(delta="", result=result)
+            return
+
+        stats = self.provider_stats.setdefault(provider.name, shared_stats(provider.name))
+        limiter = self.limiters.get(provider.name)
+        reserved = prompt_tokens + max_tokens
+        queue_ms = limiter.acquire(reserved) if limiter else 0.0
+        parts: List[str] = []
+        tokens: Optional[int] = 0
+        try:
+            start = time.time()
+            response = _litellm().completion(
+                model=model,
+                api_key=provider.api_key,
+                api_base=provider.base_url,
+                messages=self._messages(full_prompt),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+            for chunk in response:
+                delta = _stream_delta(chunk)
+                if delta:
+                    parts.append(delta)
+                    yield StreamChunk(delta=delta)
+            latency_ms = (time.time() - start) * 1000
+            output_text = "".join(parts).strip()
+            tokens = prompt_tokens + count_tokens(output_text, model)  # Streams carry no usage block
+            self._charge(provider, tokens)
+        except Exception:
+            stats.record_error()
+            raise
+        finally:
+            if limiter:
+                limiter.release(reserved, tokens)
+        stats.record_success(latency_ms)
+        result = RouterResult(
+            output=output_text,
+            model=model,
+            latency_ms=latency_ms,
+            tokens=tokens,
+            provider=provider.name,
+            queue_ms=queue_ms,
+        )
+        self._store_cached(key, result)
+        yield StreamChunk(delta="", result=result)
+
+    def _cache_key(
+        self, task_type: str, policy: Dict, temperature: float, max_tokens: int, full_prompt: str
+    ) -> Optional[str]:
+        """
+        Cache key for a call, or None when caching is off. The key names the model that
+        will answer: the pinned model, the pinned provider's model, or for routed calls
+        the router's default model plus every configured provider model. It never uses
+        the latency-ranked pick, so a provider switch still hits earlier entries, while
+        changing AUTOLAWYER_MODEL or a provider's model starts a fresh set.
+        """
+        if self.response_cache is None or not policy.get("cache", True):
+            return None
+        model = policy.get("model")
+        if not model and policy.get("provider"):
+            pinned = [provider for provider in self.providers if provider.name == policy["provider"]]
+            model = pinned[0].model if pinned else f"provider:{policy['provider']}"
+        if not model:
+            configured = sorted({provider.model for provider in self.providers})
+            model = "|".join([self.default_model, *configured])
+        return cache_key(task_type, model, temperature, max_tokens, full_prompt)
+
+    def _cached_result(self, key: str) -> Optional[RouterResult]:
+        cached = self.response_cache.get(key)
+        if cached is None:
+            return None
+        return RouterResult(
+            output=cached["output"],
+            model=cached["model"],
+            latency_ms=0.0,
+            tokens=0,
+            provider=cached["provider"],
+            cached=True,
+        )
+
+    def _store_cached(self, key: Optional[str], result: RouterResult) -> None:
+        if key is None or self.response_cache is None:
+            return
+        self.response_cache.put(
+            key,
+            {
+                "output": result.output,
+                "model": result.model,
+                "provider": result.provider,
+                "tokens": result.tokens,
+            },
+        )
+
+    def cache_stats(self) -> Dict:
+        if self.response_cache is None:
+            return {"hits": 0, "misses": 0, "tokens_saved": 0, "entries": 0}
+        return self.response_cache.stats()
+
+    def _timed_complete(
+        self,
+        provider: Provider,
+        model: str,
+        full_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        prompt_tokens: int = 0,
+    ) -> RouterResult:
+        stats = self.provider_stats.setdefault(provider.name, shared_stats(provider.name))
+        limiter = self.limiters.get(provider.name)
+        # Reserve the worst case against the TPM bucket; the unused part is refunded.
+        reserved = prompt_tokens + max_tokens
+        queue_ms = limiter.acquire(reserved) if limiter else 0.0
+        used: Optional[int] = 0
+        try:
+            result = self._complete(provider, model, full_prompt, temperature, max_tokens, prompt_tokens)
+            used = result.tokens
+        except Exception:
+            stats.record_error()
+            raise
+        finally:
+            if limiter:
+                limiter.release(reserved, used)
+        stats.record_success(result.latency_ms)
+        result.queue_ms = queue_ms
+        return result
+
+    def _hedged_complete(
+        self,
+        primary: Provider,
+        full_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        prompt_tokens: int = 0,
+    ) -> RouterResult:
+        """
+        Fire the primary provider, and if it has not answered by its p95 latency (or
+        has already failed), race a backup provider against it and keep whichever
+        finishes first.
+        """
+        backup = next(
+            iter(self._ranked_providers(self.providers, exclude=primary.name, required_tokens=prompt_tokens + max_tokens)),
+            None,
+        )
+        if backup is None:
+            return self._timed_complete(primary, primary.model, full_prompt, temperature, max_tokens, prompt_tokens)
+
+        if self._hedge_pool is None:
+            self._hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="router-hedge")
+        delay_ms = self.provider_stats[primary.name].p95() or self.hedge_delay_ms
+        futures = [
+            self._hedge_pool.submit(
+                self._timed_complete, primary, primary.model, full_prompt, temperature, max_tokens, prompt_tokens
+            )
+        ]
+        done, _ = wait(futures, timeout=delay_ms / 1000)
+        if not done or futures[0].exception() is not None:
+            futures.append(
+                self._hedge_pool.submit(
+                    self._timed_complete, backup, backup.model, full_prompt, temperature, max_tokens, prompt_tokens
+                )
+            )
+
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The slower call keeps running in the pool; its tokens are still charged.
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _complete(
+        self,
+        provider: Provider,
+        model: str,
+        full_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        prompt_tokens: int = 0,
+    ) -> RouterResult:
+        # Special handling for Modal serverless execution; the module and its function
+        # handle are loaded once per process by the bridge.
+        complete_text = self._modal_handle(provider)
+        if complete_text is not None:
+            start = time.time()
+            output_text = complete_text.remote(
+                prompt=full_prompt,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            latency_ms = (time.time() - start) * 1000
+            tokens = prompt_tokens + count_tokens(output_text, model)
+            self._charge(provider, tokens)
+            return RouterResult(
+                output=output_text,
+                model=model,
+                latency_ms=latency_ms,
+                tokens=tokens,
+                provider=provider.name,
+            )
 
         start = time.time()
-        response = litellm.completion(
+        response = _litellm().completion(
             model=model,
             api_key=provider.api_key,
             api_base=provider.base_url,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are AutoLawyer-MCP's reasoning engine. "
-                        "Follow the user's format instructions exactly."
-                    ),
-                },
-                {"role": "user", "content": self._build_prompt(prompt, schema_hint)},
-            ],
+            messages=self._messages(full_prompt),
             temperature=temperature,
             max_tokens=max_tokens,
         )
         latency_ms = (time.time() - start) * 1000
         output_text = response["choices"][0]["message"]["content"].strip()
-        tokens = response.get("usage", {}).get("total_tokens", len(output_text.split()))
-        provider.tokens_used += tokens
-        self.tokens_used += tokens
+        tokens = response.get("usage", {}).get("total_tokens") or (
+            prompt_tokens + count_tokens(output_text, model)
+        )
+        self._charge(provider, tokens)
 
         return RouterResult(
             output=output_text,
@@ -214,17 +556,197 @@ class ModelRouter:
             provider=provider.name,
         )
 
-    def _select_provider(self, preferred_name: Optional[str]) -> Provider:
+    def generate_batch(
+        self,
+        task_type: str,
+        prompts: List[str],
+        schema_hint: Optional[str] = None,
+        temperature: float = 0.2,
+    ) -> List[RouterResult]:
+        """
+        Run many independent prompts. When the task's policy sets ``pack`` they are
+        packed into multi-item requests by ``MicroBatcher``. Otherwise each prompt is
+        looked up in the response cache, and the misses fan out through
+        ``complete_text.map`` on the Modal provider or run on a thread pool elsewhere,
+        all under the same budget, rate limits and usage accounting as ``generate``.
+        """
+        if not prompts:
+            return []
+        policy = self.policy_overrides.get(task_type, {})
+        if policy.get("pack") and schema_hint is None:
+            # Imported here: agent.batching imports this module.
+            from agent.batching import MicroBatcher
+
+            return MicroBatcher(self, max_batch_tokens=policy.get("pack_tokens", 6000)).generate_many(
+                task_type, prompts
+            )
+        if self.offline_mode:
+            return [self.generate(task_type, prompt, schema_hint, temperature) for prompt in prompts]
+
+        max_tokens = policy.get("max_tokens", 2000)
+        temperature = policy.get("temperature", temperature)
+        full_prompts = [self._build_prompt(prompt, schema_hint) for prompt in prompts]
+        keys = [self._cache_key(task_type, policy, temperature, max_tokens, full) for full in full_prompts]
+        results: List[Optional[RouterResult]] = [
+            self._cached_result(key) if key is not None else None for key in keys
+        ]
+        pending = [idx for idx, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        self._sync_usage()
+        if self.tokens_used >= self.budget_tokens:
+            raise RuntimeError("Model token budget exhausted. Adjust router budget.")
+        model_hint = policy.get("model", self.default_model)
+        prompt_counts = {idx: count_messages(self._messages(full_prompts[idx]), model_hint) for idx in pending}
+        provider = self._select_provider(
+            policy.get("provider"), sum(prompt_counts.values()) + max_tokens * len(pending)
+        )
+        if self._modal_handle(provider) is not None:
+            self._modal_batch(
+                provider,
+                policy.get("model", provider.model),
+                pending,
+                full_prompts,
+                prompt_counts,
+                keys,
+                results,
+                temperature,
+                max_tokens,
+            )
+            return results
+
+        def run(idx: int) -> RouterResult:
+            return self._generate_live(policy, full_prompts[idx], keys[idx], temperature, max_tokens)
+
+        with ThreadPoolExecutor(max_workers=min(8, len(pending))) as pool:
+            for idx, result in zip(pending, pool.map(run, pending)):
+                results[idx] = result
+        return results
+
+    def _modal_batch(
+        self,
+        provider: Provider,
+        model: str,
+        indices: List[int],
+        full_prompts: List[str],
+        prompt_counts: Dict[int, int],
+        keys: List[Optional[str]],
+        results: List[Optional[RouterResult]],
+        temperature: float,
+        max_tokens: int,
+    ) -> None:
+        """
+        Fan ``indices`` out through the Modal bridge in chunks that fit the provider's
+        in-flight cap. Each chunk is admitted by the limiter as one fan-out, then every
+        answer is charged, recorded in the provider stats and cached like a single call.
+        """
+        stats = self.provider_stats.setdefault(provider.name, shared_stats(provider.name))
+        limiter = self.limiters.get(provider.name)
+        chunk_size = limiter.max_in_flight if limiter and limiter.max_in_flight > 0 else len(indices)
+        for offset in range(0, len(indices), chunk_size):
+            chunk = indices[offset : offset + chunk_size]
+            reserved = sum(prompt_counts[idx] for idx in chunk) + max_tokens * len(chunk)
+            queue_ms = limiter.acquire(reserved, requests=len(chunk)) if limiter else 0.0
+            used: Optional[int] = 0
+            try:
+                start = time.time()
+                outputs = modal_bridge.complete_many(
+                    [full_prompts[idx] for idx in chunk],
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+                latency_ms = (time.time() - start) * 1000
+                for idx, output_text in zip(chunk, outputs):
+                    tokens = prompt_counts[idx] + count_tokens(output_text, model)
+                    self._charge(provider, tokens)
+                    used += tokens
+                    results[idx] = RouterResult(
+                        output=output_text,
+                        model=model,
+                        latency_ms=latency_ms,
+                        tokens=tokens,
+                        provider=provider.name,
+                        queue_ms=queue_ms,
+                    )
+                    self._store_cached(keys[idx], results[idx])
+            except Exception:
+                stats.record_error()
+                raise
+            finally:
+                if limiter:
+                    limiter.release(reserved, used, requests=len(chunk))
+            stats.record_success(latency_ms)
+
+    @staticmethod
+    def _modal_handle(provider: Provider):
+        if provider.name != "modal" or os.getenv("USE_MODAL_SERVERLESS") != "1":
+            return None
+        return modal_bridge.complete_text_handle()
+
+    def _charge(self, provider: Provider, tokens: int) -> None:
+        with self._usage_lock:
+            self.tokens_charged += tokens
+            if self.ledger is None:
+                provider.tokens_used += tokens
+                self.tokens_used += tokens
+                return
+            total = self.ledger.add(provider.name, tokens)
+            self.tokens_used += total - provider.tokens_used
+            provider.tokens_used = total
+
+    def _sync_usage(self) -> None:
+        """
+        Pull shared usage from the ledger (cached briefly) so budgets span processes.
+        """
+        if self.ledger is None:
+            return
+        usage = self.ledger.snapshot()
+        with self._usage_lock:
+            for provider in self.providers:
+                provider.tokens_used = usage.get(provider.name, 0)
+            self.tokens_used = sum(provider.tokens_used for provider in self.providers)
+
+    def _select_provider(self, preferred_name: Optional[str], required_tokens: int = 0) -> Provider:
         candidates = self.providers
         if preferred_name:
             candidates = [provider for provider in candidates if provider.name == preferred_name]
             if not candidates:
                 raise ValueError(f"No provider registered with name '{preferred_name}'")
-        for provider in sorted(candidates, key=lambda p: p.priority):
-            if provider.tokens_used < provider.token_budget:
-                return provider
+        for provider in self._ranked_providers(candidates, required_tokens=required_tokens):
+            return provider
+        if required_tokens and any(p.tokens_used < p.token_budget for p in candidates):
+            raise RuntimeError(
+                f"No provider has {required_tokens} tokens of budget left for this request."
+            )
         raise RuntimeError("All providers exhausted their assigned token budgets.")
 
+    def _ranked_providers(
+        self,
+        candidates: List[Provider],
+        exclude: Optional[str] = None,
+        required_tokens: int = 0,
+    ) -> List[Provider]:
+        """
+        Providers whose remaining budget covers ``required_tokens`` (prompt + max
+        output), healthy ones first, then fastest EWMA latency. Unmeasured providers
+        rank as fast so each gets sampled; priority breaks ties.
+        """
+        def rank(provider: Provider):
+            stats = self.provider_stats.get(provider.name) or ProviderStats()
+            latency = stats.ewma_latency_ms if stats.ewma_latency_ms is not None else 0.0
+            return (not stats.healthy(self.max_error_rate), latency, provider.priority)
+
+        available = [
+            provider
+            for provider in candidates
+            if provider.tokens_used < provider.token_budget
+            and provider.token_budget - provider.tokens_used >= required_tokens
+            and provider.name != exclude
+        ]
+        return sorted(available, key=rank)
+
     def _load_providers(self, default_model: str) -> List[Provider]:
         providers: List[Provider] = []
         for config in PROVIDER_MATRIX:
@@ -238,10 +760,22 @@ class ModelRouter:
                 base_url=os.getenv(config["base_url_env"]) if config["base_url_env"] else None,
                 token_budget=_env_int(config["budget_env"], config["default_budget"]),
                 priority=config["priority"],
+                rpm=_env_int(config.get("rpm_env"), config.get("default_rpm", 0)),
+                tpm=_env_int(config.get("tpm_env"), config.get("default_tpm", 0)),
+                max_in_flight=_env_int(
+                    config.get("max_in_flight_env"), config.get("default_max_in_flight", 0)
+                ),
             )
             providers.append(provider)
         return providers
 
+    @staticmethod
+    def _messages(full_prompt: str) -> List[Dict]:
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": full_prompt},
+        ]
+
     @staticmethod
     def _build_prompt(prompt: str, schema_hint: Optional[str]) -> str:
         if not schema_hint:
@@ -270,6 +804,20 @@ class ModelRouter:
         return json.dumps({"status": "unknown"})
 
 
+def _stream_delta(chunk) -> str:
+    """
+    Extract the text delta from a LiteLLM stream chunk (object or dict shaped).
+    """
+    choices = chunk["choices"] if isinstance(chunk, dict) else getattr(chunk, "choices", None)
+    if not choices:
+        return ""
+    delta = choices[0]["delta"] if isinstance(choices[0], dict) else getattr(choices[0], "delta", None)
+    if delta is None:
+        return ""
+    content = delta.get("content") if isinstance(delta, dict) else getattr(delta, "content", None)
+    return content or ""
+
+
 def _env_int(name: Optional[str], default: int) -> int:
     if not name:
         return default
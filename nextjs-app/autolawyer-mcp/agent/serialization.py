@@ -0,0 +1,173 @@
+"""
+Serialization of case results for the services, the worker and the API.
+
+A raw ``run_case`` outcome repeats itself: every task carries the artifact it
+produced, the report's action plan carries the task results again, and document
+text appears in both ``documents`` and the document_reader task. ``compact_result``
+keeps each artifact once, points duplicates at it with ``{"$ref": "#/<key>"}`` and
+replaces document text with its hash and length. ``dumps`` uses orjson when it is
+installed, and ``iter_ndjson`` streams clauses and risks one line at a time.
+
+The services keep printing the full result unless AUTOLAWYER_RESULT_FORMAT asks
+for ``compact`` or ``ndjson`` (see ``result_format`` / ``shape_result``).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator
+
+from agent.checkpoints import STAGE_OUTPUTS
+from mcp_tools.tables import ColumnarTable, RowView
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Top-level keys that can be large; iter_ndjson emits them as one line per row.
+ROW_KEYS = ("clauses", "risks")
+
+# AUTOLAWYER_RESULT_FORMAT values; "json" is the full result the services always printed.
+RESULT_FORMATS = ("json", "compact", "ndjson")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ColumnarTable):
+        return value.to_dicts()
+    if isinstance(value, RowView):
+        return value.to_dict()
+    if hasattr(value, "__dict__"):
+        return vars(value)
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON; tables and row views are encoded as their dict form."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def document_ref(document: Dict) -> Dict:
+    """
+    ``document`` without its ``content``; the text is identified by its sha256 and length.
+    """
+    if "content" not in document:
+        return document
+    ref = {key: value for key, value in document.items() if key != "content"}
+    content = str(document["content"])
+    ref["content_sha256"] = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    ref["characters"] = len(content)
+    return ref
+
+
+def compact_result(outcome: Dict, include_content: bool = False) -> Dict:
+    """
+    Shallow copy of ``outcome`` with duplicated artifacts replaced by references and,
+    unless ``include_content``, document text replaced by ``document_ref`` entries.
+    The outcome itself is left untouched.
+    """
+    compact = dict(outcome)
+    if not include_content:
+        if isinstance(compact.get("documents"), list):
+            compact["documents"] = [document_ref(doc) for doc in compact["documents"]]
+        case = compact.get("case")
+        if isinstance(case, dict):
+            case = dict(case)
+            for key in ("primary_documents", "counterparty_documents"):
+                if isinstance(case.get(key), list):
+                    case[key] = [document_ref(doc) for doc in case[key]]
+            compact["case"] = case
+    if isinstance(compact.get("tasks"), list):
+        compact["tasks"] = [_task_ref(task, outcome, "result") for task in compact["tasks"]]
+    reports = compact.get("reports")
+    if isinstance(reports, dict) and isinstance(reports.get("action_plan"), list):
+        compact["reports"] = {
+            **reports,
+            "action_plan": [_task_ref(entry, outcome, "notes") for entry in reports["action_plan"]],
+        }
+    return compact
+
+
+def expand_refs(compact: Dict) -> Dict:
+    """
+    Shallow copy of a ``compact_result`` whose task results and action-plan notes
+    point at the artifacts again instead of ``{"$ref": ...}``. Document text stays
+    as its ``document_ref``.
+    """
+    expanded = dict(compact)
+    if isinstance(compact.get("tasks"), list):
+        expanded["tasks"] = [_resolve_ref(task, compact, "result") for task in compact["tasks"]]
+    reports = compact.get("reports")
+    if isinstance(reports, dict) and isinstance(reports.get("action_plan"), list):
+        expanded["reports"] = {
+            **reports,
+            "action_plan": [_resolve_ref(entry, compact, "notes") for entry in reports["action_plan"]],
+        }
+    return expanded
+
+
+def result_format() -> str:
+    fmt = os.getenv("AUTOLAWYER_RESULT_FORMAT", "json").lower()
+    return fmt if fmt in RESULT_FORMATS else "json"
+
+
+def shape_result(outcome: Dict) -> Dict:
+    """
+    ``outcome`` in the configured JSON shape: the full result (stored references
+    expanded) by default, or ``compact_result`` when AUTOLAWYER_RESULT_FORMAT=compact
+    (AUTOLAWYER_RESULT_CONTENT=1 keeps document text).
+    """
+    if result_format() == "compact":
+        return compact_result(outcome, include_content=os.getenv("AUTOLAWYER_RESULT_CONTENT", "0") == "1")
+    return expand_refs(outcome)
+
+
+def iter_ndjson(outcome: Dict, include_content: bool = False) -> Iterator[bytes]:
+    """
+    Newline-delimited JSON: a ``case`` line with everything except clauses and risks,
+    then one ``clause`` / ``risk`` line per row, then an ``end`` line with the counts.
+    """
+    compact = compact_result(outcome, include_content=include_content)
+    header = {key: value for key, value in compact.items() if key not in ROW_KEYS}
+    yield dumps({"type": "case", **header}) + b"\n"
+    counts: Dict[str, int] = {}
+    for key in ROW_KEYS:
+        kind = key[:-1]
+        count = 0
+        for row in _iter_rows(compact.get(key) or []):
+            yield dumps({"type": kind, **row}) + b"\n"
+            count += 1
+        counts[key] = count
+    yield dumps({"type": "end", **counts}) + b"\n"
+
+
+def _iter_rows(rows: Any) -> Iterable[Dict]:
+    if isinstance(rows, ColumnarTable):
+        return rows.iter_dicts()
+    return (row.to_dict() if isinstance(row, RowView) else row for row in rows)
+
+
+def _resolve_ref(entry: Dict, compact: Dict, field: str) -> Dict:
+    value = entry.get(field) if isinstance(entry, dict) else None
+    if not (isinstance(value, dict) and list(value) == ["$ref"] and str(value["$ref"]).startswith("#/")):
+        return entry
+    key = value["$ref"][2:]
+    if key not in compact:
+        return entry
+    return {**entry, field: compact[key]}
+
+
+def _task_ref(entry: Dict, outcome: Dict, field: str) -> Dict:
+    # Only the very object stored under the stage's key is replaced (as in
+    # CheckpointStore.save): a second task with the same tool keeps its own result.
+    key = STAGE_OUTPUTS.get(entry.get("tool"))
+    if key is None or entry.get("status") != "completed":
+        return entry
+    value = entry.get(field)
+    if value is None or value is not outcome.get(key):
+        return entry
+    return {**entry, field: {"$ref": f"#/{key}"}}
+
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_ENCODING = "cl100k_base"
+# Chat framing overhead per message / per reply, per OpenAI's cookbook accounting.
+MESSAGE_OVERHEAD = 4
+REPLY_OVERHEAD = 2
+
+
+@lru_cache(maxsize=32)
+def _encoder(model: str):
+    # Imported here so entry points that never count tokens skip loading tiktoken.
+    # None (the chars/4 fallback) is cached like an encoder, so a failed load is not retried.
+    try:
+        import tiktoken
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Non-OpenAI models (Qwen, Llama, ...) get a close-enough BPE approximation.
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as exc:  # noqa: BLE001
+        # The BPE file is downloaded on first use; without network access, estimate.
+        logger.warning("Token encoder for %s unavailable, estimating ~4 chars/token: %s", model, exc)
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """
+    Token count for ``text`` using the model's local BPE encoder; encoders are
+    built once per model. Falls back to ~4 characters per token without tiktoken.
+    """
+    if not text:
+        return 0
+    encoder = _encoder(model)
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def count_messages(messages: Iterable[Dict], model: str = "gpt-4o-mini") -> int:
+    total = REPLY_OVERHEAD
+    for message in messages:
+        total += MESSAGE_OVERHEAD + count_tokens(message.get("content") or "", model)
+    return total
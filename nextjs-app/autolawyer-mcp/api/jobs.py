@@ -0,0 +1,185 @@
+"""
+Background case jobs: uploads are persisted, cases run on a bounded local worker
+pool and clients poll for status, progress and the result.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from agent.profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class QueueFull(RuntimeError):
+    """Raised when the number of pending jobs reaches ``max_pending``."""
+
+
+class CaseBusy(RuntimeError):
+    """Raised when a case is submitted again while its earlier job is still queued or running."""
+
+
+@dataclass
+class Job:
+    case_id: str
+    upload_dir: Optional[Path] = None
+    status: str = QUEUED
+    stage: Optional[str] = None
+    tasks_total: int = 0
+    tasks_done: int = 0
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "case_id": self.case_id,
+            "status": self.status,
+            "progress": {
+                "stage": self.stage,
+                "tasks_done": self.tasks_done,
+                "tasks_total": self.tasks_total,
+                "fraction": round(self.tasks_done / self.tasks_total, 3) if self.tasks_total else 0.0,
+            },
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    Runs ``build_agent().iter_case(case_context)`` for each submitted case on a pool
+    of ``max_workers`` threads and hands the outcome to ``on_result``. Throughput is
+    bounded by the pool; at most ``max_pending`` jobs wait for a worker.
+    """
+
+    def __init__(
+        self,
+        build_agent: Callable[[], Any],
+        on_result: Callable[[str, Dict], None],
+        max_workers: int = 2,
+        max_pending: int = 100,
+        upload_root: Optional[Path] = None,
+        max_finished: int = 1000,
+    ) -> None:
+        self.build_agent = build_agent
+        self.on_result = on_result
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.upload_root = upload_root or Path(tempfile.gettempdir()) / "autolawyer-uploads"
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="case-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, build_agent: Callable[[], Any], on_result: Callable[[str, Dict], None]) -> "JobQueue":
+        upload_root = os.getenv("AUTOLAWYER_UPLOAD_DIR")
+        return cls(
+            build_agent,
+            on_result,
+            max_workers=int(os.getenv("AUTOLAWYER_JOB_WORKERS", "2")),
+            max_pending=int(os.getenv("AUTOLAWYER_JOB_QUEUE_LIMIT", "100")),
+            upload_root=Path(upload_root) if upload_root else None,
+        )
+
+    def upload_dir(self, case_id: str) -> Path:
+        path = self.upload_root / case_id
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def submit(self, case_context: Dict, upload_dir: Optional[Path] = None) -> Job:
+        case_id = case_context["case_id"]
+        with self._lock:
+            if self._active(case_id):
+                raise CaseBusy(f"Case {case_id} is already queued or running")
+            if self._pending() >= self.max_pending:
+                raise QueueFull(f"{self.max_pending} cases already waiting")
+            job = Job(case_id=case_id, upload_dir=upload_dir)
+            self._jobs[case_id] = job
+        self._pool.submit(self._run, job, case_context)
+        return job
+
+    def get(self, case_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(case_id)
+
+    def active(self, case_id: str) -> bool:
+        with self._lock:
+            return self._active(case_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return {"workers": self.max_workers, "max_pending": self.max_pending, **counts}
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def _active(self, case_id: str) -> bool:
+        job = self._jobs.get(case_id)
+        return job is not None and job.status in (QUEUED, RUNNING)
+
+    def _pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == QUEUED)
+
+    def _run(self, job: Job, case_context: Dict) -> None:
+        job.status, job.stage = RUNNING, "plan"
+        job.started_at = time.time()
+        try:
+            agent = self.build_agent()
+            outcome: Dict = {}
+            with profiled(bool(case_context.get("profile"))) as captured:
+                for event in agent.iter_case(case_context, stream_tokens=False):
+                    kind, data = event["event"], event["data"]
+                    if kind == "plan":
+                        # A replan restarts the count against the new plan.
+                        job.tasks_total, job.tasks_done, job.stage = len(data), 0, "execute"
+                    elif kind == "task":
+                        job.tasks_done += 1
+                        job.stage = data["tool"]
+                    elif kind == "review":
+                        job.stage = "review"
+                    elif kind == "result":
+                        outcome = data
+            if captured is not None:
+                outcome["profile"] = captured
+            self.on_result(job.case_id, outcome)
+            job.status, job.stage = COMPLETED, "done"
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Case job %s failed", job.case_id)
+            job.error = str(exc)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            if job.upload_dir is not None:
+                shutil.rmtree(job.upload_dir, ignore_errors=True)
+            self._forget_finished()
+
+    def _forget_finished(self) -> None:
+        with self._lock:
+            finished = [
+                case_id for case_id, job in self._jobs.items() if job.status in (COMPLETED, FAILED)
+            ]
+            for case_id in finished[: max(0, len(finished) - self.max_finished)]:
+                del self._jobs[case_id]
@@ -5,22 +5,34 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import sys
+import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
+from agent.audit import MongoAuditSink
+from agent.batch import BatchRunner
 from agent.core import AgentCore
+from agent.metrics import REGISTRY
+from agent.profiling import profile_bytes, render_profile_text
 from agent.policies import ExecutionPolicies
 from agent.router import ModelRouter
+from agent.serialization import expand_refs, iter_ndjson
+from api.jobs import COMPLETED, FAILED, CaseBusy, JobQueue, QueueFull
+from api.uploads import MB, UploadBudget, UploadLimits, save_uploads
+from mcp_tools.report_builder import render_summary_text
+from mcp_tools.tables import to_plain
+from storage.case_store import default_case_store
 
 app = FastAPI(title="AutoLawyer-MCP API", version="1.0.0")
 
@@ -50,10 +62,107 @@ class CaseResponse(BaseModel):
     reports: Dict[str, Any]
     logs: List[Dict[str, Any]]
     action_plan: List[Dict[str, Any]]
+    timings: Dict[str, Any] = {}
 
 
-# In-memory case storage (replace with MongoDB in production)
-cases: Dict[str, Dict] = {}
+upload_limits = UploadLimits.from_env()
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    # Refuse on the declared length before the multipart body is parsed and spooled.
+    declared = request.headers.get("content-length")
+    if request.method == "POST" and declared and declared.isdigit():
+        if int(declared) > upload_limits.max_request_bytes:
+            limit_mb = f"{upload_limits.max_request_bytes / MB:g}"
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"Upload exceeds the {limit_mb} MB per-request limit"},
+            )
+    return await call_next(request)
+
+
+# Client case IDs name checkpoint and upload directories, so keep them path-safe.
+CASE_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+
+# MongoDB-backed case store with an LRU memory tier in front
+cases = default_case_store()
+# One process-wide batched writer; audit entries never cost a round trip each.
+audit_sink = MongoAuditSink(cases.backend) if os.getenv("AUTOLAWYER_AUDIT_MONGO") == "1" else None
+
+
+def _resolve_case_id(case_id: Optional[str]) -> str:
+    """
+    The client's ``case_id`` or a new one. Re-submitting a failed or interrupted case
+    under its ID resumes it: stages whose inputs are unchanged load from checkpoints.
+    """
+    if not case_id:
+        return f"case-{uuid.uuid4().hex[:8]}"
+    if not CASE_ID_PATTERN.match(case_id):
+        raise HTTPException(
+            status_code=400,
+            detail="case_id must be 1-64 letters, digits, '.', '_' or '-' and start with a letter or digit",
+        )
+    return case_id
+
+
+def _build_case_context(
+    case_id: str,
+    instructions: str,
+    policy_json: str,
+    primary_paths: List[Dict[str, str]],
+    secondary_paths: List[Dict[str, str]],
+    profile: bool = False,
+) -> Dict[str, Any]:
+    try:
+        policy = json.loads(policy_json) if policy_json else {}
+    except json.JSONDecodeError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid policy JSON: {exc}") from exc
+    context = {
+        "case_id": case_id,
+        "instructions": instructions,
+        "primary_documents": primary_paths,
+        "counterparty_documents": secondary_paths,
+        "policies": policy,
+    }
+    if profile:
+        context["profile"] = True
+    return context
+
+
+def _profile_requested(request: Request, profile: bool) -> bool:
+    """Profiling is opted into per request via the ``profile`` form field or header."""
+    return profile or request.headers.get("x-autolawyer-profile", "").lower() in ("1", "true", "yes")
+
+
+def _build_agent() -> AgentCore:
+    router = ModelRouter(default_model=os.getenv("AUTOLAWYER_MODEL", "gpt-4o-mini"))
+    policies = ExecutionPolicies()
+    return AgentCore(router=router, policies=policies, audit_sink=audit_sink)
+
+
+# Background case runs, bounded by AUTOLAWYER_JOB_WORKERS
+jobs = JobQueue.from_env(build_agent=_build_agent, on_result=cases.save)
+
+
+def _case_payload(case_id: str, case: Dict) -> Dict[str, Any]:
+    # Stored cases are compact; resolve their references so every endpoint answers alike.
+    case = expand_refs(case)
+    return to_plain({
+        "case_id": case_id,
+        "status": "completed",
+        "clauses": case.get("clauses", []),
+        "risks": case.get("risks", []),
+        "redlines": case.get("redlines", {}),
+        "reports": case.get("reports", {}),
+        "logs": case.get("logs", []),
+        "action_plan": case.get("reports", {}).get("action_plan", []),
+        "timings": case.get("timings", {}),
+    })
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 @app.get("/")
@@ -61,6 +170,22 @@ async def root():
     return {"message": "AutoLawyer-MCP API", "status": "running"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition: per-stage timings plus job queue and case cache gauges."""
+    lines = [REGISTRY.render().rstrip("\n")]
+    lines.append("# TYPE autolawyer_jobs gauge")
+    for status, count in jobs.stats().items():
+        if status not in ("workers", "max_pending"):
+            lines.append(f'autolawyer_jobs{{status="{status}"}} {count}')
+    store = cases.stats()
+    lines.append("# TYPE autolawyer_case_cache_entries gauge")
+    lines.append(f"autolawyer_case_cache_entries {store['entries']}")
+    lines.append("# TYPE autolawyer_case_cache_bytes gauge")
+    lines.append(f"autolawyer_case_cache_bytes {store['bytes']}")
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 async def health():
     router = ModelRouter()
@@ -73,108 +198,288 @@ async def health():
 
 @app.post("/api/cases", response_model=CaseResponse)
 async def create_case(
+    request: Request,
     primary_docs: List[UploadFile] = File(...),
     secondary_docs: List[UploadFile] = File(default=[]),
     instructions: str = Form("Apply default sponsor playbook"),
     policy_json: str = Form("{}"),
+    profile: bool = Form(False),
+    case_id: Optional[str] = Form(None),
 ):
     """
-    Upload documents and start agent pipeline.
+    Upload documents and start agent pipeline. Set ``profile`` (or the
+    ``X-AutoLawyer-Profile: 1`` header) to capture a cProfile of this case, and
+    ``case_id`` to resume an earlier run of the same case.
     """
     import tempfile
-    import uuid
 
-    case_id = f"case-{uuid.uuid4().hex[:8]}"
+    from starlette.concurrency import run_in_threadpool
 
-    # Save uploaded files temporarily
-    primary_paths = []
-    secondary_paths = []
+    case_id = _resolve_case_id(case_id)
+    budget = UploadBudget(upload_limits)
 
     with tempfile.TemporaryDirectory() as tmpdir:
-        for doc in primary_docs:
-            path = Path(tmpdir) / doc.filename
-            with open(path, "wb") as f:
-                f.write(await doc.read())
-            primary_paths.append({"name": doc.filename, "path": str(path)})
-
-        for doc in secondary_docs:
-            path = Path(tmpdir) / doc.filename
-            with open(path, "wb") as f:
-                f.write(await doc.read())
-            secondary_paths.append({"name": doc.filename, "path": str(path)})
-
-        # Parse policy
-        try:
-            policy = json.loads(policy_json) if policy_json else {}
-        except json.JSONDecodeError as exc:
-            raise HTTPException(status_code=400, detail=f"Invalid policy JSON: {exc}") from exc
-
-        # Build case context
-        case_context = {
-            "case_id": case_id,
-            "instructions": instructions,
-            "primary_documents": primary_paths,
-            "counterparty_documents": secondary_paths,
-            "policies": policy,
-        }
-
-        # Initialize agent
-        router = ModelRouter(default_model=os.getenv("AUTOLAWYER_MODEL", "gpt-4o-mini"))
-        policies = ExecutionPolicies()
-        agent = AgentCore(router=router, policies=policies)
-
-        # Run pipeline
-        try:
+        primary_paths = await save_uploads(primary_docs, tmpdir, budget)
+        secondary_paths = await save_uploads(secondary_docs, tmpdir, budget)
+
+        case_context = _build_case_context(
+            case_id,
+            instructions,
+            policy_json,
+            primary_paths,
+            secondary_paths,
+            profile=_profile_requested(request, profile),
+        )
+        agent = _build_agent()
+
+        def run_and_save() -> Dict:
             result = agent.run_case(case_context)
-            cases[case_id] = result
-
-            return CaseResponse(
-                case_id=case_id,
-                status="completed",
-                clauses=result.get("clauses", []),
-                risks=result.get("risks", []),
-                redlines=result.get("redlines", {}),
-                reports=result.get("reports", {}),
-                logs=result.get("logs", []),
-                action_plan=result.get("reports", {}).get("action_plan", []),
-            )
+            cases.save(case_id, result)
+            return result
+
+        # Run pipeline off the event loop: rate-limit waits and tool work block.
+        try:
+            result = await run_in_threadpool(run_and_save)
+            return CaseResponse(**_case_payload(case_id, result))
         except Exception as exc:
             raise HTTPException(status_code=500, detail=f"Agent execution failed: {exc}") from exc
 
 
+@app.post("/api/cases/stream")
+async def stream_case(
+    primary_docs: List[UploadFile] = File(...),
+    secondary_docs: List[UploadFile] = File(default=[]),
+    instructions: str = Form("Apply default sponsor playbook"),
+    policy_json: str = Form("{}"),
+    case_id: Optional[str] = Form(None),
+):
+    """
+    Same as POST /api/cases but streams planner tokens, task completions and
+    reviewer notes as server-sent events while the pipeline runs.
+    """
+    import tempfile
+
+    from starlette.concurrency import iterate_in_threadpool
+
+    case_id = _resolve_case_id(case_id)
+    budget = UploadBudget(upload_limits)
+    # The temp dir must outlive this handler: the pipeline reads the files while streaming.
+    tmpdir = tempfile.TemporaryDirectory()
+    try:
+        primary_paths = await save_uploads(primary_docs, tmpdir.name, budget)
+        secondary_paths = await save_uploads(secondary_docs, tmpdir.name, budget)
+        case_context = _build_case_context(
+            case_id, instructions, policy_json, primary_paths, secondary_paths
+        )
+    except BaseException:
+        tmpdir.cleanup()
+        raise
+    agent = _build_agent()
+
+    def events():
+        try:
+            yield _sse("case", {"case_id": case_id})
+            for event in agent.iter_case(case_context):
+                if event["event"] == "result":
+                    cases.save(case_id, event["data"])
+                    yield _sse("result", _case_payload(case_id, event["data"]))
+                else:
+                    yield _sse(event["event"], event["data"])
+        except Exception as exc:  # noqa: BLE001
+            yield _sse("error", {"detail": f"Agent execution failed: {exc}"})
+        finally:
+            tmpdir.cleanup()
+
+    return StreamingResponse(
+        iterate_in_threadpool(events()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/cases/jobs", status_code=202)
+async def submit_case_job(
+    request: Request,
+    primary_docs: List[UploadFile] = File(...),
+    secondary_docs: List[UploadFile] = File(default=[]),
+    instructions: str = Form("Apply default sponsor playbook"),
+    policy_json: str = Form("{}"),
+    profile: bool = Form(False),
+    case_id: Optional[str] = Form(None),
+):
+    """
+    Persist the uploads, queue the case on the worker pool and return its ID at once.
+    Poll ``/api/cases/{case_id}/status`` and fetch ``/api/cases/{case_id}/result``.
+    """
+    import shutil
+
+    case_id = _resolve_case_id(case_id)
+    if jobs.active(case_id):
+        raise HTTPException(status_code=409, detail=f"Case {case_id} is already queued or running")
+    budget = UploadBudget(upload_limits)
+    upload_dir = jobs.upload_dir(case_id)
+    try:
+        primary_paths = await save_uploads(primary_docs, str(upload_dir), budget)
+        secondary_paths = await save_uploads(secondary_docs, str(upload_dir), budget)
+        case_context = _build_case_context(
+            case_id,
+            instructions,
+            policy_json,
+            primary_paths,
+            secondary_paths,
+            profile=_profile_requested(request, profile),
+        )
+        job = jobs.submit(case_context, upload_dir=upload_dir)
+    except QueueFull as exc:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise HTTPException(status_code=503, detail=f"Case queue is full: {exc}") from exc
+    except CaseBusy as exc:
+        # Lost a race with another submission of the same case; its uploads are not ours to remove.
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except BaseException:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise
+    return {
+        **job.snapshot(),
+        "status_url": f"/api/cases/{case_id}/status",
+        "result_url": f"/api/cases/{case_id}/result",
+    }
+
+
+@app.post("/api/cases/batch")
+async def create_case_batch(
+    documents: List[UploadFile] = File(...),
+    instructions: str = Form("Apply default sponsor playbook"),
+    policy_json: str = Form("{}"),
+    case_workers: int = Form(4),
+):
+    """
+    Portfolio review: every uploaded document becomes its own case. All cases share
+    one router (and token budget), the embedder and a pooled ingestion stage.
+    Returns per-case summaries (full results via GET /api/cases/{case_id}) and
+    aggregate throughput.
+    """
+    import tempfile
+
+    from starlette.concurrency import run_in_threadpool
+
+    batch_id = f"batch-{uuid.uuid4().hex[:8]}"
+    budget = UploadBudget(upload_limits)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        contexts = []
+        for idx, doc in enumerate(documents):
+            case_dir = Path(tmpdir) / str(idx)
+            case_dir.mkdir()
+            contexts.append(
+                _build_case_context(
+                    f"{batch_id}-{idx:04d}",
+                    instructions,
+                    policy_json,
+                    await save_uploads([doc], str(case_dir), budget),
+                    [],
+                )
+            )
+        runner = BatchRunner(
+            router=ModelRouter(default_model=os.getenv("AUTOLAWYER_MODEL", "gpt-4o-mini")),
+            policies=ExecutionPolicies(),
+            case_workers=max(1, min(case_workers, int(os.getenv("AUTOLAWYER_BATCH_MAX_WORKERS", "8")))),
+            on_result=cases.save,
+        )
+        batch = await run_in_threadpool(runner.run, contexts)
+
+    for result in batch["results"]:
+        result.pop("outcome", None)
+    return {"batch_id": batch_id, **batch}
+
+
+@app.get("/api/cases/jobs")
+async def case_job_stats():
+    """Worker pool size and job counts by status."""
+    return jobs.stats()
+
+
+@app.get("/api/cases/{case_id}/status")
+async def case_job_status(case_id: str):
+    """Status and task progress of a queued case."""
+    job = jobs.get(case_id)
+    if job is not None:
+        return job.snapshot()
+    if cases.get(case_id) is not None:
+        # Finished before this process started (or aged out of the job table).
+        return {"case_id": case_id, "status": COMPLETED}
+    raise HTTPException(status_code=404, detail="Case not found")
+
+
+@app.get("/api/cases/{case_id}/result", response_model=CaseResponse)
+async def case_job_result(case_id: str):
+    """Result of a queued case; 409 while it is still queued or running."""
+    job = jobs.get(case_id)
+    if job is not None and job.status == FAILED:
+        raise HTTPException(status_code=500, detail=f"Agent execution failed: {job.error}")
+    if job is not None and job.status != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Case is {job.status}")
+    case = cases.get(case_id)
+    if case is None:
+        raise HTTPException(status_code=404, detail="Case not found")
+    return CaseResponse(**_case_payload(case_id, case))
+
+
 @app.get("/api/cases/{case_id}", response_model=CaseResponse)
 async def get_case(case_id: str):
     """Retrieve case results."""
-    if case_id not in cases:
+    case = cases.get(case_id)
+    if case is None:
+        raise HTTPException(status_code=404, detail="Case not found")
+    return CaseResponse(**_case_payload(case_id, case))
+
+
+@app.get("/api/cases/{case_id}/ndjson")
+async def get_case_ndjson(case_id: str, content: bool = False):
+    """
+    Case results as NDJSON: one ``case`` line, then one line per clause and risk.
+    Document text is replaced by its hash unless ``content=true``.
+    """
+    case = cases.get(case_id)
+    if case is None:
+        raise HTTPException(status_code=404, detail="Case not found")
+    return StreamingResponse(
+        iter_ndjson({"case_id": case_id, **case}, include_content=content),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.get("/api/cases/{case_id}/profile")
+async def download_profile(case_id: str, format: str = "prof"):
+    """
+    Profile captured for a case run with profiling enabled: ``prof`` (binary pstats,
+    for snakeviz / ``python -m pstats``), ``text`` or ``json`` (top functions).
+    """
+    case = cases.get(case_id)
+    if case is None:
         raise HTTPException(status_code=404, detail="Case not found")
-    case = cases[case_id]
-    return CaseResponse(
-        case_id=case_id,
-        status="completed",
-        clauses=case.get("clauses", []),
-        risks=case.get("risks", []),
-        redlines=case.get("redlines", {}),
-        reports=case.get("reports", {}),
-        logs=case.get("logs", []),
-        action_plan=case.get("reports", {}).get("action_plan", []),
+    profile = case.get("profile")
+    if not profile:
+        raise HTTPException(status_code=404, detail="No profile was captured for this case")
+    if format == "json":
+        return {key: value for key, value in profile.items() if key != "pstats_b64"}
+    if format == "text":
+        return PlainTextResponse(render_profile_text(profile))
+    if format != "prof":
+        raise HTTPException(status_code=400, detail="format must be prof, text or json")
+    return Response(
+        profile_bytes(profile),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{case_id}.prof"'},
     )
 
 
 @app.get("/api/cases/{case_id}/download/exec-summary")
 async def download_exec_summary(case_id: str):
     """Download executive summary as text file."""
-    if case_id not in cases:
+    case = cases.get(case_id)
+    if case is None:
         raise HTTPException(status_code=404, detail="Case not found")
-    case = cases[case_id]
-    summary = case.get("reports", {}).get("executive_summary", {})
-    text = (
-        f"{summary.get('headline', 'Executive Summary')}\n\n"
-        f"Critical: {summary.get('risk_counts', {}).get('critical', 0)} | "
-        f"High: {summary.get('risk_counts', {}).get('high', 0)} | "
-        f"Medium: {summary.get('risk_counts', {}).get('medium', 0)}\n\n"
-        f"Top Issues:\n" + "\n".join(f"- {issue}" for issue in summary.get("top_issues", []))
-        + f"\n\nRemediation:\n" + "\n".join(f"- {item}" for item in summary.get("remediation_plan", []))
-    )
+    text = render_summary_text(case.get("reports", {}).get("executive_summary", {}))
     return StreamingResponse(
         iter([text]),
         media_type="text/plain",
@@ -194,9 +499,13 @@ async def list_providers():
                 "tokens_used": p.tokens_used,
                 "token_budget": p.token_budget,
                 "remaining": p.token_budget - p.tokens_used,
+                "health": router.provider_stats[p.name].snapshot(),
+                "rate_limit": router.limiters[p.name].snapshot(),
             }
             for p in router.providers
         ],
+        "tokens_used": router.tokens_used,
+        "cache": router.cache_stats(),
         "offline_mode": router.offline_mode,
     }
 
@@ -0,0 +1,93 @@
+"""
+Streaming upload handling: uploads are copied to disk in fixed-size chunks and
+hashed on the way, with per-file and per-request size caps.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, UploadFile
+
+MB = 1024 * 1024
+
+
+@dataclass
+class UploadLimits:
+    max_file_bytes: int = 50 * MB
+    max_request_bytes: int = 200 * MB
+    chunk_size: int = MB
+
+    @classmethod
+    def from_env(cls) -> "UploadLimits":
+        return cls(
+            max_file_bytes=int(float(os.getenv("AUTOLAWYER_MAX_UPLOAD_MB", "50")) * MB),
+            max_request_bytes=int(float(os.getenv("AUTOLAWYER_MAX_REQUEST_MB", "200")) * MB),
+            chunk_size=int(os.getenv("AUTOLAWYER_UPLOAD_CHUNK_KB", "1024")) * 1024,
+        )
+
+
+class UploadBudget:
+    """
+    Bytes accepted so far for one request, checked against both caps as chunks arrive.
+    """
+
+    def __init__(self, limits: UploadLimits) -> None:
+        self.limits = limits
+        self.total = 0
+
+    def check_declared(self, doc: UploadFile) -> None:
+        size = getattr(doc, "size", None)
+        if size is not None:
+            self._check(doc.filename, size, self.total + size)
+
+    def add(self, filename: Optional[str], file_bytes: int, chunk: int) -> None:
+        self.total += chunk
+        self._check(filename, file_bytes, self.total)
+
+    def _check(self, filename: Optional[str], file_bytes: int, request_bytes: int) -> None:
+        if file_bytes > self.limits.max_file_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"{filename} exceeds the {self.limits.max_file_bytes / MB:g} MB per-file limit",
+            )
+        if request_bytes > self.limits.max_request_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Upload exceeds the {self.limits.max_request_bytes / MB:g} MB per-request limit",
+            )
+
+
+async def save_upload(doc: UploadFile, directory: Path, budget: UploadBudget) -> Dict:
+    """
+    Copy one upload into ``directory`` chunk by chunk. Returns ``{name, path, size, sha256}``;
+    the partial file is removed if a cap is hit.
+    """
+    budget.check_declared(doc)
+    name = Path(doc.filename or "upload").name
+    path = directory / name
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as handle:
+            while True:
+                chunk = await doc.read(budget.limits.chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                budget.add(name, size, len(chunk))
+                digest.update(chunk)
+                handle.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    finally:
+        await doc.close()
+    return {"name": name, "path": str(path), "size": size, "sha256": digest.hexdigest()}
+
+
+async def save_uploads(docs: List[UploadFile], directory: str, budget: UploadBudget) -> List[Dict]:
+    return [await save_upload(doc, Path(directory), budget) for doc in docs]
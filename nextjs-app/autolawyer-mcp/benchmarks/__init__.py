@@ -0,0 +1,3 @@
+"""
+Performance benchmarks for AutoLawyer-MCP. Each module is runnable with ``python -m``.
+"""
@@ -0,0 +1,82 @@
+"""
+End-to-end ``AgentCore.run_case`` benchmark in AUTO_LAWYER_OFFLINE mode.
+
+    python -m benchmarks.end_to_end --pages 10 50 200 --repeats 3 [--embeddings]
+
+For each contract size, runs the full plan -> execute -> review pipeline on a
+synthetic case (no LLM calls, checkpoints off) and reports wall time, clauses/sec,
+peak traced memory and the per-stage totals from the case timings.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+os.environ.setdefault("AUTO_LAWYER_OFFLINE", "1")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from agent.core import AgentCore
+from agent.policies import ExecutionPolicies
+from agent.router import ModelRouter
+from benchmarks.harness import environment, emit, measure
+from benchmarks.synthetic import write_case
+
+
+def run(pages: List[int], repeats: int, documents: int, embeddings: bool) -> Dict:
+    router = ModelRouter()
+    policies = ExecutionPolicies(checkpoint_stages=False)
+    report: Dict = {
+        "environment": environment(),
+        "offline_mode": router.offline_mode,
+        "embeddings": embeddings,
+        "documents_per_case": documents,
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in pages:
+            case = write_case(Path(tmpdir) / f"p{size}", case_id=f"bench-{size}", documents=documents, pages=size)
+            agent = AgentCore(router=router, policies=policies, enable_clause_embeddings=embeddings)
+            outcome: Dict = {}
+
+            def once():
+                outcome.update(agent.run_case(case))
+
+            result = measure(once, repeats=repeats)
+            clauses = len(outcome.get("clauses", []))
+            report["runs"].append(
+                {
+                    "pages": size,
+                    "clauses": clauses,
+                    **result,
+                    "clauses_per_sec": round(clauses / (result["median_ms"] / 1000), 1)
+                    if result["median_ms"]
+                    else None,
+                    "failed_tasks": [
+                        task["tool"] for task in outcome.get("tasks", []) if task.get("status") != "completed"
+                    ],
+                    "stages": outcome.get("timings", {}).get("totals", {}),
+                }
+            )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--documents", type=int, default=1)
+    parser.add_argument("--embeddings", action="store_true", help="include the clause_rag stage")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    emit(run(args.pages, args.repeats, args.documents, args.embeddings), args.output)
+
+
+if __name__ == "__main__":
+    main()
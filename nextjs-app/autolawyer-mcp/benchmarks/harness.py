@@ -0,0 +1,70 @@
+"""
+Shared timing/memory helpers and run metadata for the benchmark modules.
+"""
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def measure(fn: Callable[[], Any], repeats: int = 5, warmup: int = 1) -> Dict:
+    """
+    Time ``fn`` ``repeats`` times after ``warmup`` untimed calls; peak memory comes
+    from one extra tracemalloc-traced call so tracing overhead never skews the timings.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "best_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def emit(report: Dict, output: Optional[str]) -> None:
+    """Print the report as JSON, or write it to ``output`` when given."""
+    text = json.dumps(report, indent=2)
+    if output:
+        Path(output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    sys.stdout.flush()
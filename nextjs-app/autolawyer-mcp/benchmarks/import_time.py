@@ -0,0 +1,106 @@
+"""
+Cold-start cost of each services entry point, measured with ``python -X importtime``.
+
+    python -m benchmarks.import_time --repeats 5
+
+Each script is loaded in a fresh interpreter via ``runpy`` under a non-main name,
+so module-level work runs but ``if __name__ == "__main__"`` blocks do not. Reports
+JSON with median wall and import milliseconds, the heaviest top-level imports and
+which heavy optional dependencies were pulled in.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from benchmarks.harness import emit, environment
+
+SERVICES = PROJECT_ROOT / "services"
+
+ENTRY_POINTS = (
+    "health_check.py",
+    "get_providers.py",
+    "get_case.py",
+    "get_exec_summary.py",
+    "run_case.py",
+    "worker.py",
+)
+HEAVY_MODULES = ("litellm", "chromadb", "sentence_transformers", "torch", "pypdf", "docx", "tiktoken")
+
+
+def parse_importtime(stderr: str) -> Tuple[float, List[Tuple[str, float]], List[str]]:
+    """
+    Total import ms (sum of top-level cumulative times), top-level modules by cost,
+    and every module name seen.
+    """
+    top_level: List[Tuple[str, float]] = []
+    seen: List[str] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        seen.append(name.strip())
+        if not name[1:].startswith(" "):
+            top_level.append((name.strip(), int(cumulative) / 1000))
+    total = sum(ms for _, ms in top_level)
+    return total, sorted(top_level, key=lambda item: item[1], reverse=True), seen
+
+
+def measure(script: str, env: Dict[str, str]) -> Dict:
+    code = f"import runpy; runpy.run_path({str(SERVICES / script)!r}, run_name='__bench__')"
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    total, top, seen = parse_importtime(proc.stderr)
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": total,
+        "top": top[:5],
+        "heavy": sorted({name.split(".")[0] for name in seen} & set(HEAVY_MODULES)),
+        "ok": proc.returncode == 0,
+    }
+
+
+def run(repeats: int) -> Dict:
+    env = {**os.environ, "AUTO_LAWYER_OFFLINE": os.getenv("AUTO_LAWYER_OFFLINE", "1")}
+    report: Dict = {"environment": environment(), "repeats": repeats, "entry_points": {}}
+    for script in ENTRY_POINTS:
+        runs = [measure(script, env) for _ in range(repeats)]
+        last = runs[-1]
+        report["entry_points"][script] = {
+            "wall_ms": round(statistics.median(run["wall_ms"] for run in runs), 1),
+            "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+            "top_imports": [{"module": name, "ms": round(ms, 1)} for name, ms in last["top"]],
+            "heavy_modules": last["heavy"],
+            "ok": all(run["ok"] for run in runs),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    emit(run(args.repeats), args.output)
+
+
+if __name__ == "__main__":
+    main()
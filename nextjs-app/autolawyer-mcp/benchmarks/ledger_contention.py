@@ -0,0 +1,87 @@
+"""
+Contention benchmark for the shared token ledger.
+
+    python -m benchmarks.ledger_contention --workers 8 --increments 2000
+
+Spawns N worker processes that each add tokens to the same providers, then checks
+that no increment was lost and reports throughput as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from agent.ledger import TokenLedger
+from benchmarks.harness import emit, environment
+
+PROVIDERS = ("openai", "nebius", "sambanova")
+
+
+def _worker(path: str, increments: int, tokens: int, start_event) -> float:
+    ledger = TokenLedger(Path(path))
+    start_event.wait()
+    started = time.perf_counter()
+    for idx in range(increments):
+        ledger.add(PROVIDERS[idx % len(PROVIDERS)], tokens)
+        if idx % 50 == 0:
+            ledger.snapshot(max_age=0)
+    elapsed = time.perf_counter() - started
+    ledger.close()
+    return elapsed
+
+
+def run(workers: int, increments: int, tokens: int = 7) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = str(Path(tmpdir) / "ledger.sqlite3")
+        TokenLedger(Path(path)).close()
+        with mp.Manager() as manager:
+            start_event = manager.Event()
+            with mp.Pool(workers) as pool:
+                pending = [
+                    pool.apply_async(_worker, (path, increments, tokens, start_event))
+                    for _ in range(workers)
+                ]
+                wall_start = time.perf_counter()
+                start_event.set()
+                per_worker = [job.get() for job in pending]
+                wall = time.perf_counter() - wall_start
+        ledger = TokenLedger(Path(path))
+        totals = ledger.snapshot(max_age=0)
+        ledger.close()
+
+    expected = workers * increments * tokens
+    return {
+        "benchmark": "ledger_contention",
+        "environment": environment(),
+        "workers": workers,
+        "increments_per_worker": increments,
+        "expected_tokens": expected,
+        "recorded_tokens": sum(totals.values()),
+        "lost_updates": expected - sum(totals.values()),
+        "wall_seconds": round(wall, 4),
+        "increments_per_second": round(workers * increments / wall, 1) if wall else None,
+        "mean_worker_latency_us": round(
+            sum(per_worker) / (workers * increments) * 1_000_000, 2
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--increments", type=int, default=2000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    emit(run(args.workers, args.increments), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Case result serialization: size and encode time of the raw outcome vs the compact
+serializer, with and without orjson.
+
+    python -m benchmarks.serialization --pages 50 200 --repeats 5
+
+Each case is produced by an offline ``run_case`` on a synthetic contract. ``raw`` is
+the previous ``json.dumps(result, default=str)`` of the whole outcome.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+os.environ.setdefault("AUTO_LAWYER_OFFLINE", "1")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from agent import serialization
+from agent.core import AgentCore
+from agent.policies import ExecutionPolicies
+from agent.router import ModelRouter
+from benchmarks.harness import environment, emit, measure
+from benchmarks.synthetic import write_case
+from mcp_tools.tables import to_plain
+
+
+def _encoders(outcome: Dict) -> Dict:
+    return {
+        "raw": lambda: json.dumps(to_plain(outcome), default=str).encode("utf-8"),
+        "compact": lambda: serialization.dumps(serialization.compact_result(outcome)),
+        "ndjson": lambda: b"".join(serialization.iter_ndjson(outcome)),
+    }
+
+
+def run(pages: List[int], repeats: int, documents: int) -> Dict:
+    router = ModelRouter()
+    policies = ExecutionPolicies(checkpoint_stages=False)
+    fast = serialization.orjson
+    report: Dict = {
+        "environment": environment(),
+        "orjson": fast is not None,
+        "documents_per_case": documents,
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in pages:
+            case = write_case(Path(tmpdir) / f"p{size}", case_id=f"bench-{size}", documents=documents, pages=size)
+            outcome = AgentCore(router=router, policies=policies).run_case(case)
+            run_report: Dict = {"pages": size, "clauses": len(outcome.get("clauses", [])), "encoders": {}}
+            for name, fn in _encoders(outcome).items():
+                run_report["encoders"][name] = {"bytes": len(fn()), **measure(fn, repeats=repeats)}
+            if fast is not None:
+                # Same compact output through the stdlib encoder, to isolate orjson's share.
+                serialization.orjson = None
+                try:
+                    fn = _encoders(outcome)["compact"]
+                    run_report["encoders"]["compact_stdlib"] = {"bytes": len(fn()), **measure(fn, repeats=repeats)}
+                finally:
+                    serialization.orjson = fast
+            report["runs"].append(run_report)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--documents", type=int, default=1)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    emit(run(args.pages, args.repeats, args.documents), args.output)
+
+
+if __name__ == "__main__":
+    main()
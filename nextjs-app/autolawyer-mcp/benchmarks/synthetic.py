@@ -0,0 +1,151 @@
+"""
+Deterministic synthetic contracts for benchmarks.
+
+    python -m benchmarks.synthetic --pages 20 --duplication 0.2 --depth 3 > contract.txt
+
+The same arguments and seed always produce byte-identical text. Clause bodies mix
+neutral boilerplate with the keywords the risk classifier looks for, so every stage
+has realistic work to do.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Roughly one printed page of contract prose.
+CHARS_PER_PAGE = 3000
+
+HEADINGS = (
+    "Definitions", "Term and Termination", "Fees and Payment", "Limitation of Liability",
+    "Indemnity", "Data Protection", "Confidentiality", "Service Levels", "Intellectual Property",
+    "Warranties", "Insurance", "Assignment", "Force Majeure", "Governing Law", "Notices",
+    "Audit Rights", "Subcontracting", "Security", "Dispute Resolution", "Miscellaneous",
+)
+
+SENTENCES = (
+    "Each party shall perform its obligations in a professional and workmanlike manner.",
+    "The Supplier shall indemnify the Client against all losses arising from any breach.",
+    "Liability under this Agreement shall not exceed the fees paid in the preceding twelve months.",
+    "This cap shall not apply to claims arising from gross negligence or wilful misconduct.",
+    "The Supplier shall comply with all applicable privacy and data protection laws.",
+    "Personal data shall be processed only on documented instructions from the Client.",
+    "The Supplier shall maintain appropriate technical and organisational security measures.",
+    "The service level for availability is 99.9% uptime measured monthly.",
+    "Failure to meet the service level entitles the Client to a service credit as a penalty.",
+    "Either party may terminate this Agreement for convenience on ninety days written notice.",
+    "This Agreement will auto-renew for successive one-year terms unless terminated before expiry.",
+    "Invoices are payable within thirty days of receipt of a valid invoice.",
+    "Neither party may assign this Agreement without the prior written consent of the other.",
+    "All notices must be in writing and delivered by hand, courier or email.",
+    "Confidential Information excludes information that is or becomes publicly available.",
+    "The Client may audit the Supplier's compliance once per contract year on reasonable notice.",
+    "Nothing in this Agreement creates a partnership, agency or joint venture between the parties.",
+    "The parties shall first attempt to resolve any dispute through good faith negotiation.",
+)
+
+
+def _number(index: int, depth: int, rng: random.Random) -> str:
+    parts = [str(index)]
+    for _ in range(1, depth):
+        parts.append(str(rng.randint(1, 9)))
+    return ".".join(parts)
+
+
+def generate_contract(
+    pages: int = 10,
+    clauses: Optional[int] = None,
+    duplication: float = 0.1,
+    depth: int = 2,
+    seed: int = 0,
+    title: str = "MASTER SERVICES AGREEMENT",
+) -> str:
+    """
+    ``pages`` sets the target length (~3000 characters per page); ``clauses`` defaults
+    to four per page. ``duplication`` is the fraction of clause bodies copied from an
+    earlier clause, and ``depth`` the numbering depth of headings (1 -> "3.", 3 -> "3.1.4").
+    """
+    rng = random.Random(seed)
+    clause_count = clauses or max(1, pages * 4)
+    body_chars = max(80, pages * CHARS_PER_PAGE // clause_count)
+    bodies: List[str] = []
+    blocks = [title]
+    for idx in range(1, clause_count + 1):
+        if bodies and rng.random() < duplication:
+            body = rng.choice(bodies)
+        else:
+            sentences: List[str] = []
+            length = 0
+            while length < body_chars:
+                sentence = rng.choice(SENTENCES)
+                sentences.append(sentence)
+                length += len(sentence) + 1
+            body = " ".join(sentences)
+            bodies.append(body)
+        heading = HEADINGS[(idx - 1) % len(HEADINGS)]
+        blocks.append(f"{_number(idx, depth, rng)} {heading.upper()}\n{body}")
+    return "\n\n".join(blocks) + "\n"
+
+
+def mutate(text: str, ratio: float = 0.05, seed: int = 1) -> str:
+    """
+    Counterparty version of ``text``: roughly ``ratio`` of its lines are replaced.
+    """
+    rng = random.Random(seed)
+    lines = text.splitlines()
+    for idx in range(len(lines)):
+        if lines[idx] and rng.random() < ratio:
+            lines[idx] = rng.choice(SENTENCES)
+    return "\n".join(lines) + "\n"
+
+
+def write_case(
+    directory: Path,
+    case_id: str = "bench-case",
+    documents: int = 1,
+    counterparty: bool = True,
+    **contract_args,
+) -> Dict:
+    """
+    Write ``documents`` contracts (plus mutated counterparty copies) as .txt files and
+    return the matching case context.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    seed = contract_args.pop("seed", 0)
+    primary, secondary = [], []
+    for idx in range(documents):
+        name = f"contract-{idx + 1}.txt"
+        text = generate_contract(seed=seed + idx, **contract_args)
+        (directory / name).write_text(text, encoding="utf-8")
+        primary.append({"name": name, "path": str(directory / name)})
+        if counterparty:
+            counter_dir = directory / "counterparty"
+            counter_dir.mkdir(exist_ok=True)
+            (counter_dir / name).write_text(mutate(text, seed=seed + idx), encoding="utf-8")
+            secondary.append({"name": name, "path": str(counter_dir / name)})
+    return {
+        "case_id": case_id,
+        "instructions": "Cap liability at fees paid and remove auto-renewal.",
+        "primary_documents": primary,
+        "counterparty_documents": secondary,
+        "policies": {"priority": "liability"},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--clauses", type=int, default=None)
+    parser.add_argument("--duplication", type=float, default=0.1)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(
+        generate_contract(args.pages, args.clauses, args.duplication, args.depth, args.seed),
+        end="",
+    )
+
+
+if __name__ == "__main__":
+    main()
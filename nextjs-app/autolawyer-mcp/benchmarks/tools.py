@@ -0,0 +1,102 @@
+"""
+Micro-benchmarks for each mcp_tools module on a synthetic contract.
+
+    python -m benchmarks.tools --pages 50 --repeats 5 [--output tools.json]
+
+Every tool runs on the same deterministic input; each entry reports best/median ms,
+peak traced memory and items per second. Tools whose dependencies are missing
+(e.g. chromadb for clause_rag) are reported as skipped.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from benchmarks.harness import environment, emit, measure
+from benchmarks.synthetic import write_case
+
+
+def _bench(name: str, fn: Callable[[], object], items: int, repeats: int) -> Dict:
+    result = measure(fn, repeats=repeats)
+    result["items"] = items
+    result["items_per_sec"] = round(items / (result["median_ms"] / 1000), 1) if result["median_ms"] else None
+    return result
+
+
+def run(pages: int, repeats: int, duplication: float, depth: int) -> Dict:
+    report: Dict = {
+        "environment": environment(),
+        "input": {"pages": pages, "duplication": duplication, "depth": depth},
+        "tools": {},
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        case = write_case(Path(tmpdir), pages=pages, duplication=duplication, depth=depth)
+        reader = importlib.import_module("mcp_tools.document_reader")
+        segmenter = importlib.import_module("mcp_tools.clause_segmenter")
+        classifier = importlib.import_module("mcp_tools.risk_classifier")
+        redliner = importlib.import_module("mcp_tools.redline_generator")
+        comparator = importlib.import_module("mcp_tools.comparator")
+        reporter = importlib.import_module("mcp_tools.report_builder")
+
+        documents = reader.ingest_documents(case["primary_documents"])
+        counterparty = reader.ingest_documents(case["counterparty_documents"])
+        clauses = segmenter.segment_documents(documents)
+        risks = classifier.score_clauses(clauses, case["policies"])
+        redlines = redliner.generate_patch(clauses, risks, case["instructions"])
+        comparisons = comparator.compare_documents(documents, counterparty)
+        report["input"]["characters"] = sum(len(doc["content"]) for doc in documents)
+        report["input"]["clauses"] = len(clauses)
+
+        benches: Dict[str, Tuple[Callable[[], object], int]] = {
+            "document_reader": (lambda: reader.ingest_documents(case["primary_documents"]), len(documents)),
+            "clause_segmenter": (lambda: segmenter.segment_documents(documents), len(clauses)),
+            "risk_classifier": (lambda: classifier.score_clauses(clauses, case["policies"]), len(clauses)),
+            "redline_generator": (
+                lambda: redliner.generate_patch(clauses, risks, case["instructions"]),
+                len(risks),
+            ),
+            "comparator": (lambda: comparator.compare_documents(documents, counterparty), len(documents)),
+            "report_builder": (
+                lambda: reporter.build_report(risks=risks, redlines=redlines, comparisons=comparisons, tasks=[]),
+                len(risks),
+            ),
+        }
+        for name, (fn, items) in benches.items():
+            report["tools"][name] = _bench(name, fn, items, repeats)
+
+        try:
+            rag = importlib.import_module("mcp_tools.clause_rag")
+            index_dir = Path(tmpdir) / "rag"
+            rag.shared_rag(index_dir)  # model load is a one-off, not part of the timing
+            report["tools"]["clause_rag"] = _bench(
+                "clause_rag",
+                lambda: rag.shared_rag(index_dir).upsert(clauses, collection_name="bench"),
+                len(clauses),
+                repeats,
+            )
+        except Exception as exc:  # noqa: BLE001
+            report["tools"]["clause_rag"] = {"skipped": f"{type(exc).__name__}: {exc}"}
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--duplication", type=float, default=0.1)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    emit(run(args.pages, args.repeats, args.duplication, args.depth), args.output)
+
+
+if __name__ == "__main__":
+    main()
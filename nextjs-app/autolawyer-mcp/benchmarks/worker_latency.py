@@ -0,0 +1,115 @@
+"""
+Per-request latency of the long-lived worker versus spawning a service script.
+
+    python -m benchmarks.worker_latency --requests 20
+
+For each operation, runs the one-shot ``services/*.py`` script ``--requests`` times
+(the Next.js spawn model) and issues the same number of HTTP requests to a
+``services/worker.py`` process started for the run. Reports JSON with mean/p50/p95
+milliseconds per mode plus the worker's one-off startup time.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVICES = PROJECT_ROOT / "services"
+
+OPERATIONS = {
+    "health": ("health_check.py", "/health"),
+    "providers": ("get_providers.py", "/providers"),
+}
+
+
+def _stats(samples: List[float]) -> Dict:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(ordered), 2),
+        "p50_ms": round(ordered[len(ordered) // 2], 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+    }
+
+
+def _time(call: Callable[[], None], repeats: int) -> List[float]:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def run(requests: int) -> Dict:
+    env = {**os.environ, "AUTO_LAWYER_OFFLINE": os.getenv("AUTO_LAWYER_OFFLINE", "1")}
+    report: Dict = {"requests": requests, "operations": {}}
+
+    for name, (script, _) in OPERATIONS.items():
+        samples = _time(
+            lambda: subprocess.run(
+                [sys.executable, str(SERVICES / script)],
+                env=env,
+                check=True,
+                capture_output=True,
+            ),
+            requests,
+        )
+        report["operations"][name] = {"spawn": _stats(samples)}
+
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    worker = subprocess.Popen(
+        [sys.executable, str(SERVICES / "worker.py")],
+        env={**env, "AUTOLAWYER_WORKER_PORT": str(port), "AUTOLAWYER_LOG_LEVEL": "WARNING"},
+    )
+    try:
+        _wait_ready(base + "/health")
+        report["worker_startup_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        for name, (_, path) in OPERATIONS.items():
+            samples = _time(lambda: urllib.request.urlopen(base + path).read(), requests)
+            entry = report["operations"][name]
+            entry["worker"] = _stats(samples)
+            entry["speedup"] = round(entry["spawn"]["mean_ms"] / max(entry["worker"]["mean_ms"], 1e-6), 1)
+    finally:
+        worker.terminate()
+        worker.wait(timeout=10)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 
@@ -66,11 +67,19 @@ class ClauseRAG:
         ]
 
 
+@lru_cache(maxsize=4)
+def shared_rag(persist_directory: Path | None = None) -> ClauseRAG:
+    """
+    One ClauseRAG (and so one loaded embedding model) per directory per process.
+    """
+    return ClauseRAG(persist_directory=persist_directory)
+
+
 def build_clause_index(clauses: List[Dict], collection_name: str) -> Dict:
     # Vercel is read-only except for /tmp. Use /tmp for temporary storage.
     import tempfile
     temp_dir = Path(tempfile.gettempdir()) / "rag"
-    rag = ClauseRAG(persist_directory=temp_dir)
+    rag = shared_rag(temp_dir)
     index = rag.upsert(clauses, collection_name=collection_name)
     return index.__dict__
 
@@ -1,25 +1,20 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
 from typing import Dict, Iterable, List
 
-
-@dataclass
-class Clause:
-    clause_id: str
-    heading: str
-    body: str
-    source_document: str
-    start_char: int
-    end_char: int
+from mcp_tools.tables import ClauseTable
 
 
 HEADING_PATTERN = re.compile(r"^(Section|Clause|Article)?\s*\d+(\.\d+)*[:\.\-]?\s*(.+)$", re.IGNORECASE)
 
 
-def segment_documents(documents: Iterable[Dict], strategy: str = "semantic") -> List[Dict]:
-    clauses: List[Dict] = []
+def segment_documents(documents: Iterable[Dict], strategy: str = "semantic") -> ClauseTable:
+    """
+    Split each document into heading-led clauses. Rows follow ``ClauseTable.FIELDS``;
+    see ``mcp_tools.tables`` for the columnar layout.
+    """
+    clauses = ClauseTable()
     for doc in documents:
         text = doc["content"]
         blocks = _split_into_blocks(text)
@@ -31,14 +26,12 @@ def segment_documents(documents: Iterable[Dict], strategy: str = "semantic") ->
             start = cursor
             end = cursor + len(block)
             clauses.append(
-                Clause(
-                    clause_id=f"{doc['name']}-{idx+1}",
-                    heading=normalized_heading.strip(),
-                    body=block.strip(),
-                    source_document=doc["name"],
-                    start_char=start,
-                    end_char=end,
-                ).__dict__
+                clause_id=f"{doc['name']}-{idx+1}",
+                heading=normalized_heading.strip(),
+                body=block.strip(),
+                source_document=doc["name"],
+                start_char=start,
+                end_char=end,
             )
             cursor = end + 1
     return clauses
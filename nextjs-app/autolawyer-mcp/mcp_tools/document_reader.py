@@ -46,6 +46,19 @@ def ingest_documents(files: Iterable[Dict]) -> List[Dict]:
     """
     outputs: List[Dict] = []
     for raw in files:
+        if "content" in raw:
+            # Already loaded (inline text or pre-ingested by a batch run).
+            name = raw.get("name") or Path(raw.get("path", "")).name
+            metadata = raw.get("metadata") or {
+                "size": len(raw["content"]),
+                "extension": Path(name).suffix.lower(),
+            }
+            outputs.append(
+                LoadedDocument(
+                    name=name, path=raw.get("path", ""), content=raw["content"], metadata=metadata
+                ).__dict__
+            )
+            continue
         path = Path(raw["path"]).expanduser()
         if not path.exists():
             raise FileNotFoundError(path)
@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List
 
+from mcp_tools.tables import ClauseTable, RiskTable
+
 
 @dataclass
 class RedlinePatch:
@@ -21,16 +23,20 @@ def generate_patch(
     """
     Produce unified diffs at clause-level plus natural language rationale.
     """
-    clause_lookup = {clause["clause_id"]: clause for clause in baseline}
+    clauses = ClauseTable.coerce(baseline)
+    scores = RiskTable.coerce(clause_scores)
+    bodies = clauses.column("body")
+    clause_lookup = {clause_id: idx for idx, clause_id in enumerate(clauses.column("clause_id"))}
     diffs: List[Dict] = []
-    for score in clause_scores:
-        clause = clause_lookup.get(score["clause_id"])
-        if not clause:
+    for clause_id, severity in zip(scores.column("clause_id"), scores.column("severity")):
+        idx = clause_lookup.get(clause_id)
+        if idx is None:
             continue
-        proposed = _apply_instruction(clause["body"], instructions)
+        body = bodies[idx]
+        proposed = _apply_instruction(body, instructions)
         diff = "\n".join(
             difflib.unified_diff(
-                clause["body"].splitlines(),
+                body.splitlines(),
                 proposed.splitlines(),
                 fromfile="original",
                 tofile="proposed",
@@ -39,9 +45,9 @@ def generate_patch(
         )
         diffs.append(
             RedlinePatch(
-                clause_id=clause["clause_id"],
+                clause_id=clause_id,
                 patch=diff,
-                rationale=f"Addressed {score['severity']} risk with instruction '{instructions[:80]}'.",
+                rationale=f"Addressed {severity} risk with instruction '{instructions[:80]}'.",
             ).__dict__
         )
     return {"patches": diffs}
@@ -4,6 +4,8 @@ import datetime as dt
 from dataclasses import dataclass
 from typing import Dict, Iterable, List
 
+from mcp_tools.tables import RiskTable
+
 
 @dataclass
 class ExecutiveSummary:
@@ -19,6 +21,7 @@ def build_report(
     comparisons: Iterable[Dict],
     tasks: Iterable[Dict],
 ) -> Dict:
+    risks = RiskTable.coerce(risks)
     summary = _build_summary(risks, redlines, comparisons)
     action_plan = _build_action_plan(tasks, risks)
     return {
@@ -28,13 +31,28 @@ def build_report(
     }
 
 
-def _build_summary(risks, redlines, comparisons) -> ExecutiveSummary:
+def render_summary_text(summary: Dict) -> str:
+    """
+    Plain-text executive summary used for downloads.
+    """
+    counts = summary.get("risk_counts", {})
+    return (
+        f"{summary.get('headline', 'Executive Summary')}\n\n"
+        f"Critical: {counts.get('critical', 0)} | "
+        f"High: {counts.get('high', 0)} | "
+        f"Medium: {counts.get('medium', 0)}\n\n"
+        f"Top Issues:\n" + "\n".join(f"- {issue}" for issue in summary.get("top_issues", []))
+        + f"\n\nRemediation:\n" + "\n".join(f"- {item}" for item in summary.get("remediation_plan", []))
+    )
+
+
+def _build_summary(risks: RiskTable, redlines, comparisons) -> ExecutiveSummary:
     counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
     top_issues: List[str] = []
-    for risk in risks:
-        counts[risk["severity"]] = counts.get(risk["severity"], 0) + 1
-        if risk["severity"] in {"critical", "high"}:
-            top_issues.append(f"{risk['heading']} → {risk['severity']} risk")
+    for heading, severity in zip(risks.column("heading"), risks.column("severity")):
+        counts[severity] = counts.get(severity, 0) + 1
+        if severity in {"critical", "high"}:
+            top_issues.append(f"{heading} → {severity} risk")
 
     remediation = [
         "Finalize redline patches and export DOCX/PDF for counsel sign-off.",
@@ -56,7 +74,7 @@ def _build_summary(risks, redlines, comparisons) -> ExecutiveSummary:
     )
 
 
-def _build_action_plan(tasks: Iterable[Dict], risks: Iterable[Dict]) -> List[Dict]:
+def _build_action_plan(tasks: Iterable[Dict], risks: RiskTable) -> List[Dict]:
     activity = []
     for task in tasks:
         activity.append(
@@ -67,7 +85,7 @@ def _build_action_plan(tasks: Iterable[Dict], risks: Iterable[Dict]) -> List[Dic
                 "notes": task.get("error") or task.get("result", {}) if task.get("status") != "failed" else task.get("error"),
             }
         )
-    activity.append({"name": "Risk coverage", "status": "info", "tool": "risk_classifier", "notes": f"{len(list(risks))} clauses scored"})
+    activity.append({"name": "Risk coverage", "status": "info", "tool": "risk_classifier", "notes": f"{len(risks)} clauses scored"})
     return activity
 
 
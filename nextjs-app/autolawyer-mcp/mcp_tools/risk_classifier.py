@@ -1,18 +1,9 @@
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable
 
-
-@dataclass
-class ClauseRisk:
-    clause_id: str
-    heading: str
-    risk_score: float
-    severity: str
-    rationale: str
-    source_document: str
+from mcp_tools.tables import ClauseTable, RiskTable
 
 
 DEFAULT_RISK_FACTORS = {
@@ -23,28 +14,28 @@ DEFAULT_RISK_FACTORS = {
 }
 
 
-def score_clauses(clauses: Iterable[Dict], policies: Dict) -> List[Dict]:
+def score_clauses(clauses: Iterable[Dict], policies: Dict) -> RiskTable:
     """
     Lightweight lexical heuristics + policy overrides to rank risk.
     """
     policies = policies or {}
-    outputs: List[Dict] = []
-    for clause in clauses:
-        text = clause["body"].lower()
-        heading = clause["heading"].lower()
-        risk_factor = _infer_factor(text + " " + heading, policies)
+    table = ClauseTable.coerce(clauses)
+    outputs = RiskTable()
+    for clause_id, heading, body, source in zip(
+        table.column("clause_id"),
+        table.column("heading"),
+        table.column("body"),
+        table.column("source_document"),
+    ):
+        risk_factor = _infer_factor(body.lower() + " " + heading.lower(), policies)
         score = min(1.0, risk_factor / 5.0)
-        severity = _score_to_severity(score)
-        rationale = f"Factor weight {risk_factor:.2f} derived from matched policy keywords."
         outputs.append(
-            ClauseRisk(
-                clause_id=clause["clause_id"],
-                heading=clause["heading"],
-                risk_score=score,
-                severity=severity,
-                rationale=rationale,
-                source_document=clause["source_document"],
-            ).__dict__
+            clause_id=clause_id,
+            heading=heading,
+            risk_score=score,
+            severity=_score_to_severity(score),
+            rationale=f"Factor weight {risk_factor:.2f} derived from matched policy keywords.",
+            source_document=source,
         )
     return outputs
 
@@ -0,0 +1,228 @@
+"""
+Columnar clause and risk tables shared by the segmenter, classifier, redline and
+report tools.
+
+Each field is stored once per table rather than once per clause: numbers in
+``array`` columns, repetitive strings (document names, severities, rationales)
+as interned codes, free text in plain lists. Iterating a table yields ``__slots__``
+row views that read like the old per-clause dicts (``row["body"]``, ``row.get``),
+and ``to_dicts`` / ``from_dicts`` convert losslessly to the dict format used at
+API, storage and checkpoint boundaries.
+"""
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class InternedColumn:
+    """
+    Column of repeated values kept as one label list plus an array of codes.
+    """
+
+    __slots__ = ("labels", "codes", "_lookup")
+
+    def __init__(self, labels: Optional[List[Any]] = None, codes: Optional[array] = None) -> None:
+        self.labels: List[Any] = list(labels or [])
+        self.codes = codes if codes is not None else array("I")
+        self._lookup = {label: code for code, label in enumerate(self.labels)}
+
+    def append(self, value: Any) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.labels)
+            self.labels.append(sys.intern(value) if isinstance(value, str) else value)
+            self._lookup[value] = code
+        self.codes.append(code)
+
+    def __getitem__(self, idx: int) -> Any:
+        return self.labels[self.codes[idx]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self) -> Iterator[Any]:
+        labels = self.labels
+        return (labels[code] for code in self.codes)
+
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes) + sum(_text_size(label) for label in self.labels)
+
+
+class RowView:
+    """
+    Read-only view of one table row with dict-style access.
+    """
+
+    __slots__ = ("_table", "_idx")
+
+    def __init__(self, table: "ColumnarTable", idx: int) -> None:
+        self._table = table
+        self._idx = idx
+
+    def __getitem__(self, key: str) -> Any:
+        column = self._table.columns.get(key)
+        if column is not None:
+            return column[self._idx]
+        extra = self._table.extras.get(self._idx)
+        if extra is not None and key in extra:
+            return extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._table.columns or key in self._table.extras.get(self._idx, ())
+
+    def keys(self) -> List[str]:
+        return list(self._table.FIELDS) + list(self._table.extras.get(self._idx, ()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class ColumnarTable:
+    """
+    Base for fixed-schema tables. ``KINDS`` maps each field to ``"text"`` (list),
+    ``"interned"`` (InternedColumn) or an ``array`` typecode.
+    """
+
+    FIELDS: Tuple[str, ...] = ()
+    KINDS: Dict[str, str] = {}
+
+    def __init__(self) -> None:
+        self.columns: Dict[str, Any] = {}
+        for field in self.FIELDS:
+            kind = self.KINDS[field]
+            if kind == "text":
+                self.columns[field] = []
+            elif kind == "interned":
+                self.columns[field] = InternedColumn()
+            else:
+                self.columns[field] = array(kind)
+        # Keys outside the schema, by row, so dict round trips stay lossless.
+        self.extras: Dict[int, Dict[str, Any]] = {}
+        self._length = 0
+
+    def append(self, **values: Any) -> None:
+        for field in self.FIELDS:
+            self.columns[field].append(values.pop(field))
+        if values:
+            self.extras[self._length] = values
+        self._length += 1
+
+    def column(self, field: str):
+        return self.columns[field]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __getitem__(self, idx: int) -> RowView:
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError(idx)
+        return RowView(self, idx)
+
+    def __iter__(self) -> Iterator[RowView]:
+        return (RowView(self, idx) for idx in range(self._length))
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        columns = [self.columns[field] for field in self.FIELDS]
+        for idx, values in enumerate(zip(*columns)):
+            record = dict(zip(self.FIELDS, values))
+            extra = self.extras.get(idx)
+            if extra:
+                record.update(extra)
+            yield record
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self.iter_dicts())
+
+    @classmethod
+    def from_dicts(cls, records: Iterable[Dict[str, Any]]):
+        table = cls()
+        for record in records:
+            table.append(**dict(record))
+        return table
+
+    @classmethod
+    def coerce(cls, value: Any):
+        """The table itself, or a new table built from an iterable of dicts / row views."""
+        if isinstance(value, cls):
+            return value
+        return cls.from_dicts(record.to_dict() if isinstance(record, RowView) else record for record in value or [])
+
+    def nbytes(self) -> int:
+        """Approximate payload size, comparable with ``storage.case_store.approx_size``."""
+        total = 0
+        for column in self.columns.values():
+            if isinstance(column, InternedColumn):
+                total += column.nbytes()
+            elif isinstance(column, array):
+                total += column.itemsize * len(column)
+            else:
+                total += sum(_text_size(value) for value in column)
+        return total + sum(len(str(extra)) for extra in self.extras.values())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rows={self._length})"
+
+
+class ClauseTable(ColumnarTable):
+    FIELDS = ("clause_id", "heading", "body", "source_document", "start_char", "end_char")
+    KINDS = {
+        "clause_id": "text",
+        "heading": "text",
+        "body": "text",
+        "source_document": "interned",
+        "start_char": "q",
+        "end_char": "q",
+    }
+
+
+class RiskTable(ColumnarTable):
+    FIELDS = ("clause_id", "heading", "risk_score", "severity", "rationale", "source_document")
+    KINDS = {
+        "clause_id": "text",
+        "heading": "text",
+        "risk_score": "d",
+        "severity": "interned",
+        "rationale": "interned",
+        "source_document": "interned",
+    }
+
+
+# Artifact keys held as tables inside AgentCore; used to rebuild them from checkpoints.
+ARTIFACT_TABLES = {"clauses": ClauseTable, "risks": RiskTable}
+
+
+def to_plain(value: Any) -> Any:
+    """
+    Deep copy of ``value`` with every table / row view replaced by plain dicts, for
+    JSON, BSON or pydantic boundaries. Other values are returned as they are.
+    """
+    if isinstance(value, ColumnarTable):
+        return value.to_dicts()
+    if isinstance(value, RowView):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    return value
+
+
+def _text_size(value: Any) -> int:
+    return len(value) if isinstance(value, str) else 8
@@ -7,11 +7,14 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
-# In-memory storage (replace with MongoDB in production)
-# For now, cases are stored per-run, so we return empty if not found
+from agent.serialization import dumps, shape_result
+from storage.case_store import default_case_store
+
 if __name__ == "__main__":
     case_id = sys.argv[1] if len(sys.argv) > 1 else ""
-    # TODO: Load from MongoDB or persistent storage
-    print(json.dumps({"error": "Case not found"}), file=sys.stderr)
-    sys.exit(1)
-
+    case = default_case_store().get(case_id) if case_id else None
+    if case is None:
+        print(json.dumps({"error": "Case not found"}), file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.buffer.write(dumps(shape_result({"case_id": case_id, **case})) + b"\n")
+    sys.stdout.flush()
@@ -7,9 +7,13 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
+from mcp_tools.report_builder import render_summary_text
+from storage.case_store import default_case_store
+
 if __name__ == "__main__":
     case_id = sys.argv[1] if len(sys.argv) > 1 else ""
-    # TODO: Load from MongoDB or persistent storage
-    print("Executive summary not found", file=sys.stderr)
-    sys.exit(1)
-
+    case = default_case_store().get(case_id) if case_id else None
+    if case is None:
+        print("Executive summary not found", file=sys.stderr)
+        sys.exit(1)
+    print(render_summary_text(case.get("reports", {}).get("executive_summary", {})))
@@ -17,12 +17,16 @@ providers = [
         "tokens_used": p.tokens_used,
         "token_budget": p.token_budget,
         "remaining": p.token_budget - p.tokens_used,
+        "health": router.provider_stats[p.name].snapshot(),
+        "rate_limit": router.limiters[p.name].snapshot(),
     }
     for p in router.providers
 ]
 
 print(json.dumps({
     "providers": providers,
+    "tokens_used": router.tokens_used,
+    "cache": router.cache_stats(),
     "offline_mode": router.offline_mode,
 }))
 
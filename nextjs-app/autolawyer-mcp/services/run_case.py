@@ -11,6 +11,8 @@ if str(PROJECT_ROOT) not in sys.path:
 from agent.core import AgentCore
 from agent.policies import ExecutionPolicies
 from agent.router import ModelRouter
+from agent.serialization import dumps, iter_ndjson, result_format, shape_result
+from storage.case_store import default_case_store
 
 if __name__ == "__main__":
     # Read from stdin if no args (for better JSON handling)
@@ -27,7 +29,16 @@ if __name__ == "__main__":
 
     try:
         result = agent.run_case(case_context)
-        print(json.dumps(result, default=str))
+        if case_context.get("case_id"):
+            default_case_store().save(case_context["case_id"], result)
+        # Full result by default; AUTOLAWYER_RESULT_FORMAT=compact or ndjson opts into
+        # the deduplicated forms (AUTOLAWYER_RESULT_CONTENT=1 keeps document text there).
+        if result_format() == "ndjson":
+            include_content = os.getenv("AUTOLAWYER_RESULT_CONTENT", "0") == "1"
+            sys.stdout.buffer.writelines(iter_ndjson(result, include_content=include_content))
+        else:
+            sys.stdout.buffer.write(dumps(shape_result(result)) + b"\n")
+        sys.stdout.flush()
     except Exception as e:
         print(json.dumps({"error": str(e)}, default=str), file=sys.stderr)
         sys.exit(1)
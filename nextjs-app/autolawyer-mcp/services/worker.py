@@ -0,0 +1,214 @@
+"""
+Long-lived service worker for the Next.js API.
+
+    python services/worker.py                                      # http://127.0.0.1:8765
+    AUTOLAWYER_WORKER_SOCKET=/tmp/autolawyer.sock python services/worker.py
+
+Serves the same operations as the one-shot scripts in this folder (health,
+providers, get_case, exec summary, run_case) while keeping the router, the
+embedding model and the Mongo connection pool warm between requests.
+
+    GET  /health
+    GET  /providers
+    GET  /cases/<case_id>
+    GET  /cases/<case_id>/summary
+    POST /cases                      body: case context JSON
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socketserver
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from agent.core import AgentCore
+from agent.policies import ExecutionPolicies
+from agent.router import ModelRouter
+from agent.serialization import dumps, shape_result
+from mcp_tools.report_builder import render_summary_text
+from storage.case_store import default_case_store
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceWorker:
+    """
+    The operations behind the worker's routes; one router is shared by every request.
+    """
+
+    def __init__(self, router: Optional[ModelRouter] = None) -> None:
+        self.router = router or ModelRouter(default_model=os.getenv("AUTOLAWYER_MODEL", "gpt-4o-mini"))
+        self.cases = default_case_store()
+        self.requests = 0
+
+    def warm(self) -> None:
+        """
+        Load the embedding model up front so the first case does not pay for it.
+        """
+        try:
+            import tempfile
+
+            from mcp_tools.clause_rag import shared_rag
+
+            shared_rag(Path(tempfile.gettempdir()) / "rag")
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Embedding warm-up failed: %s", exc)
+
+    def health(self) -> Dict:
+        return {
+            "status": "healthy",
+            "providers_available": len(self.router.providers),
+            "offline_mode": self.router.offline_mode,
+            "worker": {"pid": os.getpid(), "requests": self.requests},
+        }
+
+    def providers(self) -> Dict:
+        return {
+            "providers": [
+                {
+                    "name": p.name,
+                    "model": p.model,
+                    "tokens_used": p.tokens_used,
+                    "token_budget": p.token_budget,
+                    "remaining": p.token_budget - p.tokens_used,
+                    "health": self.router.provider_stats[p.name].snapshot(),
+                    "rate_limit": self.router.limiters[p.name].snapshot(),
+                }
+                for p in self.router.providers
+            ],
+            "tokens_used": self.router.tokens_used,
+            "cache": self.router.cache_stats(),
+            "offline_mode": self.router.offline_mode,
+        }
+
+    def get_case(self, case_id: str) -> Optional[Dict]:
+        case = self.cases.get(case_id)
+        return None if case is None else {"case_id": case_id, **case}
+
+    def exec_summary(self, case_id: str) -> Optional[str]:
+        case = self.cases.get(case_id)
+        if case is None:
+            return None
+        return render_summary_text(case.get("reports", {}).get("executive_summary", {}))
+
+    def run_case(self, case_context: Dict) -> Dict:
+        agent = AgentCore(router=self.router, policies=ExecutionPolicies())
+        result = agent.run_case(case_context)
+        if case_context.get("case_id"):
+            self.cases.save(case_context["case_id"], result)
+        return result
+
+
+class _Handler(BaseHTTPRequestHandler):
+    worker: ServiceWorker
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        parts = [part for part in self.path.split("?", 1)[0].split("/") if part]
+        if parts == ["health"]:
+            self._json(200, self.worker.health())
+        elif parts == ["providers"]:
+            self._json(200, self.worker.providers())
+        elif len(parts) == 2 and parts[0] == "cases":
+            case = self.worker.get_case(parts[1])
+            if case is None:
+                self._json(404, {"error": "Case not found"})
+            else:
+                self._json(200, shape_result(case))
+        elif len(parts) == 3 and parts[0] == "cases" and parts[2] == "summary":
+            summary = self.worker.exec_summary(parts[1])
+            if summary is None:
+                self._json(404, {"error": "Executive summary not found"})
+            else:
+                self._send(200, summary.encode("utf-8"), "text/plain; charset=utf-8")
+        else:
+            self._json(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        if self.path.split("?", 1)[0].rstrip("/") != "/cases":
+            self._json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            case_context = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as exc:
+            self._json(400, {"error": f"Invalid case context: {exc}"})
+            return
+        try:
+            self._json(200, shape_result(self.worker.run_case(case_context)))
+        except Exception as exc:  # noqa: BLE001
+            self._json(500, {"error": str(exc)})
+
+    def _json(self, status: int, payload: Dict) -> None:
+        self._send(status, dumps(payload), "application/json")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.worker.requests += 1
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) pair.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info("%s %s", self.address_string(), format % args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(
+    worker: ServiceWorker,
+    address: Tuple[str, int] = ("127.0.0.1", 8765),
+    socket_path: Optional[str] = None,
+) -> socketserver.BaseServer:
+    handler = type("Handler", (_Handler,), {"worker": worker})
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        return _UnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer(address, handler)
+
+
+def main() -> None:
+    logging.basicConfig(level=os.getenv("AUTOLAWYER_LOG_LEVEL", "INFO"))
+    worker = ServiceWorker()
+    if os.getenv("AUTOLAWYER_WORKER_WARM", "1") == "1":
+        threading.Thread(target=worker.warm, name="worker-warmup", daemon=True).start()
+    socket_path = os.getenv("AUTOLAWYER_WORKER_SOCKET")
+    address = (
+        os.getenv("AUTOLAWYER_WORKER_HOST", "127.0.0.1"),
+        int(os.getenv("AUTOLAWYER_WORKER_PORT", "8765")),
+    )
+    server = make_server(worker, address, socket_path)
+    logger.info("AutoLawyer worker listening on %s", socket_path or "http://%s:%d" % address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Case store: size-bounded LRU read-through cache in front of MongoDB.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from agent.serialization import compact_result
+from mcp_tools.tables import ColumnarTable, to_plain
+from storage.mongodb import MongoDBStorage
+
+try:
+    from pymongo.errors import ConnectionFailure, ExecutionTimeout, WTimeoutError
+except ImportError:  # pragma: no cover - optional dependency
+    _MONGO_DOWN_ERRORS: Tuple[type, ...] = ()
+else:
+    # ConnectionFailure covers AutoReconnect, NetworkTimeout and ServerSelectionTimeoutError.
+    _MONGO_DOWN_ERRORS = (ConnectionFailure, ExecutionTimeout, WTimeoutError)
+
+# Failures meaning the backend is unreachable, as opposed to rejecting one case.
+BACKEND_DOWN_ERRORS = (ImportError, ConnectionError, TimeoutError) + _MONGO_DOWN_ERRORS
+
+logger = logging.getLogger(__name__)
+
+
+def approx_size(value: Any) -> int:
+    """
+    Rough in-memory footprint of a JSON-like value, dominated by string payloads.
+    """
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, ColumnarTable):
+        return value.nbytes()
+    if isinstance(value, dict):
+        return sum(len(str(key)) + approx_size(item) for key, item in value.items()) + 16
+    if isinstance(value, (list, tuple)):
+        return sum(approx_size(item) for item in value) + 16
+    return 8
+
+
+class CaseStore:
+    """
+    Cases live in MongoDB; recently used ones are also kept in memory up to
+    ``max_bytes`` / ``max_entries``, least recently used evicted first.
+
+    Both tiers hold the ``compact_result`` form of each case (document text as a hash,
+    duplicated artifacts as ``$ref``), so ``get`` answers the same shape whichever
+    tier serves it; ``agent.serialization.expand_refs`` restores the references.
+
+    ``backend`` is anything with ``save_case`` / ``get_case`` (MongoDBStorage or an
+    in-process fake). After a
+    connection or timeout error the store serves the memory tier alone and retries
+    the backend every ``retry_seconds``; other errors only fail that one call.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        max_entries: int = 128,
+        max_bytes: int = 256 * 1024 * 1024,
+        retry_seconds: float = 30.0,
+    ) -> None:
+        self.backend = backend if backend is not None else MongoDBStorage()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory: "OrderedDict[str, Tuple[int, Dict]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.retry_seconds = retry_seconds
+        self._retry_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls, backend: Optional[Any] = None) -> "CaseStore":
+        return cls(
+            backend=backend,
+            max_entries=int(os.getenv("AUTOLAWYER_CASE_CACHE_ENTRIES", "128")),
+            max_bytes=int(os.getenv("AUTOLAWYER_CASE_CACHE_MB", "256")) * 1024 * 1024,
+        )
+
+    def save(self, case_id: str, case_data: Dict) -> None:
+        # Document text and duplicated artifacts would push large cases past BSON's 16 MB.
+        compact = compact_result(case_data)
+        self._remember(case_id, compact)
+        if not self.backend_available:
+            return
+        try:
+            self.backend.save_case(case_id, to_plain(compact))
+        except Exception as exc:  # noqa: BLE001
+            self._backend_failed(case_id, exc)
+
+    def get(self, case_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._memory.get(case_id)
+            if entry is not None:
+                self._memory.move_to_end(case_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        if not self.backend_available:
+            return None
+        try:
+            case_data = self.backend.get_case(case_id)
+        except Exception as exc:  # noqa: BLE001
+            self._backend_failed(case_id, exc)
+            return None
+        if case_data is None:
+            return None
+        case_data = {key: value for key, value in case_data.items() if key != "_id"}
+        self._remember(case_id, case_data)
+        return case_data
+
+    def __contains__(self, case_id: str) -> bool:
+        return self.get(case_id) is not None
+
+    @property
+    def backend_available(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._memory),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "backend_available": self.backend_available,
+            }
+
+    def _remember(self, case_id: str, case_data: Dict) -> None:
+        size = approx_size(case_data)
+        with self._lock:
+            previous = self._memory.pop(case_id, None)
+            if previous is not None:
+                self._bytes -= previous[0]
+            if size > self.max_bytes:
+                # Too large to cache at all; it is only served from the backend.
+                return
+            self._memory[case_id] = (size, case_data)
+            self._bytes += size
+            while self._memory and (
+                self._bytes > self.max_bytes or len(self._memory) > self.max_entries
+            ):
+                _, (evicted_size, _) = self._memory.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def _backend_failed(self, case_id: str, exc: Exception) -> None:
+        if not isinstance(exc, BACKEND_DOWN_ERRORS):
+            logger.warning("Case store backend failed for %s: %s", case_id, exc)
+            return
+        logger.warning("Case store backend unavailable, using memory only: %s", exc)
+        self._retry_at = time.monotonic() + self.retry_seconds
+
+
+_default_store: Optional[CaseStore] = None
+_default_lock = threading.Lock()
+
+
+def default_case_store() -> CaseStore:
+    """
+    Process-wide store sharing one pooled Mongo client.
+    """
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = CaseStore.from_env()
+        return _default_store
@@ -3,8 +3,12 @@ MongoDB integration for persistent case storage and audit logs.
 """
 from __future__ import annotations
 
+import logging
 import os
-from typing import Dict, List, Optional
+import queue
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
 
 try:
     from motor.motor_asyncio import AsyncIOMotorClient
@@ -14,6 +18,31 @@ except ImportError:
     MongoClient = None
 
 
+logger = logging.getLogger(__name__)
+
+_clients: Dict[str, "MongoClient"] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_client(connection_string: str):
+    """
+    One pooled MongoClient per URI for the whole process; MongoClient is thread-safe
+    and pools its own sockets, so every storage instance should share it.
+    """
+    if MongoClient is None:
+        raise ImportError("Install pymongo and motor: pip install pymongo motor")
+    with _clients_lock:
+        client = _clients.get(connection_string)
+        if client is None:
+            client = MongoClient(
+                connection_string,
+                maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+                serverSelectionTimeoutMS=int(os.getenv("MONGODB_TIMEOUT_MS", "2000")),
+            )
+            _clients[connection_string] = client
+        return client
+
+
 class MongoDBStorage:
     """
     MongoDB storage for cases, audit logs, and embeddings metadata.
@@ -30,50 +59,136 @@ class MongoDBStorage:
 
     def connect(self):
         """Initialize MongoDB connection."""
-        if MongoClient is None:
-            raise ImportError("Install pymongo and motor: pip install pymongo motor")
-        self.client = MongoClient(self.connection_string)
+        self.client = shared_client(self.connection_string)
         self.db = self.client.get_database("autolawyer")
         return self
 
     def save_case(self, case_id: str, case_data: Dict) -> bool:
         """Persist case results to MongoDB."""
-        if not self.db:
+        if self.db is None:
             self.connect()
         collection = self.db.cases
-        case_data["_id"] = case_id
+        case_data = {**case_data, "_id": case_id}
         collection.replace_one({"_id": case_id}, case_data, upsert=True)
         return True
 
     def get_case(self, case_id: str) -> Optional[Dict]:
         """Retrieve case by ID."""
-        if not self.db:
+        if self.db is None:
             self.connect()
         return self.db.cases.find_one({"_id": case_id})
 
     def list_cases(self, limit: int = 50) -> List[Dict]:
         """List recent cases."""
-        if not self.db:
+        if self.db is None:
             self.connect()
         return list(self.db.cases.find().sort("_id", -1).limit(limit))
 
     def save_audit_log(self, case_id: str, log_entry: Dict) -> bool:
         """Append audit log entry."""
-        if not self.db:
+        if self.db is None:
+            self.connect()
+        self.db.audit_logs.insert_one({**log_entry, "case_id": case_id})
+        return True
+
+    def save_audit_logs(self, entries: Iterable[Dict]) -> int:
+        """Insert many audit entries (each carrying its case_id) in one round trip."""
+        # Copies, since insert_many writes the generated _id back into each document.
+        entries = [dict(entry) for entry in entries]
+        if not entries:
+            return 0
+        if self.db is None:
+            self.connect()
+        self.db.audit_logs.insert_many(entries, ordered=False)
+        return len(entries)
+
+    def update_case(self, case_id: str, fields: Dict) -> bool:
+        """Set individual case fields without rewriting the whole document."""
+        if self.db is None:
             self.connect()
-        collection = self.db.audit_logs
-        log_entry["case_id"] = case_id
-        collection.insert_one(log_entry)
+        self.db.cases.update_one({"_id": case_id}, {"$set": fields}, upsert=True)
         return True
 
+    def audit_writer(self, batch_size: int = 100, flush_interval: float = 1.0) -> "AuditLogWriter":
+        return AuditLogWriter(self, batch_size=batch_size, flush_interval=flush_interval)
+
     def get_audit_logs(self, case_id: str) -> List[Dict]:
         """Retrieve all audit logs for a case."""
-        if not self.db:
+        if self.db is None:
             self.connect()
         return list(self.db.audit_logs.find({"case_id": case_id}).sort("timestamp", 1))
 
     def close(self):
-        """Close MongoDB connection."""
-        if self.client:
-            self.client.close()
+        """Release this instance; the shared pooled client stays open for other users."""
+        self.client = None
+        self.db = None
+
+
+class AuditLogWriter:
+    """
+    Background writer that batches audit entries into ``insert_many`` calls, flushing
+    every ``batch_size`` entries or ``flush_interval`` seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        storage: MongoDBStorage,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+    ) -> None:
+        self.storage = storage
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: "queue.Queue[Optional[Dict]]" = queue.Queue(maxsize=max_queue)
+        self.written = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, case_id: str, entry: Dict) -> bool:
+        try:
+            self.queue.put_nowait({**entry, "case_id": case_id})
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self) -> None:
+        """Block until everything queued so far has been written (or dropped)."""
+        self.queue.join()
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        self.queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        batch: List[Dict] = []
+        deadline = None
+        running = True
+        while running:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                entry = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                entry = ...
+            if entry is None:
+                running = False
+                self.queue.task_done()
+            elif entry is not ...:
+                batch.append(entry)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if batch and (not running or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch)
+                for _ in batch:
+                    self.queue.task_done()
+                batch = []
+                deadline = None
 
+    def _write(self, batch: List[Dict]) -> None:
+        try:
+            self.written += self.storage.save_audit_logs(batch)
+        except Exception as exc:  # noqa: BLE001
+            self.dropped += len(batch)
+            logger.warning("Dropped %d audit entries: %s", len(batch), exc)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent import cache, latency, ledger, limits, modal_bridge
+from agent.cache import ResponseCache
+from agent.router import ModelRouter, RouterResult
+
+PROVIDER_KEYS = (
+    "OPENAI_API_KEY",
+    "NEBIUS_API_KEY",
+    "SAMBA_NOVA_API_KEY",
+    "HYPERBOLIC_API_KEY",
+    "BLAXEL_API_KEY",
+    "MODAL_API_KEY",
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(monkeypatch, tmp_path):
+    """Keep tests off the shared ledger, checkpoint dir and any real provider keys."""
+    for name in PROVIDER_KEYS + ("AUTO_LAWYER_OFFLINE", "USE_MODAL_SERVERLESS", "AUTOLAWYER_HEDGE"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("AUTOLAWYER_LEDGER", "0")
+    monkeypatch.setenv("AUTOLAWYER_CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    # Process-wide routing state must not leak between tests.
+    monkeypatch.setattr(latency, "_registry", {})
+    monkeypatch.setattr(limits, "_registry", {})
+    monkeypatch.setattr(ledger, "_registry", {})
+    monkeypatch.setattr(cache, "_default_cache", None)
+    yield
+    modal_bridge.set_complete_text(None)
+    for shared in ledger._registry.values():
+        shared.close()
+
+
+@pytest.fixture
+def live_router(monkeypatch):
+    """
+    Factory for an online router over the given providers whose completions are
+    faked; ``router.calls`` records (provider, model, prompt) per completion and
+    providers named in ``router.failing`` raise instead of answering.
+    """
+
+    def build(*providers: str, **kwargs) -> ModelRouter:
+        for name in providers or ("OPENAI",):
+            monkeypatch.setenv(f"{name}_API_KEY", "test-key")
+        kwargs.setdefault("response_cache", ResponseCache())
+        router = ModelRouter(**kwargs)
+        router.offline_mode = False
+        router.calls = []
+        router.failing = set()
+
+        def complete(provider, model, full_prompt, temperature, max_tokens, prompt_tokens=0):
+            router.calls.append((provider.name, model, full_prompt))
+            if provider.name in router.failing:
+                raise RuntimeError(f"{provider.name} unavailable")
+            router._charge(provider, prompt_tokens + 10)
+            return RouterResult(
+                output=f"answer from {provider.name}",
+                model=model,
+                latency_ms=1.0,
+                tokens=prompt_tokens + 10,
+                provider=provider.name,
+            )
+
+        router._complete = complete
+        return router
+
+    return build
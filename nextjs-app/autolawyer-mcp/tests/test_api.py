@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("multipart")
+
+from fastapi.testclient import TestClient
+
+import agent.core as core_module
+from api import main
+
+CONTRACT = b"1. Liability\nLimitation of liability applies.\n\n2. Term\nTermination on notice.\n"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("AUTO_LAWYER_OFFLINE", "1")
+    # One portal, so every request runs on the same event loop as in production.
+    with TestClient(main.app) as client:
+        yield client
+
+
+def _upload(name="msa.txt", body=CONTRACT):
+    return [("primary_docs", (name, body, "text/plain"))]
+
+
+def test_resubmitting_a_failed_case_resumes_from_checkpoints(client, monkeypatch):
+    load_tool = core_module._tool
+
+    def report_builder_down(name):
+        module = load_tool(name)
+        if name == "report_builder":
+            raise RuntimeError("report builder unavailable")
+        return module
+
+    monkeypatch.setattr(core_module, "_tool", report_builder_down)
+    first = client.post("/api/cases", files=_upload(), data={"case_id": "resume-1"})
+    assert first.status_code == 200 and first.json()["case_id"] == "resume-1"
+    assert not any(log["prompt"] == "checkpoint" for log in first.json()["logs"])
+
+    monkeypatch.setattr(core_module, "_tool", load_tool)
+    second = client.post("/api/cases", files=_upload(), data={"case_id": "resume-1"})
+
+    restored = {log["task"] for log in second.json()["logs"] if log["prompt"] == "checkpoint"}
+    assert "Ingest documents" in restored and "Segment clauses" in restored
+    assert second.json()["reports"]["executive_summary"]
+
+
+def test_case_ids_must_be_path_safe(client):
+    response = client.post("/api/cases", files=_upload(), data={"case_id": "../etc"})
+
+    assert response.status_code == 400
+
+
+def test_a_blocked_case_does_not_stall_other_requests(client, monkeypatch):
+    import threading
+
+    load_tool = core_module._tool
+    entered, release = threading.Event(), threading.Event()
+
+    def throttled(name):
+        if name == "clause_segmenter":
+            entered.set()
+            release.wait(timeout=10)  # stands in for a limiter waiting on its window
+        return load_tool(name)
+
+    monkeypatch.setattr(core_module, "_tool", throttled)
+    responses = []
+    worker = threading.Thread(target=lambda: responses.append(client.post("/api/cases", files=_upload())))
+    worker.start()
+    try:
+        assert entered.wait(timeout=10)
+        health = client.get("/health")
+        assert health.status_code == 200
+        assert not release.is_set() and worker.is_alive()
+    finally:
+        release.set()
+        worker.join(timeout=10)
+    assert responses[0].status_code == 200
+
+
+def _sse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_emits_case_plan_tasks_review_then_result(client):
+    response = client.post("/api/cases/stream", files=_upload(), data={"case_id": "stream-1"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    kinds = [kind for kind, _ in events if kind != "reviewer"]
+    plan = events[1][1]
+    assert kinds == ["case", "plan"] + ["task"] * len(plan) + ["review", "result"]
+    assert events[0][1] == {"case_id": "stream-1"}
+    assert [data["tool"] for kind, data in events if kind == "task"] == [step["tool"] for step in plan]
+    assert events[-1][1]["case_id"] == "stream-1" and events[-1][1]["status"] == "completed"
+    assert client.get("/api/cases/stream-1").status_code == 200
+
+
+def test_stored_case_reads_back_like_the_run_that_produced_it(client):
+    created = client.post("/api/cases", files=_upload(), data={"case_id": "read-back-1"}).json()
+
+    stored = client.get("/api/cases/read-back-1").json()
+
+    assert stored["action_plan"] == created["action_plan"]
+    assert stored["clauses"] == created["clauses"] and stored["reports"] == created["reports"]
+
+
+def test_queued_case_reports_status_then_serves_its_result(client, tmp_path, monkeypatch):
+    import time
+
+    monkeypatch.setattr(main.jobs, "upload_root", tmp_path)
+    submitted = client.post("/api/cases/jobs", files=_upload(), data={"case_id": "job-api-1"})
+    assert submitted.status_code == 202
+    assert submitted.json()["status_url"] == "/api/cases/job-api-1/status"
+
+    deadline = time.monotonic() + 10
+    while (status := client.get("/api/cases/job-api-1/status").json())["status"] != "completed":
+        assert status["status"] in ("queued", "running") and time.monotonic() < deadline
+        time.sleep(0.02)
+
+    assert status["progress"]["fraction"] == 1.0
+    result = client.get("/api/cases/job-api-1/result")
+    assert result.status_code == 200 and result.json()["reports"]["executive_summary"]
+    assert client.get("/api/cases/missing-job/status").status_code == 404
+
+
+def test_oversize_uploads_are_rejected_with_413(client, monkeypatch):
+    from api.uploads import UploadLimits
+
+    monkeypatch.setattr(main, "upload_limits", UploadLimits(max_file_bytes=1024, max_request_bytes=8192, chunk_size=256))
+
+    too_big_file = client.post("/api/cases", files=_upload(body=b"x" * 2048))
+    assert too_big_file.status_code == 413
+    assert "per-file limit" in too_big_file.json()["detail"]
+
+    too_big_request = client.post("/api/cases", files=_upload(body=b"x" * 16384))
+    assert too_big_request.status_code == 413
+    assert "per-request limit" in too_big_request.json()["detail"]
+
+    assert client.post("/api/cases", files=_upload()).status_code == 200
+
+
+def test_profiled_case_serves_its_profile_in_every_format(client, tmp_path):
+    import pstats
+
+    profiled = client.post("/api/cases", files=_upload(), data={"case_id": "prof-1"}, headers={"X-AutoLawyer-Profile": "1"})
+    assert profiled.status_code == 200
+
+    summary = client.get("/api/cases/prof-1/profile", params={"format": "json"}).json()
+    assert summary["format"] == "cprofile" and summary["top"] and "pstats_b64" not in summary
+    assert "function calls" in client.get("/api/cases/prof-1/profile", params={"format": "text"}).text
+
+    raw = client.get("/api/cases/prof-1/profile")
+    assert raw.headers["content-disposition"] == 'attachment; filename="prof-1.prof"'
+    (tmp_path / "case.prof").write_bytes(raw.content)
+    assert pstats.Stats(str(tmp_path / "case.prof")).total_calls > 0
+
+    assert client.get("/api/cases/prof-1/profile", params={"format": "svg"}).status_code == 400
+    client.post("/api/cases", files=_upload(), data={"case_id": "plain-1"})
+    assert client.get("/api/cases/plain-1/profile").status_code == 404
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+import re
+
+from agent import batching
+from agent.batching import MicroBatcher
+from agent.router import RouterResult
+
+
+def _answer_packed(router):
+    def complete(provider, model, full_prompt, temperature, max_tokens, prompt_tokens=0):
+        router.calls.append((provider.name, model, full_prompt))
+        ids = re.findall(r'"id": "(i\d+)"', full_prompt)
+        return RouterResult(
+            output=json.dumps({item_id: f"answer {item_id}" for item_id in ids}),
+            model=model,
+            latency_ms=1.0,
+            tokens=prompt_tokens + 10,
+            provider=provider.name,
+        )
+
+    router._complete = complete
+
+
+def test_generate_batch_packs_prompts_when_policy_asks(live_router):
+    router = live_router("OPENAI")
+    _answer_packed(router)
+    router.register_policy("clause_review", {"pack": True})
+
+    results = router.generate_batch("clause_review", ["Clause 1?", "Clause 2?", "Clause 3?"])
+
+    assert len(router.calls) == 1
+    assert [result.output for result in results] == ["answer i1", "answer i2", "answer i3"]
+
+
+def test_batcher_sizes_items_with_the_shared_token_counter(live_router, monkeypatch):
+    seen = []
+
+    def fake_count(text, model):
+        seen.append(model)
+        return 7
+
+    monkeypatch.setattr(batching, "count_tokens", fake_count)
+    batcher = MicroBatcher(live_router("OPENAI"))
+
+    assert batcher._count_tokens("Limitation of liability shall not exceed the fees paid.") == 7
+    assert seen == [batcher.router.default_model]
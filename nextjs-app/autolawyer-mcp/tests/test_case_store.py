@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from storage.case_store import CaseStore
+
+
+class FakeBackend:
+    """In-process stand-in for MongoDBStorage."""
+
+    def __init__(self) -> None:
+        self.cases = {}
+        self.error = None
+        self.calls = 0
+
+    def save_case(self, case_id, case_data):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        self.cases[case_id] = {**case_data, "_id": case_id}
+        return True
+
+    def get_case(self, case_id):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.cases.get(case_id)
+
+
+def _outcome():
+    clauses = [{"clause_id": "c1", "heading": "Liability", "body": "Capped."}]
+    return {
+        "documents": [{"name": "msa.txt", "path": "/uploads/msa.txt", "content": "x" * 5000}],
+        "clauses": clauses,
+        "tasks": [{"name": "Segment", "tool": "clause_segmenter", "status": "completed", "result": clauses}],
+    }
+
+
+def test_backend_receives_the_compact_case():
+    backend = FakeBackend()
+    store = CaseStore(backend=backend)
+
+    store.save("case-1", _outcome())
+
+    saved = backend.cases["case-1"]
+    assert "content" not in saved["documents"][0]
+    assert saved["documents"][0]["characters"] == 5000
+    assert saved["tasks"][0]["result"] == {"$ref": "#/clauses"}
+
+
+def test_both_tiers_answer_the_same_shape():
+    backend = FakeBackend()
+    store = CaseStore(backend=backend, max_entries=1)
+    store.save("case-1", _outcome())
+    from_memory = store.get("case-1")
+
+    store.save("case-2", _outcome())  # evicts case-1 from the memory tier
+    from_backend = store.get("case-1")
+
+    assert store.hits == 1 and store.misses == 1
+    assert from_memory == from_backend
+    assert "content" not in from_memory["documents"][0]
+
+
+def test_connection_errors_trip_the_breaker():
+    backend = FakeBackend()
+    backend.error = ConnectionError("connection refused")
+    store = CaseStore(backend=backend, max_entries=1)
+
+    store.save("case-1", _outcome())
+    store.save("case-2", _outcome())
+
+    assert not store.backend_available
+    assert backend.calls == 1
+    assert store.get("case-1") is None and backend.calls == 1
+
+
+def test_other_backend_errors_do_not_trip_the_breaker():
+    backend = FakeBackend()
+    backend.error = ValueError("BSON document too large")
+    store = CaseStore(backend=backend, max_entries=1)
+
+    store.save("case-1", _outcome())
+
+    assert store.backend_available
+    backend.error = None
+    store.save("case-2", _outcome())
+    assert "case-2" in backend.cases
+    assert store.get("case-1") is None and backend.calls == 3
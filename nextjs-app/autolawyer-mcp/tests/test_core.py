@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+
+from agent.core import AgentCore
+from agent.plan_cache import PlanCache
+from agent.policies import ExecutionPolicies
+from agent.router import RouterResult
+
+
+CASE = {
+    "case_id": "case-1",
+    "primary_documents": [{"name": "msa.txt", "path": "/uploads/msa.txt"}],
+    "counterparty_documents": [],
+    "policies": {"max_liability": "12 months fees"},
+    "instructions": "Cap liability",
+}
+
+
+def _planner_returns(router, steps):
+    def generate(task_type, prompt, **kwargs):
+        return RouterResult(output=json.dumps(steps), model="gpt-4o-mini", latency_ms=1.0, tokens=20, provider="openai")
+
+    router.generate = generate
+
+
+def test_llm_plan_naming_files_without_paths_is_bound_to_the_case(live_router):
+    router = live_router("OPENAI")
+    # The planner sees a compacted case, so it echoes file names but not their paths.
+    _planner_returns(
+        router,
+        [
+            {"name": "Ingest", "tool": "document_reader", "payload": {"files": [{"name": "msa.txt"}]}},
+            {"name": "Score", "tool": "risk_classifier", "payload": {"policies": {}}},
+        ],
+    )
+    core = AgentCore(router=router, policies=ExecutionPolicies(checkpoint_stages=False), plan_cache=PlanCache())
+
+    tasks = core.build_plan(CASE)
+
+    assert not core.plan_cache_hit
+    assert tasks[0].payload["files"] == CASE["primary_documents"]
+    assert tasks[1].payload["policies"] == CASE["policies"]
+
+    cached = core.build_plan(CASE)
+
+    assert core.plan_cache_hit
+    assert [task.payload for task in cached] == [task.payload for task in tasks]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from api.jobs import COMPLETED, FAILED, QUEUED, RUNNING, CaseBusy, JobQueue
+
+
+class FakeAgent:
+    """Yields the iter_case event sequence, pausing after the first task until released."""
+
+    def __init__(self, started: threading.Event, release: threading.Event, fail: bool = False) -> None:
+        self.started = started
+        self.release = release
+        self.fail = fail
+
+    def iter_case(self, case_context, stream_tokens=True):
+        yield {"event": "plan", "data": [{"tool": "document_reader"}, {"tool": "report_builder"}]}
+        yield {"event": "task", "data": {"tool": "document_reader"}}
+        self.started.set()
+        assert self.release.wait(timeout=10)
+        if self.fail:
+            raise RuntimeError("report builder unavailable")
+        yield {"event": "task", "data": {"tool": "report_builder"}}
+        yield {"event": "review", "data": {}}
+        yield {"event": "result", "data": {"case_id": case_context["case_id"]}}
+
+
+def _wait_for(queue, case_id, status):
+    deadline = time.monotonic() + 10
+    while queue.get(case_id).status != status:
+        assert time.monotonic() < deadline, f"job never reached {status}"
+        time.sleep(0.01)
+    return queue.get(case_id)
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def factory(fail=False, max_workers=1):
+        started, release = threading.Event(), threading.Event()
+        results = {}
+        queue = JobQueue(
+            build_agent=lambda: FakeAgent(started, release, fail=fail),
+            on_result=results.__setitem__,
+            max_workers=max_workers,
+            upload_root=tmp_path,
+        )
+        queues.append((queue, release))
+        return queue, started, release, results
+
+    yield factory
+    for queue, release in queues:
+        release.set()
+        queue.shutdown()
+
+
+def test_job_moves_from_queued_through_running_to_completed(make_queue):
+    queue, started, release, results = make_queue()
+    job = queue.submit({"case_id": "job-1"})
+    assert job.status in (QUEUED, RUNNING)
+
+    assert started.wait(timeout=10)
+    running = queue.get("job-1").snapshot()
+    assert running["status"] == RUNNING
+    assert running["progress"]["tasks_done"] == 1 and running["progress"]["tasks_total"] == 2
+    assert running["progress"]["stage"] == "document_reader"
+    assert "job-1" not in results
+
+    release.set()
+    done = _wait_for(queue, "job-1", COMPLETED).snapshot()
+    assert done["progress"]["fraction"] == 1.0 and done["progress"]["stage"] == "done"
+    assert done["started_at"] <= done["finished_at"]
+    assert results["job-1"] == {"case_id": "job-1"}
+    assert queue.stats()[COMPLETED] == 1
+
+
+def test_failed_job_records_the_error_and_removes_its_uploads(make_queue):
+    queue, started, release, results = make_queue(fail=True)
+    upload_dir = queue.upload_dir("job-2")
+    (upload_dir / "msa.txt").write_text("x")
+
+    queue.submit({"case_id": "job-2"}, upload_dir=upload_dir)
+    release.set()
+    job = _wait_for(queue, "job-2", FAILED)
+
+    assert job.error == "report builder unavailable"
+    assert "job-2" not in results
+    assert not upload_dir.exists()
+
+
+def test_a_case_cannot_be_submitted_while_its_job_is_active(make_queue):
+    queue, started, release, _ = make_queue()
+    queue.submit({"case_id": "job-3"})
+    assert started.wait(timeout=10)
+
+    with pytest.raises(CaseBusy):
+        queue.submit({"case_id": "job-3"})
+
+    release.set()
+    _wait_for(queue, "job-3", COMPLETED)
+    assert queue.submit({"case_id": "job-3"}).status in (QUEUED, RUNNING)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from agent import latency
+from agent.latency import ProviderStats
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_error_rate_recovers_without_further_calls(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(latency.time, "monotonic", clock)
+    stats = ProviderStats(alpha=0.3, error_half_life_s=60)
+
+    stats.record_error()
+    stats.record_error()
+    assert not stats.healthy(0.5)
+
+    clock.now += 60
+    assert 0.25 < stats.error_rate < 0.26
+    assert stats.healthy(0.5)
+
+
+def test_demoted_provider_is_routed_to_again_once_errors_decay(live_router, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(latency.time, "monotonic", clock)
+    router = live_router("OPENAI", "NEBIUS")
+    router.provider_stats["openai"].error_half_life_s = 60
+    router.provider_stats["openai"].record_error()
+    router.provider_stats["openai"].record_error()
+
+    router.generate("review", "Is the cap mutual?")
+    assert router.calls[-1][0] == "nebius"
+
+    clock.now += 120
+    router.provider_stats["nebius"].record_success(50.0)
+    router.generate("review", "Is the notice period 30 days?")
+    assert router.calls[-1][0] == "openai"
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import pytest
+
+from agent import ledger as ledger_module
+from agent.ledger import TokenLedger, shared_ledger
+
+
+@pytest.fixture
+def ledger_db(monkeypatch, tmp_path):
+    path = tmp_path / "ledger.sqlite3"
+    monkeypatch.setenv("AUTOLAWYER_LEDGER", "1")
+    monkeypatch.setenv("AUTOLAWYER_LEDGER_DB", str(path))
+    return path
+
+
+def test_routers_share_one_ledger_and_its_usage(ledger_db, live_router):
+    first = live_router("OPENAI")
+    second = live_router("OPENAI")
+    assert first.ledger is second.ledger is shared_ledger()
+
+    first.generate("review", "Is the cap mutual?")
+    second._sync_usage()
+
+    assert second.tokens_used == first.tokens_used > 0
+    # Another process opening the same file sees the same total.
+    other_process = TokenLedger(ledger_db)
+    assert other_process.used("openai") == first.tokens_used
+    other_process.close()
+
+
+def test_budget_refills_when_the_next_window_starts(ledger_db, live_router, monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(ledger_module.time, "time", lambda: now[0])
+    router = live_router("OPENAI")
+    router.ledger.add("openai", router.budget_tokens)
+    router.ledger.snapshot(max_age=0)
+
+    with pytest.raises(RuntimeError, match="budget exhausted"):
+        router.generate("review", "Is the cap mutual?")
+
+    now[0] += 24 * 3600
+    result = router.generate("review", "Is the cap mutual?")
+    assert result.provider == "openai"
+    assert router.ledger.used("openai") == result.tokens
+
+
+def test_reset_clears_usage(tmp_path):
+    ledger = TokenLedger(tmp_path / "ledger.sqlite3")
+    ledger.add("openai", 500)
+    ledger.add("nebius", 200)
+
+    ledger.reset("openai")
+    assert ledger.snapshot(max_age=0) == {"nebius": 200}
+    ledger.reset()
+    assert ledger.snapshot(max_age=0) == {}
+    ledger.close()
+
+
+def test_concurrent_charges_on_one_router_are_not_lost(ledger_db, live_router):
+    import threading
+
+    router = live_router("OPENAI")
+    workers = [
+        threading.Thread(target=lambda: [router._charge(router.providers[0], 1) for _ in range(200)])
+        for _ in range(8)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert router.tokens_charged == router.tokens_used == router.ledger.used("openai") == 1600
+
+
+def test_batch_reports_only_its_own_router_tokens(ledger_db, live_router, monkeypatch):
+    from agent import batch
+
+    router, other = live_router("OPENAI"), live_router("OPENAI")
+    other.generate("review", "Earlier request on another router")
+
+    class FakeAgent:
+        def __init__(self, router, **kwargs):
+            self.router = router
+
+        def run_case(self, case_context):
+            result = self.router.generate("review", f"Review {case_context['case_id']}")
+            other.generate("review", f"Concurrent request during {case_context['case_id']}")
+            return {"tokens": result.tokens}
+
+    monkeypatch.setattr(batch, "AgentCore", FakeAgent)
+    runner = batch.BatchRunner(router=router, case_workers=2)
+    summary = runner.run([{"case_id": f"case-{idx}"} for idx in range(3)])
+
+    own = sum(result["outcome"]["tokens"] for result in summary["results"])
+    assert summary["metrics"]["tokens_used"] == own
+    assert router.ledger.used("openai") > own
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import time
+
+from agent.metrics import StageTimings, count_items
+from mcp_tools.risk_classifier import score_clauses
+from mcp_tools.tables import ClauseTable
+
+
+def _planner():
+    time.sleep(0.02)
+    yield {"event": "planner", "data": {"delta": "["}}
+    time.sleep(0.02)
+    yield {"event": "planner", "data": {"delta": "]"}}
+    return ["plan"]
+
+
+def _consume_slowly(timings):
+    with timings.measure("planner") as timing:
+        tasks = yield from timings.relay(timing, _planner())
+        timing.items = len(tasks)
+
+
+def test_relay_leaves_consumer_time_out_of_the_stage():
+    timings = StageTimings()
+
+    events = []
+    for event in _consume_slowly(timings):
+        events.append(event)
+        time.sleep(0.2)
+
+    stage = timings.stages[0]
+    assert len(events) == 2 and stage.items == 1
+    assert 40 <= stage.wall_ms < 200
+    assert stage.cpu_ms < 100
+
+
+def test_count_items_counts_columnar_results():
+    clauses = ClauseTable.from_dicts(
+        {
+            "clause_id": f"c{idx}",
+            "heading": f"{idx}. Liability",
+            "body": "Limitation of liability applies.",
+            "source_document": "msa.txt",
+            "start_char": idx * 100,
+            "end_char": idx * 100 + 50,
+        }
+        for idx in range(3)
+    )
+    risks = score_clauses(clauses, {})
+
+    assert count_items(clauses) == 3
+    assert count_items(risks) == 3
+    assert count_items(ClauseTable()) == 0
+    assert count_items({"patches": [{}, {}]}) == 2
+    assert count_items(None) == 0
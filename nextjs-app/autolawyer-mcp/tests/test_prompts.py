@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+
+from agent import prompts
+
+
+def _case(content: str):
+    return {
+        "case_id": "case-1",
+        "instructions": "Cap liability at 12 months of fees.",
+        "policies": {"max_liability": "12 months fees", "governing_law": "England"},
+        "primary_documents": [
+            {"name": "msa.txt", "path": "/uploads/msa.txt", "content": content, "metadata": {"size": len(content)}},
+            {"name": "sow.pdf", "path": "/uploads/sow.pdf", "sha256": "ab" * 32},
+        ],
+        "counterparty_documents": [],
+    }
+
+
+def test_baseline_is_estimated_without_serializing_document_text(monkeypatch):
+    case = _case("The supplier's liability is capped. " * 5000)
+    encoded = []
+    real_dumps = json.dumps
+
+    def spy(value, *args, **kwargs):
+        text = real_dumps(value, *args, **kwargs)
+        encoded.append(len(text))
+        return text
+
+    monkeypatch.setattr(prompts.json, "dumps", spy)
+    prompt, stats = prompts.build_planner_prompt(case)
+    monkeypatch.setattr(prompts.json, "dumps", real_dumps)
+
+    assert max(encoded) < 2000
+    exact = (len(prompts.PLANNER_PREAMBLE) + len(json.dumps(case, indent=2, default=str)) + 3) // 4
+    assert abs(stats["baseline_tokens"] - exact) / exact < 0.05
+    assert stats["saved_tokens"] == stats["baseline_tokens"] - stats["tokens"]
+
+
+def test_baseline_estimate_tracks_small_cases():
+    case = _case("Short.")
+
+    _, stats = prompts.build_planner_prompt(case)
+
+    exact = (len(prompts.PLANNER_PREAMBLE) + len(json.dumps(case, indent=2, default=str)) + 3) // 4
+    assert abs(stats["baseline_tokens"] - exact) / exact < 0.15
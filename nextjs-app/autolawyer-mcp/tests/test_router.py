@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from agent import modal_bridge
+from agent.cache import ResponseCache, default_response_cache
+from agent.router import ModelRouter
+
+
+def test_routers_share_the_process_response_cache():
+    assert ModelRouter().response_cache is ModelRouter().response_cache is default_response_cache()
+
+
+def test_cached_response_is_served_when_budget_is_exhausted(live_router):
+    router = live_router("OPENAI")
+    first = router.generate("review", "Is clause 4 capped?")
+    router.tokens_used = router.budget_tokens
+
+    second = router.generate("review", "Is clause 4 capped?")
+
+    assert second.cached and second.output == first.output
+    assert len(router.calls) == 1
+
+
+def test_latency_driven_provider_switch_still_hits_the_cache(live_router):
+    router = live_router("OPENAI", "NEBIUS")
+    router.generate("review", "Summarise the indemnity.")
+    assert router.calls[-1][0] == "openai"
+    for _ in range(5):
+        router.provider_stats["openai"].record_success(10_000.0)
+
+    result = router.generate("review", "Summarise the indemnity.")
+
+    assert result.cached
+    assert len(router.calls) == 1
+
+
+def test_cache_key_follows_the_model_that_answers(live_router):
+    cache = ResponseCache()
+    router = live_router("OPENAI", response_cache=cache)
+    router.generate("review", "Summarise the indemnity.")
+
+    router.providers[0].model = "gpt-4.1"  # e.g. OPENAI_MODEL changed between restarts
+    assert not router.generate("review", "Summarise the indemnity.").cached
+
+    other_default = live_router("OPENAI", response_cache=cache, default_model="gpt-4.1-mini")
+    assert not other_default.generate("review", "Summarise the indemnity.").cached
+
+    router.register_policy("pinned", {"provider": "openai"})
+    router.generate("pinned", "Summarise the indemnity.")
+    router.register_policy("pinned", {"model": "gpt-4.1"})
+    assert router.generate("pinned", "Summarise the indemnity.").cached
+
+
+def test_disk_tier_drops_expired_rows_and_keeps_a_row_cap(tmp_path):
+    db_path = tmp_path / "cache.sqlite3"
+    cache = ResponseCache(ttl_seconds=-1, db_path=db_path)
+    cache.put("stale", {"output": "old", "tokens": 1})
+
+    fresh = ResponseCache(db_path=db_path, max_disk_entries=2)
+    for idx in range(4):
+        fresh.put(f"key-{idx}", {"output": str(idx), "tokens": 1})
+    removed = fresh.prune()
+
+    reopened = ResponseCache(db_path=db_path)
+    assert removed == 2
+    assert reopened.get("stale") is None and reopened.get("key-0") is None
+    assert reopened.get("key-3")["output"] == "3"
+
+
+def test_routers_share_provider_latency_history(live_router):
+    live_router("OPENAI").provider_stats["openai"].record_success(120.0)
+
+    assert live_router("OPENAI").provider_stats["openai"].ewma_latency_ms == 120.0
+
+
+def test_hedge_starts_backup_as_soon_as_primary_fails(live_router):
+    router = live_router("OPENAI", "NEBIUS")
+    router.hedge_requests = True
+    router.hedge_delay_ms = 30_000
+    router.failing = {"openai"}
+
+    started = time.monotonic()
+    result = router.generate("review", "Check the liability cap.")
+
+    assert result.provider == "nebius"
+    assert time.monotonic() - started < 5
+    assert [call[0] for call in router.calls] == ["openai", "nebius"]
+
+
+def test_concurrent_routers_share_provider_limits(live_router, monkeypatch):
+    monkeypatch.setenv("OPENAI_MAX_IN_FLIGHT", "1")
+    first, second = live_router("OPENAI"), live_router("OPENAI")
+    limiter = first.limiters["openai"]
+    assert second.limiters["openai"] is limiter
+
+    limiter.acquire(100)
+    try:
+        blocked = threading.Thread(target=second.generate, args=("review", "Any auto-renewal?"))
+        blocked.start()
+        blocked.join(0.2)
+        assert blocked.is_alive(), "second router ignored the shared in-flight cap"
+        assert limiter.snapshot()["queued"] == 1
+    finally:
+        limiter.release(100, 0)
+    blocked.join(5)
+    assert not blocked.is_alive()
+    assert live_router("OPENAI").limiters["openai"].snapshot()["admitted"] == 2
+
+
+def test_modal_batch_is_admitted_charged_recorded_and_cached(live_router, monkeypatch):
+    monkeypatch.setenv("USE_MODAL_SERVERLESS", "1")
+    monkeypatch.setenv("MODAL_MAX_IN_FLIGHT", "2")
+    mapped = []
+
+    def complete_text(prompt, model, temperature, max_tokens):
+        mapped.append(prompt)
+        return f"modal: {prompt}"
+
+    modal_bridge.set_complete_text(modal_bridge.LocalCompleteText(complete_text))
+    router = live_router("MODAL")
+    prompts = ["Clause 1?", "Clause 2?", "Clause 3?"]
+
+    results = router.generate_batch("clause_review", prompts)
+
+    assert [result.output for result in results] == [f"modal: {prompt}" for prompt in prompts]
+    limiter = router.limiters["modal"]
+    assert limiter.snapshot()["admitted"] == 3 and limiter.in_flight == 0
+    assert router.tokens_used == sum(result.tokens for result in results) > 0
+    assert router.provider_stats["modal"].calls == 2  # two chunks under the in-flight cap of 2
+
+    again = router.generate_batch("clause_review", prompts)
+
+    assert all(result.cached for result in again)
+    assert len(mapped) == 3
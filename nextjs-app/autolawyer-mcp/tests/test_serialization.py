@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+
+from agent import serialization
+
+
+def test_expand_refs_restores_what_compact_result_referenced():
+    clauses = [{"clause_id": "c1", "heading": "Liability", "body": "Capped."}]
+    outcome = {
+        "clauses": clauses,
+        "tasks": [{"name": "Segment", "tool": "clause_segmenter", "status": "completed", "result": clauses}],
+        "reports": {"action_plan": [{"name": "Segment", "tool": "clause_segmenter", "status": "completed", "notes": clauses}]},
+    }
+
+    expanded = serialization.expand_refs(serialization.compact_result(outcome))
+
+    assert expanded == outcome
+
+
+def test_only_the_stored_artifact_becomes_a_reference():
+    first = [{"clause_id": "c1", "heading": "Liability", "body": "Uncapped."}]
+    second = [{"clause_id": "c1", "heading": "Liability", "body": "Capped at fees paid."}]
+    outcome = {
+        "clauses": second,
+        "tasks": [
+            {"name": "Segment", "tool": "clause_segmenter", "status": "completed", "result": first},
+            {"name": "Re-segment", "tool": "clause_segmenter", "status": "completed", "result": second},
+        ],
+        "reports": {
+            "action_plan": [
+                {"name": "Segment", "tool": "clause_segmenter", "status": "completed", "notes": first},
+                {"name": "Re-segment", "tool": "clause_segmenter", "status": "completed", "notes": second},
+            ]
+        },
+    }
+
+    compact = serialization.compact_result(outcome)
+
+    assert compact["tasks"][0]["result"] == first
+    assert compact["tasks"][1]["result"] == {"$ref": "#/clauses"}
+    assert compact["reports"]["action_plan"][0]["notes"] == first
+    assert compact["reports"]["action_plan"][1]["notes"] == {"$ref": "#/clauses"}
+    assert json.loads(serialization.dumps(compact))["tasks"][0]["result"][0]["body"] == "Uncapped."
+
+
+def test_services_print_the_full_result_unless_compact_is_asked_for(monkeypatch):
+    clauses = [{"clause_id": "c1", "heading": "Liability", "body": "Capped."}]
+    outcome = {
+        "documents": [{"name": "msa.txt", "content": "Limitation of liability applies."}],
+        "clauses": clauses,
+        "tasks": [{"name": "Segment", "tool": "clause_segmenter", "status": "completed", "result": clauses}],
+    }
+
+    monkeypatch.delenv("AUTOLAWYER_RESULT_FORMAT", raising=False)
+    assert serialization.shape_result(outcome) == outcome
+    assert serialization.shape_result(serialization.compact_result(outcome))["tasks"] == outcome["tasks"]
+
+    monkeypatch.setenv("AUTOLAWYER_RESULT_FORMAT", "compact")
+    compact = serialization.shape_result(outcome)
+    assert compact["tasks"][0]["result"] == {"$ref": "#/clauses"}
+    assert "content" not in compact["documents"][0]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import sys
+import types
+
+import pytest
+
+from agent import tokens
+from agent.router import ModelRouter
+
+
+@pytest.fixture
+def failing_tiktoken(monkeypatch):
+    """A tiktoken whose BPE download fails, as it does without network access."""
+    attempts = []
+
+    def load(name):
+        attempts.append(name)
+        raise ConnectionError("cannot reach openaipublic.blob.core.windows.net")
+
+    module = types.SimpleNamespace(encoding_for_model=load, get_encoding=load)
+    monkeypatch.setitem(sys.modules, "tiktoken", module)
+    tokens._encoder.cache_clear()
+    yield attempts
+    tokens._encoder.cache_clear()
+
+
+def test_count_tokens_falls_back_when_encoder_cannot_load(failing_tiktoken):
+    assert tokens.count_tokens("a" * 40) == 10
+    assert tokens.count_messages([{"role": "user", "content": "a" * 40}]) > 10
+
+
+def test_failed_encoder_load_is_not_retried(failing_tiktoken):
+    tokens.count_tokens("first call", "gpt-4o-mini")
+    tokens.count_tokens("second call", "gpt-4o-mini")
+
+    assert failing_tiktoken == ["gpt-4o-mini"]
+
+
+def test_offline_router_does_not_count_tokens(monkeypatch):
+    monkeypatch.setenv("AUTO_LAWYER_OFFLINE", "1")
+    monkeypatch.setattr(tokens, "count_tokens", lambda *args: pytest.fail("counted tokens offline"))
+
+    result = ModelRouter().generate("review", "Is the cap mutual?")
+
+    assert result.provider == "offline" and result.tokens == 0
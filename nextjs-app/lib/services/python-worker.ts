@@ -0,0 +1,19 @@
+const WORKER_URL = process.env.AUTOLAWYER_WORKER_URL || 'http://127.0.0.1:8765';
+const WORKER_TIMEOUT_MS = parseInt(process.env.AUTOLAWYER_WORKER_TIMEOUT_MS || '120000');
+
+/**
+ * Call the long-lived Python worker (autolawyer-mcp/services/worker.py).
+ * Returns null when the worker is not running so callers can fall back to
+ * spawning the matching one-shot script.
+ */
+export async function callWorker(path: string, init?: RequestInit): Promise<Response | null> {
+    try {
+        return await fetch(`${WORKER_URL}${path}`, {
+            ...init,
+            cache: 'no-store',
+            signal: AbortSignal.timeout(WORKER_TIMEOUT_MS),
+        });
+    } catch {
+        return null;
+    }
+}